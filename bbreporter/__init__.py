@@ -0,0 +1 @@
+"""Shared, Streamlit-free helpers for the Blood Bowl GPT Prompt Generator."""
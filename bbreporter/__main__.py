@@ -0,0 +1,5 @@
+import sys
+
+from bbreporter.cli import main
+
+sys.exit(main())
@@ -0,0 +1,115 @@
+"""Generate prompts and data files for several leagues in parallel.
+
+Each league is a data directory shaped like the app's ``data/``. Leagues are
+spread over a pool of worker processes; each worker loads one league, renders
+its prompt and streams its export, and reports how long each step took::
+
+    python -m bbreporter.batch leagues/north leagues/south --output-dir reports \\
+        --reporter-name "Jim Johnson" --reporter-description "Veteran commentator"
+
+writes ``reports/north/prompt.txt``, ``reports/north/blood_bowl_data.json``
+(and the same for ``south``) plus ``reports/summary.json``, which lists per
+league the record counts, file sizes and seconds spent loading and rendering
+the prompt (``prompt_seconds``) and writing the export (``export_seconds``).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bbreporter.cli import add_report_arguments, read_additional_details, render_report
+from bbreporter.export import write_export
+
+PROMPT_FILENAME = 'prompt.txt'
+SUMMARY_FILENAME = 'summary.json'
+
+
+def output_names(league_dirs):
+    """One output folder name per league: the directory's name, numbered if two leagues share it."""
+    names = []
+    seen = {}
+    for league_dir in league_dirs:
+        name = os.path.basename(os.path.normpath(league_dir)) or 'league'
+        seen[name] = seen.get(name, 0) + 1
+        names.append(name if seen[name] == 1 else f"{name}-{seen[name]}")
+    return names
+
+
+def generate_league(league_dir, output_dir, args, additional_details=''):
+    """Worker: write one league's prompt and export into ``output_dir``; return its summary row."""
+    summary = {'league': league_dir, 'output_dir': output_dir}
+    started = time.perf_counter()
+    try:
+        if not os.path.isdir(league_dir):
+            raise FileNotFoundError(f"Data directory not found: {league_dir}")
+        os.makedirs(output_dir, exist_ok=True)
+        prompt, data = render_report(league_dir, args, additional_details)
+        rendered = time.perf_counter()
+
+        prompt_path = os.path.join(output_dir, PROMPT_FILENAME)
+        with open(prompt_path, 'w', encoding='utf-8') as f:
+            f.write(prompt)
+        export_path = os.path.join(output_dir, 'blood_bowl_data.json.gz' if args.gzip else 'blood_bowl_data.json')
+        with open(export_path, 'wb') as f:
+            write_export(data, f, compact=args.compact, compress=args.gzip)
+        finished = time.perf_counter()
+
+        summary.update(
+            ok=True,
+            records={key: len(value) for key, value in data.items() if isinstance(value, list)},
+            prompt_bytes=os.path.getsize(prompt_path),
+            export_bytes=os.path.getsize(export_path),
+            prompt_seconds=round(rendered - started, 4),
+            export_seconds=round(finished - rendered, 4),
+        )
+    except Exception as e:
+        # One broken league must not stop the others; the summary records what went wrong
+        summary.update(ok=False, error=f"{type(e).__name__}: {e}")
+    summary['seconds'] = round(time.perf_counter() - started, 4)
+    return summary
+
+
+def run_batch(league_dirs, output_dir, args, workers=None):
+    """Generate every league on a process pool; return the summary rows in input order."""
+    additional_details = read_additional_details(args)
+    targets = [os.path.join(output_dir, name) for name in output_names(league_dirs)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(generate_league, league_dir, target, args, additional_details)
+                   for league_dir, target in zip(league_dirs, targets)]
+        return [future.result() for future in futures]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bbreporter.batch',
+                                     description="Generate report prompts and data files for several leagues in parallel.")
+    parser.add_argument('league_dirs', nargs='+', help="League data directories.")
+    parser.add_argument('--output-dir', required=True, help="Folder that receives one sub-folder per league.")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: one per CPU).")
+    add_report_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+    summaries = run_batch(args.league_dirs, args.output_dir, args, args.workers)
+    elapsed = time.perf_counter() - started
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    with open(os.path.join(args.output_dir, SUMMARY_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump({'seconds': round(elapsed, 4), 'leagues': summaries}, f, indent=4)
+
+    for summary in summaries:
+        if summary['ok']:
+            print(f"{summary['league']}: prompt {summary['prompt_bytes'] / 1024:.1f} KB, "
+                  f"data {summary['export_bytes'] / 1024:.1f} KB in {summary['seconds']:.2f}s")
+        else:
+            print(f"{summary['league']}: FAILED ({summary['error']})", file=sys.stderr)
+    print(f"{len(summaries)} leagues in {elapsed:.2f}s")
+    return 0 if all(summary['ok'] for summary in summaries) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Benchmarks for the data path, on synthetic leagues of several sizes.
+
+For each scale (number of players) a league from :mod:`bbreporter.synthetic`
+is written to a temporary directory and each step is timed, best of
+``--repeat`` runs, with the in-process caches cleared so every run does the
+full work::
+
+    python -m bbreporter.benchmark                      # 10, 1k and 100k players
+    python -m bbreporter.benchmark --scales 1000 --json results.json
+    python -m bbreporter.benchmark --baseline results.json
+
+``--json`` saves the timings; ``--baseline`` compares against a saved run and
+marks steps that got more than 20% slower.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from bbreporter import indexes, journal, prompt, standings
+from bbreporter.export import export_bytes
+from bbreporter.league import COLLECTION_FILES
+from bbreporter.synthetic import generate_league, write_league
+
+DEFAULT_SCALES = (10, 1000, 100000)
+
+# A step counts as a regression when it is this much slower than the baseline
+REGRESSION_RATIO = 1.2
+
+
+# --- Steps ---
+# Each step takes (data, data_dir) and does the work once
+def _save(data, data_dir):
+    write_league(data_dir, data)
+
+
+def _load(data, data_dir):
+    for filename in COLLECTION_FILES.values():
+        journal.load(os.path.join(data_dir, filename))
+
+
+def _index_build(data, data_dir):
+    indexes.NameIndex(data['team_profiles'], 'team_name')
+    indexes.NameIndex(data['player_profiles'], 'player_name', group_field='team_name')
+
+
+def _standings(data, data_dir):
+    standings._tables.clear()
+    standings.compute_standings(data['matches'], [team['team_name'] for team in data['team_profiles']])
+
+
+def _prompt(data, data_dir):
+    prompt._sections.clear()
+    prompt.build_prompt(data, "Jim Johnson", "Veteran commentator", "Humorous", "Approximately 500 words")
+
+
+def _export(data, data_dir):
+    export_bytes(data)
+
+
+def _export_gzip(data, data_dir):
+    export_bytes(data, compact=True, compress=True)
+
+
+STEPS = (
+    ('save', _save),
+    ('load', _load),
+    ('index build', _index_build),
+    ('standings', _standings),
+    ('prompt', _prompt),
+    ('export', _export),
+    ('export gzip', _export_gzip),
+)
+
+
+def run_scale(players, repeat=3):
+    """Best-of-``repeat`` seconds for every step on a league of ``players`` players."""
+    data = generate_league(players)
+    data_dir = tempfile.mkdtemp(prefix='bbreporter-bench-')
+    try:
+        write_league(data_dir, data)
+        results = {}
+        for name, step in STEPS:
+            best = None
+            for _ in range(repeat):
+                started = time.perf_counter()
+                step(data, data_dir)
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = best
+        return results
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def format_report(results, baseline=None):
+    scales = list(results)
+    lines = ["step".ljust(14) + "".join(f"{scale + ' players':>22}" for scale in scales)]
+    for name, _ in STEPS:
+        cells = []
+        for scale in scales:
+            seconds = results[scale][name]
+            cell = f"{seconds * 1000:.2f} ms"
+            previous = (baseline or {}).get(scale, {}).get(name)
+            if previous:
+                ratio = seconds / previous
+                cell += f" ({ratio:.2f}x{'!' if ratio > REGRESSION_RATIO else ''})"
+            cells.append(f"{cell:>22}")
+        lines.append(name.ljust(14) + "".join(cells))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bbreporter.benchmark', description="Time the data path on synthetic leagues.")
+    parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES), help="Numbers of players to test.")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per step; the best is kept (default: 3).")
+    parser.add_argument('--json', help="Save the timings to this file.")
+    parser.add_argument('--baseline', help="Compare against timings saved with --json.")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    # JSON object keys are strings, so scales are keyed by str(players) throughout
+    results = {}
+    for players in args.scales:
+        print(f"Running {players} players...", file=sys.stderr)
+        results[str(players)] = run_scale(players, args.repeat)
+    print(format_report(results, baseline))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=4)
+    regressions = [(scale, name) for scale, steps in results.items() for name, seconds in steps.items()
+                   if (baseline or {}).get(scale, {}).get(name) and seconds > baseline[scale][name] * REGRESSION_RATIO]
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""Fit a generated prompt into a token budget.
+
+Token counts are estimated locally (no tokenizer download): words and
+punctuation count as one token each, plus one per eight characters of long
+words, which tracks BPE tokenizers closely enough for English prose.
+
+When the full prompt is over budget, whole items are dropped, lowest
+priority first, always from the section that currently costs the most
+tokens, until it fits or each section is down to its most important item:
+
+- matches: most recent first
+- players: touchdowns, interceptions, casualties and MVPs, highest first
+- injuries: open injuries before healed ones, then most recently reported first
+- narratives: storylines with recent developments first, then newest
+- teams: teams that have played the most matches first
+
+Only then are the long free-text fields of the remaining items shortened,
+and items dropped again if even that is not enough.
+"""
+import re
+from datetime import datetime
+
+from bbreporter.prompt import SECTION_FORMATTERS, build_prompt
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# Free-text fields shortened once dropping alone is not enough, and the length they are cut to
+TRUNCATE_FIELDS = {
+    'team_profiles': ('team_history', 'achievements'),
+    'player_profiles': ('bio', 'career_highlights'),
+    'matches': ('key_events',),
+    'injuries': ('injury_description',),
+    'narratives': ('description', 'recent_developments'),
+}
+TRUNCATE_LENGTH = 300
+
+TRIMMABLE_SECTIONS = tuple(TRUNCATE_FIELDS)
+
+# Items each section keeps while dropping, before any text is shortened
+KEEP_BEFORE_TRUNCATING = 1
+
+# Words in an injury's time out or expected return that mark it as healed
+_HEALED_RE = re.compile(r"\b(healed|recovered|returned|resolved|cleared)\b", re.IGNORECASE)
+
+
+def estimate_tokens(text):
+    return sum(1 + len(word) // 8 for word in _TOKEN_RE.findall(text))
+
+
+# --- Priorities (higher sorts first) ---
+def _match_date(match):
+    try:
+        return datetime.strptime(match.get('match_date', ''), '%B %d, %Y')
+    except ValueError:
+        return datetime.min
+
+
+def _player_score(player):
+    stats = player.get('stats') or {}
+    return (stats.get('touchdowns', 0) + stats.get('interceptions', 0)
+            + stats.get('injuries_caused', 0) + 2 * stats.get('mvp_awards', 0))
+
+
+def _injury_open(injury):
+    return not _HEALED_RE.search(f"{injury.get('time_out', '')} {injury.get('expected_return', '')}")
+
+
+def _priorities(section, records, data):
+    if section == 'matches':
+        return [(_match_date(match), idx) for idx, match in enumerate(records)]
+    if section == 'player_profiles':
+        return [(_player_score(player), -idx) for idx, player in enumerate(records)]
+    if section == 'injuries':
+        return [(_injury_open(injury), idx) for idx, injury in enumerate(records)]
+    if section == 'narratives':
+        return [(bool(narrative.get('recent_developments')), idx) for idx, narrative in enumerate(records)]
+    if section == 'team_profiles':
+        played = {}
+        for match in data.get('matches') or []:
+            for name in (match.get('team_a_name'), match.get('team_b_name')):
+                played[name] = played.get(name, 0) + 1
+        return [(played.get(team.get('team_name'), 0), -idx) for idx, team in enumerate(records)]
+    return [(idx,) for idx in range(len(records))]
+
+
+def _truncate(record, fields):
+    shortened = dict(record)
+    changed = False
+    for field in fields:
+        value = shortened.get(field)
+        if isinstance(value, str) and len(value) > TRUNCATE_LENGTH:
+            shortened[field] = value[:TRUNCATE_LENGTH].rstrip() + "..."
+            changed = True
+    return shortened, changed
+
+
+def fit_prompt(data, reporter_name, reporter_description, tone_style, format_length, max_tokens, standings=None, versions=None):
+    """Build the prompt, trimming content until its estimated size is within ``max_tokens``.
+
+    Returns ``(prompt, report)`` where ``report`` holds the final ``tokens``
+    estimate, the number of items ``dropped`` and ``truncated`` per section,
+    and whether the prompt ``fits`` (it may not if even the bare template is too big).
+    ``standings`` is passed to :func:`build_prompt` untouched, so it always
+    reflects every match, dropped or not. ``versions`` only applies to the
+    untrimmed ``data``.
+    """
+    def render(current, versions=None):
+        return build_prompt(current, reporter_name, reporter_description, tone_style, format_length, standings, versions)
+
+    report = {'dropped': {}, 'truncated': {}}
+    prompt = render(data, versions)
+    tokens = estimate_tokens(prompt)
+    if tokens <= max_tokens:
+        report.update(tokens=tokens, fits=True)
+        return prompt, report
+
+    # Per-item costs, and each section's items ordered so the least important is last
+    data = dict(data)
+    costs = {}
+    queues = {}
+    for section in TRIMMABLE_SECTIONS:
+        records = data[section] = list(data.get(section) or [])
+        costs[section] = [estimate_tokens(SECTION_FORMATTERS[section]([record])) for record in records]
+        priorities = _priorities(section, records, data)
+        queues[section] = sorted(range(len(records)), key=priorities.__getitem__, reverse=True)
+    totals = {section: sum(costs[section]) for section in TRIMMABLE_SECTIONS}
+    dropped = {section: set() for section in TRIMMABLE_SECTIONS}
+
+    def drop_until_fits(keep):
+        while True:
+            trimmed = dict(data)
+            for section in TRIMMABLE_SECTIONS:
+                trimmed[section] = [record for idx, record in enumerate(data[section]) if idx not in dropped[section]]
+            prompt = render(trimmed)
+            tokens = estimate_tokens(prompt)
+            candidates = [section for section in TRIMMABLE_SECTIONS if len(queues[section]) > keep]
+            if tokens <= max_tokens or not candidates:
+                return prompt, tokens
+            excess = tokens - max_tokens
+            while excess > 0 and candidates:
+                section = max(candidates, key=totals.get)
+                idx = queues[section].pop()
+                dropped[section].add(idx)
+                totals[section] -= costs[section][idx]
+                excess -= costs[section][idx]
+                candidates = [section for section in TRIMMABLE_SECTIONS if len(queues[section]) > keep]
+
+    prompt, tokens = drop_until_fits(KEEP_BEFORE_TRUNCATING)
+    if tokens > max_tokens:
+        # Dropping alone was not enough: shorten the items that are left, then drop again if need be
+        for section, fields in TRUNCATE_FIELDS.items():
+            count = 0
+            for idx in queues[section]:
+                record, changed = _truncate(data[section][idx], fields)
+                if changed:
+                    data[section][idx] = record
+                    totals[section] -= costs[section][idx]
+                    costs[section][idx] = estimate_tokens(SECTION_FORMATTERS[section]([record]))
+                    totals[section] += costs[section][idx]
+                    count += 1
+            if count:
+                report['truncated'][section] = count
+        prompt, tokens = drop_until_fits(0)
+
+    report['dropped'] = {section: len(indices) for section, indices in dropped.items() if indices}
+    report.update(tokens=tokens, fits=tokens <= max_tokens)
+    return prompt, report
@@ -0,0 +1,160 @@
+"""Bulk import of teams, players and matches from CSV or JSON files.
+
+A file is read into one DataFrame and every check (required fields, known
+teams, race/position pairs, numeric stats, dates) runs over whole columns at
+once. Each check contributes ``(row, message)`` errors; rows without errors
+become records shaped exactly like the ones the add forms create, ready to
+be committed with a single write.
+
+JSON files may hold a list of records, or a dict such as the
+``blood_bowl_data.json`` export, in which case the matching collection is used.
+"""
+import json
+
+import pandas as pd
+
+from bbreporter import scores
+from bbreporter.rules import STAT_FIELDS
+
+# Record fields in the order the add forms write them
+TEAM_FIELDS = ('team_name', 'team_race', 'coach_name', 'team_history', 'achievements', 'team_logo')
+PLAYER_FIELDS = ('player_name', 'team_name', 'team_race', 'position', 'bio', 'career_highlights', 'player_photo')
+MATCH_FIELDS = ('match_date', 'team_a_name', 'team_a_race', 'team_b_name', 'team_b_race', 'final_score', 'key_events')
+
+# Date formats accepted for match_date; the first is the one the app stores
+DATE_FORMATS = ('%B %d, %Y', '%Y-%m-%d', '%d/%m/%Y')
+
+
+def read_upload(uploaded_file, collection):
+    """Read a CSV or JSON upload into a DataFrame of strings (and stats numbers)."""
+    if uploaded_file.name.lower().endswith('.json'):
+        data = json.load(uploaded_file)
+        if isinstance(data, dict):
+            data = data.get(collection) or []
+        if not isinstance(data, list) or not all(isinstance(record, dict) for record in data):
+            raise ValueError("JSON imports must be a list of records.")
+        # Nested player stats become "stats.touchdowns" etc.; use the plain CSV column names
+        frame = pd.json_normalize(data, max_level=1)
+        return frame.rename(columns=lambda column: column.split('.', 1)[1] if column.startswith('stats.') else column)
+    return pd.read_csv(uploaded_file, dtype=str, keep_default_na=False)
+
+
+# --- Column Helpers ---
+def _text(frame, column):
+    if column not in frame:
+        return pd.Series('', index=frame.index, dtype=object)
+    return frame[column].fillna('').astype(str).str.strip()
+
+
+class _Errors:
+    def __init__(self, frame):
+        self.frame = frame
+        self.rows = []
+        self.bad = pd.Series(False, index=frame.index)
+
+    def flag(self, mask, message):
+        # Rows are reported 1-based, counting data rows only
+        for row in self.frame.index[mask]:
+            self.rows.append((row + 1, message))
+        self.bad |= mask
+
+    def require(self, columns, labels):
+        for field, label in labels.items():
+            self.flag(columns[field] == '', f"{label} is required.")
+
+    def table(self):
+        errors = pd.DataFrame(self.rows, columns=['Row', 'Error'])
+        return errors.sort_values('Row', kind='stable').reset_index(drop=True)
+
+
+def _duplicated(keys, existing):
+    """Rows whose key repeats an earlier row of the file or an existing record."""
+    return keys.duplicated() | keys.isin(existing)
+
+
+def _records(columns, order, keep):
+    return pd.DataFrame({field: columns[field] for field in order})[keep].to_dict('records')
+
+
+# --- Validators ---
+# Each returns (records, errors): the valid rows as records, and a Row/Error DataFrame
+def validate_teams(frame, races, existing_teams):
+    frame = frame.reset_index(drop=True)
+    columns = {field: _text(frame, field) for field in TEAM_FIELDS}
+    errors = _Errors(frame)
+    errors.require(columns, {'team_name': "Team Name", 'team_race': "Team Race"})
+    errors.flag((columns['team_race'] != '') & ~columns['team_race'].isin(races), "Unknown team race.")
+    errors.flag((columns['team_name'] != '') & _duplicated(columns['team_name'], existing_teams), "Duplicate team name.")
+    return _records(columns, TEAM_FIELDS, ~errors.bad), errors.table()
+
+
+def validate_players(frame, team_races, race_positions, existing_players):
+    """``team_races`` maps team name -> race, ``existing_players`` holds (team, player) pairs."""
+    frame = frame.reset_index(drop=True)
+    # team_race always comes from the team profile, never from the file
+    columns = {field: _text(frame, field) for field in PLAYER_FIELDS if field != 'team_race'}
+    errors = _Errors(frame)
+    errors.require(columns, {'player_name': "Player Name", 'team_name': "Team Name", 'position': "Position"})
+
+    team_race = columns['team_name'].map(team_races)
+    errors.flag((columns['team_name'] != '') & team_race.isna(), "Unknown team; add the team first.")
+    columns['team_race'] = team_race.fillna('')
+
+    # Positions are only checked for races that have a position list, as in the add form
+    valid_pairs = pd.MultiIndex.from_tuples(
+        [(race, position) for race, positions in race_positions.items() for position in positions])
+    has_positions = columns['team_race'].isin(list(race_positions))
+    pairs = pd.MultiIndex.from_arrays([columns['team_race'], columns['position']])
+    errors.flag(has_positions & (columns['position'] != '') & ~pairs.isin(valid_pairs),
+                "Position is not available for the team's race.")
+
+    keys = pd.Series(list(zip(columns['team_name'], columns['player_name'])), index=frame.index)
+    errors.flag((columns['player_name'] != '') & _duplicated(keys, set(existing_players)),
+                "Duplicate player on this team.")
+
+    for field in STAT_FIELDS:
+        raw = frame[field] if field in frame else pd.Series(0, index=frame.index)
+        raw = raw.replace('', 0).fillna(0)
+        numbers = pd.to_numeric(raw, errors='coerce')
+        errors.flag(numbers.isna() | (numbers < 0) | (numbers % 1 != 0),
+                    f"{field.replace('_', ' ').title()} must be a whole number of 0 or more.")
+        columns[field] = numbers.fillna(0)
+
+    records = []
+    for record in _records(columns, PLAYER_FIELDS + STAT_FIELDS, ~errors.bad):
+        record['stats'] = {field: int(record.pop(field)) for field in STAT_FIELDS}
+        records.append(record)
+    return records, errors.table()
+
+
+def _parse_dates(values):
+    parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+    for date_format in DATE_FORMATS:
+        missing = parsed.isna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(values[missing], format=date_format, errors='coerce')
+    return parsed
+
+
+def validate_matches(frame, team_races):
+    frame = frame.reset_index(drop=True)
+    columns = {field: _text(frame, field) for field in MATCH_FIELDS if not field.endswith('_race')}
+    errors = _Errors(frame)
+    errors.require(columns, {'match_date': "Match Date", 'team_a_name': "Team A Name",
+                             'team_b_name': "Team B Name", 'final_score': "Final Score"})
+
+    dates = _parse_dates(columns['match_date'])
+    errors.flag((columns['match_date'] != '') & dates.isna(), "Unrecognized match date.")
+    columns['match_date'] = dates.dt.strftime('%B %d, %Y').fillna('')
+
+    for side in ('a', 'b'):
+        names = columns[f'team_{side}_name']
+        race = names.map(team_races)
+        errors.flag((names != '') & race.isna(), f"Unknown Team {side.upper()}; add the team first.")
+        columns[f'team_{side}_race'] = race.fillna('')
+
+    records = _records(columns, MATCH_FIELDS, ~errors.bad)
+    for match in records:
+        match.update(scores.score_fields(match))
+    return records, errors.table()
@@ -0,0 +1,99 @@
+"""Plotly figures for the Match Reports, Injury Reports and Narratives tabs.
+
+Each collection is first reduced to counts per category (per scoreline, per
+team and injury type, per storyline subject), so a figure holds one bar per
+category rather than one row per record. Figures are cached on the League's
+version stamp of the collection, so reruns that do not change it, such as
+clicking an unrelated button, neither count nor build anything; callers
+without a League get the figure cached on a hash of the counts.
+"""
+from collections import Counter
+
+import plotly.express as px
+
+from bbreporter.memo import LRUCache
+from bbreporter.prompt import content_hash
+
+FIGURE_CACHE_SIZE = 16
+
+_figures = LRUCache(FIGURE_CACHE_SIZE)
+
+# Cache default telling a miss apart from a cached "nothing to plot"
+_MISSING = object()
+
+
+# --- Aggregation ---
+def scoreline_counts(matches):
+    """``[(scoreline, matches)]``, the winner's score first, so 1-2 and 2-1 both count as "2-1"."""
+    counts = Counter()
+    for match in matches:
+        team_a_td, team_b_td = match.get('team_a_td'), match.get('team_b_td')
+        if team_a_td is None or team_b_td is None:
+            continue
+        counts[f"{max(team_a_td, team_b_td)}-{min(team_a_td, team_b_td)}"] += 1
+    return sorted(counts.items(), key=lambda item: tuple(int(part) for part in item[0].split('-')))
+
+
+def injury_counts(injuries):
+    """``[(team_name, injury_type, injuries)]``."""
+    counts = Counter((injury.get('team_name', ''), injury.get('injury_type', '')) for injury in injuries)
+    return [(team_name, injury_type, count) for (team_name, injury_type), count in sorted(counts.items())]
+
+
+def narrative_counts(narratives):
+    """``[(teams_or_players_involved, narratives)]``."""
+    counts = Counter(narrative.get('teams_or_players_involved', '') for narrative in narratives)
+    return sorted(counts.items())
+
+
+# --- Figures ---
+def _scorelines_figure(counts):
+    return px.bar(x=[scoreline for scoreline, _ in counts], y=[count for _, count in counts],
+                  title='Match Outcomes', labels={'x': 'Final Score', 'y': 'Matches'})
+
+
+def _injuries_figure(counts):
+    return px.bar(x=[team_name for team_name, _, _ in counts], y=[count for _, _, count in counts],
+                  color=[injury_type for _, injury_type, _ in counts],
+                  title='Injuries by Team', labels={'x': 'Team', 'y': 'Injuries', 'color': 'Injury Type'})
+
+
+def _narratives_figure(counts):
+    return px.bar(x=[involved for involved, _ in counts], y=[count for _, count in counts],
+                  title='Narratives by Teams/Players', labels={'x': 'Teams/Players Involved', 'y': 'Narratives'})
+
+
+_BUILDERS = {
+    'matches': (scoreline_counts, _scorelines_figure),
+    'injuries': (injury_counts, _injuries_figure),
+    'narratives': (narrative_counts, _narratives_figure),
+}
+
+
+def figure(collection, records, version=None):
+    """The chart for ``collection``, or None when there is nothing to plot.
+
+    ``version`` is the League's stamp for ``collection``
+    (``league.versions[collection]``); without one the counts are hashed.
+    The cached figure object itself is returned, so callers must not change it.
+    """
+    if version is not None:
+        fig = _figures.get((collection, version), _MISSING)
+        if fig is _MISSING:
+            fig = _figure(collection, records)
+            _figures.put((collection, version), fig)
+        return fig
+    return _figure(collection, records)
+
+
+def _figure(collection, records):
+    aggregate, build = _BUILDERS[collection]
+    counts = aggregate(records)
+    if not counts:
+        return None
+    key = (collection, content_hash(counts))
+    fig = _figures.get(key)
+    if fig is None:
+        fig = build(counts)
+        _figures.put(key, fig)
+    return fig
@@ -0,0 +1,102 @@
+"""Command-line prompt generation, without Streamlit.
+
+Reads the league collections from a data directory (the app's ``data/``),
+without writing to it, and writes the same GPT prompt and
+``blood_bowl_data.json`` export the Generate Prompt tab produces::
+
+    python -m bbreporter --reporter-name "Jim Johnson" \\
+        --reporter-description "Veteran commentator" --tone Humorous \\
+        --prompt-out report_prompt.txt --export blood_bowl_data.json
+
+Only the standard library and the light ``bbreporter`` modules are imported,
+so it starts quickly enough for cron; pandas is loaded only for ``--standings``.
+"""
+import argparse
+import os
+import sys
+
+from bbreporter.export import write_export
+from bbreporter.league import LEAGUE_INFO_FILE, League
+from bbreporter.prompt import build_data_file_prompt, build_prompt, render_section
+
+TONES = ["Humorous", "Serious", "Dramatic", "Satirical"]
+
+
+def _open_output(path, binary):
+    if path == '-':
+        return sys.stdout.buffer if binary else sys.stdout
+    return open(path, 'wb' if binary else 'w', encoding=None if binary else 'utf-8')
+
+
+def add_report_arguments(parser):
+    """Options shared by the single-league and batch commands."""
+    parser.add_argument('--league-info', default=LEAGUE_INFO_FILE, help="League info file inside the data directory.")
+    parser.add_argument('--reporter-name', required=True, help="Reporter character name.")
+    parser.add_argument('--reporter-description', required=True, help="Personality, style and quirks of the reporter.")
+    parser.add_argument('--tone', default=TONES[0], choices=TONES, help="Tone and style of the report.")
+    parser.add_argument('--format-length', default="Approximately 500 words", help="Format and desired length.")
+    parser.add_argument('--additional-details', default='', help="Quotes, interviews or events to highlight.")
+    parser.add_argument('--additional-details-file', help="Read the additional details from a file instead.")
+    parser.add_argument('--standings', action='store_true', help="Add the league standings table to the prompt.")
+    parser.add_argument('--inline-data', action='store_true',
+                        help="Write every section into the prompt itself instead of referring to the data file.")
+    parser.add_argument('--compact', action='store_true', help="Write the data file without indentation.")
+    parser.add_argument('--gzip', action='store_true', help="Gzip the data file.")
+
+
+def read_additional_details(args):
+    if args.additional_details_file:
+        with open(args.additional_details_file, encoding='utf-8') as f:
+            return f.read()
+    return args.additional_details
+
+
+def render_report(data_dir, args, additional_details=''):
+    """Load the league in ``data_dir`` and return ``(prompt, data)`` for the options in ``args``."""
+    league = League(data_dir, read_only=True)
+    league.load_league_info(args.league_info)
+    data = league.data(additional_details)
+    standings = render_section('standings', data['matches'], league.versions['matches']) if args.standings else None
+    if args.inline_data:
+        prompt = build_prompt(data, args.reporter_name, args.reporter_description, args.tone, args.format_length, standings,
+                              league.versions)
+    else:
+        prompt = build_data_file_prompt(data['league_info'], args.reporter_name, args.reporter_description,
+                                        args.tone, args.format_length, standings)
+    return prompt.strip() + "\n", data
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bbreporter', description="Generate a Blood Bowl report prompt and data file.")
+    parser.add_argument('--data-dir', default=os.path.join(os.getcwd(), 'data'), help="League data directory (default: ./data).")
+    add_report_arguments(parser)
+    parser.add_argument('--prompt-out', default='-', help="Where to write the prompt ('-' for stdout, the default).")
+    parser.add_argument('--export', help="Where to write blood_bowl_data.json ('-' for stdout); skipped if omitted.")
+    args = parser.parse_args(argv)
+    if args.prompt_out == '-' and args.export == '-':
+        parser.error("--prompt-out and --export cannot both write to stdout.")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not os.path.isdir(args.data_dir):
+        print(f"Data directory not found: {args.data_dir}", file=sys.stderr)
+        return 1
+    prompt, data = render_report(args.data_dir, args, read_additional_details(args))
+
+    output = _open_output(args.prompt_out, binary=False)
+    try:
+        output.write(prompt)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    if args.export:
+        output = _open_output(args.export, binary=True)
+        try:
+            write_export(data, output, compact=args.compact, compress=args.gzip)
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+    return 0
@@ -0,0 +1,123 @@
+"""Structured per-player match events and the player stats they drive.
+
+Besides the free-text ``key_events``, a match report may carry ``events``, a
+list of ``{'type', 'player_name', 'team_name'}`` dicts where the type is one
+of :data:`EVENT_STATS`, and ``participants``, the ``[team_name, player_name]``
+pairs on both rosters when the match was recorded. Each participant counts
+one match played and each event one touchdown, interception, casualty or MVP
+award, so a player's ``stats`` are the hand-entered numbers plus the sum over
+matches. Only the hand-entered part is stored with the player; the league
+adds the match totals (:func:`stat_totals`) when it loads. Adding, editing or
+deleting a match then changes only the players it names: :func:`stat_changes`
+diffs the old and new record and :func:`shift_stats` applies the difference,
+so a match report is saved as one journal entry, never one per player.
+
+Matches without ``participants`` (older reports, bulk imports) add no
+matches played, only the events they carry, if any.
+"""
+import re
+
+# Event type -> the player stat it counts towards
+EVENT_STATS = {
+    'TD': 'touchdowns',
+    'INT': 'interceptions',
+    'CAS': 'injuries_caused',
+    'MVP': 'mvp_awards',
+}
+
+_EVENT_RE = re.compile(r"^\s*([A-Za-z]+)\s*[:\-]\s*(.+?)\s*$")
+
+
+# --- Parsing ---
+def parse_events(text):
+    """Parse one ``TYPE: Player Name`` per line; return ``(events, errors)``.
+
+    ``events`` are ``(type, player_name)`` pairs; blank lines are skipped.
+    """
+    events = []
+    errors = []
+    for number, line in enumerate((text or '').splitlines(), start=1):
+        if not line.strip():
+            continue
+        found = _EVENT_RE.match(line)
+        event_type = found.group(1).upper() if found else ''
+        if event_type not in EVENT_STATS:
+            errors.append(f"Line {number}: expected 'TYPE: Player Name' with TYPE one of {', '.join(EVENT_STATS)}.")
+            continue
+        events.append((event_type, found.group(2)))
+    return events, errors
+
+
+def format_events(events):
+    """The text :func:`parse_events` reads back, for prefilling the edit form."""
+    return "\n".join(f"{event['type']}: {event['player_name']}" for event in events or [])
+
+
+def roster(player_index, team_name):
+    """Player names of ``team_name``, in collection order."""
+    return [record.get('player_name', '') for _, record in player_index.group_entries(team_name)]
+
+
+def participants(player_index, team_a_name, team_b_name):
+    """``[team_name, player_name]`` for everyone on both rosters."""
+    teams = [team_a_name] if team_a_name == team_b_name else [team_a_name, team_b_name]
+    return [[team, name] for team in teams for name in roster(player_index, team)]
+
+
+def resolve_events(parsed, player_index, team_a_name, team_b_name):
+    """Attach each parsed event's player to Team A or Team B; return ``(events, errors)``."""
+    rosters = {team: set(roster(player_index, team)) for team in (team_a_name, team_b_name)}
+    events = []
+    errors = []
+    for event_type, player_name in parsed:
+        teams = [team for team in dict.fromkeys((team_a_name, team_b_name)) if player_name in rosters[team]]
+        if not teams:
+            errors.append(f"{event_type}: '{player_name}' is not on {team_a_name} or {team_b_name}.")
+        elif len(teams) > 1:
+            errors.append(f"{event_type}: '{player_name}' plays for both teams.")
+        else:
+            events.append({'type': event_type, 'player_name': player_name, 'team_name': teams[0]})
+    return events, errors
+
+
+# --- Stat changes ---
+def _add_counts(changes, match, sign):
+    if not match:
+        return
+    for team_name, player_name in match.get('participants', []):
+        counts = changes.setdefault((team_name, player_name), {})
+        counts['matches_played'] = counts.get('matches_played', 0) + sign
+    for event in match.get('events', []):
+        stat = EVENT_STATS.get(event['type'])
+        if stat:
+            counts = changes.setdefault((event['team_name'], event['player_name']), {})
+            counts[stat] = counts.get(stat, 0) + sign
+
+
+def stat_changes(old_match, new_match):
+    """``{(team_name, player_name): {stat: delta}}`` for replacing ``old_match`` by ``new_match``.
+
+    Either may be None (an added or deleted match). Only the two matches'
+    participants and events are visited; stats that cancel out are dropped.
+    """
+    changes = {}
+    _add_counts(changes, old_match, -1)
+    _add_counts(changes, new_match, 1)
+    return {key: {stat: delta for stat, delta in counts.items() if delta}
+            for key, counts in changes.items() if any(counts.values())}
+
+
+def stat_totals(matches):
+    """``{(team_name, player_name): {stat: count}}`` summed over every match."""
+    totals = {}
+    for match in matches:
+        _add_counts(totals, match, 1)
+    return totals
+
+
+def shift_stats(stats, counts, sign=1):
+    """A copy of the ``stats`` dict with ``counts`` added (or, with ``sign=-1``, taken out)."""
+    shifted = dict(stats or {})
+    for stat, count in counts.items():
+        shifted[stat] = int(shifted.get(stat) or 0) + sign * count
+    return shifted
@@ -0,0 +1,65 @@
+"""Streaming serializer for the ``blood_bowl_data.json`` export.
+
+The export is produced one section, and within list sections one record, at
+a time, and written straight into the destination (optionally through gzip),
+so the full pretty-printed document never exists as a single string. The
+output is byte-for-byte what ``json.dumps(data, indent=4)`` would produce, or
+``json.dumps(data, separators=(',', ':'))`` in compact mode.
+"""
+import gzip
+import io
+import json
+
+INDENT = ' ' * 4
+
+
+def iter_export(data, compact=False):
+    """Yield the JSON text of the export dict ``data`` in small chunks."""
+    if compact:
+        dump_options = {'separators': (',', ':')}
+        key_separator = ':'
+        section_indent = record_indent = closing_indent = ''
+    else:
+        dump_options = {'indent': 4}
+        key_separator = ': '
+        section_indent = '\n' + INDENT
+        record_indent = '\n' + INDENT * 2
+        closing_indent = '\n'
+
+    def nested(text, indent):
+        # Re-indent a value dumped at the top level; newlines inside strings are escaped, so this is safe
+        return text.replace('\n', indent) if indent else text
+
+    if not data:
+        yield '{}'
+        return
+    yield '{'
+    for section_number, (key, value) in enumerate(data.items()):
+        prefix = (',' if section_number else '') + section_indent + json.dumps(key) + key_separator
+        if isinstance(value, list) and value:
+            yield prefix + '['
+            for record_number, record in enumerate(value):
+                text = nested(json.dumps(record, **dump_options), record_indent)
+                yield (',' if record_number else '') + record_indent + text
+            yield section_indent + ']'
+        else:
+            yield prefix + nested(json.dumps(value, **dump_options), section_indent)
+    yield closing_indent + '}'
+
+
+def write_export(data, fileobj, compact=False, compress=False):
+    """Stream the export into the binary file object ``fileobj``."""
+    if compress:
+        # mtime=0 keeps the archive identical for identical data
+        with gzip.GzipFile(fileobj=fileobj, mode='wb', mtime=0) as gz:
+            for chunk in iter_export(data, compact):
+                gz.write(chunk.encode('utf-8'))
+    else:
+        for chunk in iter_export(data, compact):
+            fileobj.write(chunk.encode('utf-8'))
+
+
+def export_bytes(data, compact=False, compress=False):
+    buffer = io.BytesIO()
+    write_export(data, buffer, compact, compress)
+    return buffer.getvalue()
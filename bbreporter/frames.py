@@ -0,0 +1,57 @@
+"""DataFrames of the collections that live as long as the league.
+
+A :class:`FrameCache` builds its frame on first use and, as a League watcher
+(see :meth:`bbreporter.league.League.watch`), patches single rows in place. A
+change that does not fit the frame as built (a new field, or a value pandas
+would have to change a column's dtype for) drops it, and the next read
+rebuilds it.
+"""
+import pandas as pd
+
+
+class FrameCache:
+    def __init__(self, records):
+        self.records = records
+        self._frame = None
+
+    @property
+    def frame(self):
+        """The collection as a DataFrame; it is shared, so callers must not change it."""
+        if self._frame is None:
+            self._frame = pd.DataFrame(self.records)
+        return self._frame
+
+    def _row(self, record):
+        if not set(record) <= set(self._frame.columns):
+            raise ValueError("Record has fields the frame has no column for.")
+        # Missing values are NaN in numeric columns, as pd.DataFrame(records) would store them
+        return pd.Series({
+            column: float('nan') if record.get(column) is None and self._frame[column].dtype.kind in 'iuf' else record.get(column)
+            for column in self._frame.columns
+        }, dtype=object)
+
+    def _patch(self, change):
+        if self._frame is None:
+            return
+        try:
+            change()
+        except (TypeError, ValueError):
+            # A failed row assignment may have left the frame half changed; rebuild on the next read
+            self._frame = None
+
+    # --- Change notifications ---
+    def appended(self, record):
+        def change():
+            self._frame.loc[len(self._frame)] = self._row(record)
+        self._patch(change)
+
+    def replaced(self, idx, old_record, new_record):
+        def change():
+            self._frame.iloc[idx] = self._row(new_record)
+        self._patch(change)
+
+    def removed(self, idx, old_record):
+        def change():
+            self._frame.drop(index=idx, inplace=True)
+            self._frame.reset_index(drop=True, inplace=True)
+        self._patch(change)
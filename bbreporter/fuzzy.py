@@ -0,0 +1,105 @@
+"""Type-ahead name matching that tolerates typos.
+
+:class:`NameMatcher` indexes the distinct values of one field (team or
+player names) two ways: a sorted list for prefix lookups and a trigram index
+for fuzzy ones, so "Skavin" still finds "Skaven Scramblers", and it is a
+League watcher. :meth:`NameMatcher.matches` returns only the best few names,
+so a picker never has to send thousands of options to the browser; the
+chosen option is a real name, so joins stay exact.
+"""
+from bisect import bisect_left, insort
+
+# Fuzzy matches must contain at least this share of the query's trigrams
+MIN_SIMILARITY = 0.5
+
+
+def _grams(text):
+    padded = f"  {text} "
+    return {padded[idx:idx + 3] for idx in range(len(padded) - 2)}
+
+
+class NameMatcher:
+    def __init__(self, records, field):
+        self.records = records
+        self.field = field
+        self.rebuild()
+
+    def rebuild(self):
+        # name -> records carrying it; names sorted by lowercase form; trigram -> names
+        self.counts = {}
+        self.sorted_names = []
+        self.grams = {}
+        for record in self.records:
+            self._add(record.get(self.field, ''))
+
+    def _add(self, name):
+        self.counts[name] = self.counts.get(name, 0) + 1
+        if self.counts[name] == 1:
+            insort(self.sorted_names, (name.lower(), name))
+            for gram in _grams(name.lower()):
+                self.grams.setdefault(gram, set()).add(name)
+
+    def _discard(self, name):
+        self.counts[name] -= 1
+        if self.counts[name]:
+            return
+        del self.counts[name]
+        del self.sorted_names[bisect_left(self.sorted_names, (name.lower(), name))]
+        for gram in _grams(name.lower()):
+            names = self.grams[gram]
+            names.discard(name)
+            if not names:
+                del self.grams[gram]
+
+    # --- Change notifications ---
+    def appended(self, record):
+        self._add(record.get(self.field, ''))
+
+    def replaced(self, idx, old_record, new_record):
+        self._discard(old_record.get(self.field, ''))
+        self._add(new_record.get(self.field, ''))
+
+    def removed(self, idx, old_record):
+        self._discard(old_record.get(self.field, ''))
+
+    # --- Lookups ---
+    def _prefixed(self, prefix, limit):
+        start = bisect_left(self.sorted_names, (prefix,))
+        found = []
+        for lowered, name in self.sorted_names[start:start + limit]:
+            if not lowered.startswith(prefix):
+                break
+            found.append(name)
+        return found
+
+    def matches(self, query, limit=20, keep=None):
+        """The ``limit`` best names for ``query``: prefix matches, then substrings, then near misses.
+
+        An empty query gives the first names alphabetically. ``keep`` (the
+        current value of an edit form) is always included so it stays selectable.
+        """
+        query = (query or '').strip().lower()
+        found = self._prefixed(query, limit)
+        if query and len(found) < limit:
+            # Score the names sharing a trigram with the query; substrings beat near misses
+            query_grams = _grams(query)
+            shared = {}
+            for gram in query_grams:
+                for name in self.grams.get(gram, ()):
+                    shared[name] = shared.get(name, 0) + 1
+            taken = set(found)
+            scored = []
+            for name, count in shared.items():
+                if name in taken:
+                    continue
+                similarity = count / len(query_grams)
+                if query in name.lower():
+                    scored.append((2 + similarity, name))
+                elif similarity >= MIN_SIMILARITY:
+                    scored.append((similarity, name))
+            # Equal scores: shorter names are the closer match
+            scored.sort(key=lambda item: (-item[0], len(item[1]), item[1].lower()))
+            found += [name for _, name in scored[:limit - len(found)]]
+        if keep is not None and keep in self.counts and keep not in found:
+            found = [keep] + found[:limit - 1]
+        return found
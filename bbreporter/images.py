@@ -0,0 +1,85 @@
+"""Thumbnails for uploaded team logos and player photos.
+
+Uploads are stored as-is and a small PNG thumbnail is written next to each
+one (``Reavers_logo.jpeg`` -> ``Reavers_logo_thumb.png``). The profile lists
+show the thumbnails, served from an in-process cache keyed by the original
+file's mtime, so reruns neither re-read nor re-send multi-megabyte photos.
+"""
+import os
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from bbreporter.memo import LRUCache
+
+# Longest side of a thumbnail: twice the 150px the lists display, for high-DPI screens
+THUMBNAIL_SIZE = 300
+
+THUMBNAIL_CACHE_SIZE = 512
+
+_thumbnails = LRUCache(THUMBNAIL_CACHE_SIZE)
+
+
+def thumbnail_path(image_path):
+    base, _ = os.path.splitext(image_path)
+    return f"{base}_thumb.png"
+
+
+def make_thumbnail(image_path):
+    """Write the thumbnail for ``image_path`` and return its path."""
+    with Image.open(image_path) as image:
+        # Phone photos are often stored sideways with an EXIF rotation flag
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        path = thumbnail_path(image_path)
+        image.save(path, format='PNG', optimize=True)
+    return path
+
+
+def save_upload(uploaded_file, dest_dir, stem):
+    """Store a Streamlit upload as ``dest_dir/stem.<ext>`` plus its thumbnail; return the original's path."""
+    extension = uploaded_file.type.split('/')[-1]
+    path = os.path.join(dest_dir, f"{stem}.{extension}")
+    with open(path, 'wb') as f:
+        f.write(uploaded_file.getbuffer())
+    try:
+        make_thumbnail(path)
+    except (OSError, UnidentifiedImageError):
+        # Not an image Pillow can read; thumbnail_bytes() falls back to the original
+        pass
+    invalidate(path)
+    return path
+
+
+def thumbnail_bytes(image_path):
+    """PNG bytes of the thumbnail for ``image_path``, or None if the file cannot be read.
+
+    Images stored before thumbnails existed get theirs generated on first use.
+    Files Pillow cannot decode are returned as they are, for the browser to try.
+    """
+    try:
+        mtime = os.stat(image_path).st_mtime_ns
+    except OSError:
+        return None
+    key = (image_path, mtime)
+    data = _thumbnails.get(key)
+    if data is not None:
+        return data
+    path = thumbnail_path(image_path)
+    try:
+        if not os.path.exists(path) or os.stat(path).st_mtime_ns < mtime:
+            make_thumbnail(image_path)
+    except (OSError, UnidentifiedImageError):
+        path = image_path
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    _thumbnails.put(key, data)
+    return data
+
+
+def invalidate(image_path):
+    _thumbnails.discard(lambda key: key[0] == image_path)
@@ -0,0 +1,101 @@
+"""Dict indexes for joining teams, players and matches by name.
+
+A :class:`NameIndex` wraps a live collection list and maps each name to the
+position of the first record carrying it, the same record ``next(...)`` or
+``list.index`` would have found. It is a League watcher (see
+:meth:`bbreporter.league.League.watch`).
+"""
+
+
+def position_index(values):
+    """Map each value of a list to its first position, e.g. races to their selectbox index."""
+    return {value: idx for idx, value in reversed(list(enumerate(values)))}
+
+
+class NameIndex:
+    def __init__(self, records, field, group_field=None):
+        self.records = records
+        self.field = field
+        self.group_field = group_field
+        self.rebuild()
+
+    def rebuild(self):
+        self.positions = {}
+        self.groups = {}
+        self.record_positions = {}
+        # names() in order; None until asked for, or after an edit that may reorder them
+        self._names = None
+        for idx, record in enumerate(self.records):
+            self._add(idx, record)
+
+    def _add(self, idx, record):
+        self.record_positions[id(record)] = idx
+        if self.group_field:
+            self.groups.setdefault(record.get(self.group_field, ''), {})[id(record)] = record
+        name = record.get(self.field, '')
+        if self.positions.get(name, idx + 1) > idx:
+            self.positions[name] = idx
+
+    def _discard(self, record):
+        del self.record_positions[id(record)]
+        if self.group_field:
+            self.groups[record.get(self.group_field, '')].pop(id(record), None)
+
+    def _reclaim(self, name, start):
+        # `name` lost its record; hand it to the next record carrying it, if any
+        del self.positions[name]
+        for idx in range(start, len(self.records)):
+            if self.records[idx].get(self.field, '') == name:
+                self.positions[name] = idx
+                return
+        if self._names is not None:
+            self._names.remove(name)
+
+    # --- Change notifications ---
+    def appended(self, record):
+        name = record.get(self.field, '')
+        if name not in self.positions and self._names is not None:
+            self._names.append(name)
+        self._add(len(self.records) - 1, record)
+
+    def replaced(self, idx, old_record, new_record):
+        self._discard(old_record)
+        name = old_record.get(self.field, '')
+        if new_record.get(self.field, '') != name:
+            if self.positions.get(name) == idx:
+                self._reclaim(name, idx + 1)
+            self._names = None
+        self._add(idx, new_record)
+
+    def removed(self, idx, old_record):
+        # Every later record moves up one place, so this is O(N), like the list.pop() that caused it
+        self._discard(old_record)
+        name = old_record.get(self.field, '')
+        owned = self.positions.get(name) == idx
+        for mapping in (self.positions, self.record_positions):
+            for key, position in mapping.items():
+                if position > idx:
+                    mapping[key] = position - 1
+        if owned:
+            self._reclaim(name, idx)
+            if name in self.positions:
+                self._names = None
+
+    # --- Lookups ---
+    def names(self):
+        """Distinct names in collection order, for selectbox options; shared, so callers must not change it."""
+        if self._names is None:
+            self._names = sorted(self.positions, key=self.positions.get)
+        return self._names
+
+    def get(self, name):
+        idx = self.positions.get(name)
+        return self.records[idx] if idx is not None else None
+
+    def field_of(self, name, field, default=''):
+        record = self.get(name)
+        return record.get(field, default) if record else default
+
+    def group_entries(self, group):
+        """``(position, record)`` pairs for the records in ``group``, in collection order."""
+        return sorted((self.record_positions[key], record) for key, record in self.groups.get(group, {}).items())
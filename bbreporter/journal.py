@@ -0,0 +1,161 @@
+"""Append-only journal storage for league collections.
+
+Each collection is kept as a compacted snapshot (``matches.json``) plus a
+journal (``matches.journal.jsonl``) holding one JSON line per mutation made
+since the snapshot was written. Loading replays the journal on top of the
+snapshot, and every ``COMPACT_EVERY`` entries the two are folded back into a
+fresh snapshot, so a save costs one small append instead of a full rewrite.
+
+Compaction writes the new snapshot to a temporary file, renames the journal
+aside and only then replaces the snapshot. The rename is the commit point: a
+crash before it leaves the old snapshot and journal in place, and a crash
+after it is finished by the next :func:`load`, so journal entries are never
+replayed onto a snapshot that already holds them.
+"""
+import json
+import os
+
+# Journal entries allowed to pile up before they are folded into the snapshot
+COMPACT_EVERY = 200
+
+JOURNAL_SUFFIX = '.journal.jsonl'
+
+# Entries currently in each journal, so appends never have to re-read the log
+_journal_lengths = {}
+
+
+def journal_path(snapshot_path):
+    base, _ = os.path.splitext(snapshot_path)
+    return base + JOURNAL_SUFFIX
+
+
+def _folded_path(path):
+    # Where a journal waits, already folded into the new snapshot, while the snapshot is replaced
+    return path + '.folded'
+
+
+def backing_files(snapshot_path):
+    """Files whose contents make up the collection stored at ``snapshot_path``."""
+    path = journal_path(snapshot_path)
+    return [snapshot_path, path, _folded_path(path)]
+
+
+def _read_snapshot(snapshot_path):
+    try:
+        with open(snapshot_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _apply(data, entry):
+    op = entry.get('op')
+    if op == 'set':
+        return entry.get('data')
+    if data is None:
+        data = []
+    if op == 'append':
+        data.append(entry['record'])
+    elif op == 'update':
+        if 0 <= entry['index'] < len(data):
+            data[entry['index']] = entry['record']
+    elif op == 'delete':
+        if 0 <= entry['index'] < len(data):
+            data.pop(entry['index'])
+    return data
+
+
+def _finish_compaction(snapshot_path):
+    folded = _folded_path(journal_path(snapshot_path))
+    if not os.path.exists(folded):
+        return
+    # The journal was renamed aside, so the new snapshot holds its entries; put it in place if it is not yet
+    tmp_path = snapshot_path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.replace(tmp_path, snapshot_path)
+    os.remove(folded)
+
+
+def load(snapshot_path, read_only=False):
+    """Return the snapshot with its journal replayed, or None if neither exists.
+
+    With ``read_only`` nothing on disk is touched: an interrupted compaction
+    is read as finished instead of being finished, and a torn final journal
+    line is skipped instead of being folded away.
+    """
+    path = journal_path(snapshot_path)
+    if not read_only:
+        _finish_compaction(snapshot_path)
+        data = _read_snapshot(snapshot_path)
+    elif os.path.exists(_folded_path(path)) and os.path.exists(snapshot_path + '.tmp'):
+        data = _read_snapshot(snapshot_path + '.tmp')
+    else:
+        data = _read_snapshot(snapshot_path)
+    count = 0
+    torn = False
+    try:
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn final line from an interrupted write; everything before it is good
+                    torn = True
+                    break
+                data = _apply(data, entry)
+                count += 1
+    except FileNotFoundError:
+        pass
+    if read_only:
+        return data
+    _journal_lengths[path] = count
+    if torn and data is not None:
+        # Fold the good prefix into the snapshot so new entries are not appended after garbage
+        write_snapshot(snapshot_path, data)
+    return data
+
+
+def write_snapshot(snapshot_path, data):
+    """Atomically replace the snapshot with ``data`` and drop the journal."""
+    tmp_path = snapshot_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    path = journal_path(snapshot_path)
+    if os.path.exists(path):
+        os.replace(path, _folded_path(path))
+        os.replace(tmp_path, snapshot_path)
+        os.remove(_folded_path(path))
+    else:
+        os.replace(tmp_path, snapshot_path)
+    _journal_lengths[path] = 0
+
+
+def _append_entry(snapshot_path, entry, data):
+    path = journal_path(snapshot_path)
+    if path not in _journal_lengths:
+        # First write to this collection in this process; count what is already on disk
+        load(snapshot_path)
+    with open(path, 'a') as f:
+        f.write(json.dumps(entry) + '\n')
+    _journal_lengths[path] += 1
+    if _journal_lengths[path] >= COMPACT_EVERY:
+        write_snapshot(snapshot_path, data() if callable(data) else data)
+
+
+def log_append(snapshot_path, record, data):
+    """Journal ``record`` being appended.
+
+    ``data`` is the collection after the change, or a function returning it;
+    it is only needed, and only called, when the journal is compacted.
+    """
+    _append_entry(snapshot_path, {'op': 'append', 'record': record}, data)
+
+
+def log_update(snapshot_path, index, record, data):
+    """Journal ``data[index]`` being replaced by ``record``."""
+    _append_entry(snapshot_path, {'op': 'update', 'index': index, 'record': record}, data)
+
+
+def log_delete(snapshot_path, index, data):
+    """Journal the record at ``index`` being removed."""
+    _append_entry(snapshot_path, {'op': 'delete', 'index': index}, data)
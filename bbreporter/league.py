@@ -0,0 +1,342 @@
+"""One league's data, loaded from a data directory and kept in sync with storage.
+
+:class:`League` owns the five collections (plain lists of dicts), the name
+indexes over teams and players (and their type-ahead matchers), the
+columnar player stats, the full-text search index, DataFrames of the
+collections and the storage backend. Its ``add``, ``update`` and ``delete``
+methods change a collection, everything watching it and the stored copy
+together, so the Streamlit apps, the command line and batch jobs all share
+one code path. The apps keep one League per server process; its changes are
+serialized by :attr:`League.lock`, and ``update``/``delete`` can be given
+the record the caller saw, so a stale position never edits the wrong record.
+Match reports that carry structured events also update the stats of the
+players they name (see :mod:`bbreporter.events`). Nothing here imports
+Streamlit, and pandas only once a DataFrame is asked for.
+"""
+import itertools
+import os
+import re
+import threading
+from functools import wraps
+
+from bbreporter import events, indexes, journal, scores
+
+# Collection name -> default file in the data directory
+COLLECTION_FILES = {
+    'team_profiles': 'team_profiles.json',
+    'player_profiles': 'player_profiles.json',
+    'matches': 'matches.json',
+    'injuries': 'injuries.json',
+    'narratives': 'narratives.json',
+}
+
+LEAGUE_INFO_FILE = 'league_info.json'
+
+# Version stamps come from one process-wide counter, so no two leagues (or reloads of one) share a stamp
+_stamps = itertools.count(1)
+
+
+def is_valid_filename(filename):
+    # Allow only alphanumeric characters, underscores, hyphens, spaces, and periods
+    return re.match(r'^[\w\-. ]+$', filename) is not None
+
+
+def storage_backend(data_dir, read_only=False):
+    """The backend selected by ``BBREPORTER_STORAGE`` (``sqlite``, or the JSON journal by default)."""
+    if os.environ.get('BBREPORTER_STORAGE') == 'sqlite':
+        from bbreporter import sqlite_store
+        if read_only and not os.path.exists(sqlite_store.db_path_for(data_dir)):
+            # Not migrated yet: the JSON files are what the database would be made from
+            return journal
+        sqlite_store.ensure_migrated(data_dir)
+        return sqlite_store
+    return journal
+
+
+def gather_data(league_info, collections, additional_details=''):
+    """The export dict: league info, every collection, then the additional details."""
+    data = {'league_info': league_info}
+    for collection in COLLECTION_FILES:
+        data[collection] = collections[collection]
+    data['additional_details'] = additional_details
+    return data
+
+
+def _locked(method):
+    # Run the method holding the league's lock, so sessions sharing one League change it one at a time
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return locked
+
+
+class _Restamp:
+    # Watcher giving its collection a new version stamp on every change
+    def __init__(self, versions, collection):
+        self.versions = versions
+        self.collection = collection
+
+    def appended(self, record):
+        self.versions[self.collection] = next(_stamps)
+
+    def replaced(self, idx, old_record, new_record):
+        self.versions[self.collection] = next(_stamps)
+
+    def removed(self, idx, old_record):
+        self.versions[self.collection] = next(_stamps)
+
+
+class League:
+    def __init__(self, data_dir, store=None, read_only=False):
+        # ``read_only`` loads without writing anything, for readers such as the command line that may run
+        # next to the app; such a League must not be changed
+        self.data_dir = data_dir
+        self.read_only = read_only
+        self.lock = threading.RLock()
+        self.store = store or storage_backend(data_dir, read_only)
+        self.league_info = {}
+        self.collections = {collection: self.load(filename) or [] for collection, filename in COLLECTION_FILES.items()}
+        # Older match reports only have the free-text score; store the parsed numbers once
+        if scores.migrate_matches(self.collections['matches']) and not read_only:
+            self._write(self.collections['matches'], COLLECTION_FILES['matches'])
+        # Player stats in memory include their match events; only the hand-entered part is stored
+        self.event_stats = events.stat_totals(self.collections['matches'])
+        for player in self.collections['player_profiles']:
+            counts = self._event_counts(player)
+            if counts:
+                player['stats'] = events.shift_stats(player.get('stats'), counts)
+        # Name indexes for joins; add/update/delete keep them in sync
+        self.indexes = {
+            'team_profiles': indexes.NameIndex(self.collections['team_profiles'], 'team_name'),
+            'player_profiles': indexes.NameIndex(self.collections['player_profiles'], 'player_name', group_field='team_name'),
+        }
+        # Collection -> objects told about each change (appended/replaced/removed)
+        self.watchers = {collection: [] for collection in COLLECTION_FILES}
+        for collection, index in self.indexes.items():
+            self.watch(collection, index)
+        # Collection -> version stamp, changed by every add/update/delete; memo keys for the prompt sections
+        self.versions = {collection: next(_stamps) for collection in COLLECTION_FILES}
+        for collection in COLLECTION_FILES:
+            self.watch(collection, _Restamp(self.versions, collection))
+        # Built on first use; see the properties below
+        self._stats = None
+        self._search = None
+        self._matchers = {}
+        self._frames = {}
+
+    def __getitem__(self, collection):
+        return self.collections[collection]
+
+    @property
+    @_locked
+    def stats(self):
+        """The columnar player stats, built on first use so scripts that never need them skip NumPy."""
+        if self._stats is None:
+            from bbreporter.stats_store import StatsStore
+            self._stats = StatsStore(self.collections['player_profiles'])
+            self.watch('player_profiles', self._stats)
+        return self._stats
+
+    @property
+    @_locked
+    def search(self):
+        """The full-text :class:`~bbreporter.search.SearchIndex`, built on first use."""
+        if self._search is None:
+            from bbreporter.search import SearchIndex
+            self._search = SearchIndex(self.collections)
+            for collection, watcher in self._search.watchers.items():
+                self.watch(collection, watcher)
+        return self._search
+
+    @_locked
+    def matcher(self, collection):
+        """The type-ahead :class:`~bbreporter.fuzzy.NameMatcher` over a collection's names, built on first use."""
+        if collection not in self._matchers:
+            from bbreporter.fuzzy import NameMatcher
+            self._matchers[collection] = NameMatcher(self.collections[collection], self.indexes[collection].field)
+            self.watch(collection, self._matchers[collection])
+        return self._matchers[collection]
+
+    @_locked
+    def frame(self, collection):
+        """The collection as a pandas DataFrame, built on first use and then patched row by row."""
+        if collection not in self._frames:
+            from bbreporter.frames import FrameCache
+            self._frames[collection] = FrameCache(self.collections[collection])
+            self.watch(collection, self._frames[collection])
+        return self._frames[collection].frame
+
+    def watch(self, collection, watcher):
+        """Keep ``watcher`` in sync with ``collection``.
+
+        Right after each change, still under :attr:`lock` and with the list
+        already updated, every watcher of the collection gets one of
+        ``appended(record)``, ``replaced(idx, old_record, new_record)`` or
+        ``removed(idx, old_record)``, ``idx`` being the position changed. A
+        match that changes player stats replaces each player it names with the
+        same, updated record, so ``old_record`` may be ``new_record``.
+        """
+        self.watchers[collection].append(watcher)
+
+    def path(self, filename):
+        if not is_valid_filename(filename):
+            raise ValueError("Invalid filename. Use only letters, numbers, underscores, hyphens, spaces, and periods.")
+        return os.path.join(self.data_dir, filename)
+
+    def load(self, filename):
+        return self.store.load(os.path.join(self.data_dir, filename), self.read_only)
+
+    @_locked
+    def save(self, data, filename):
+        """Write ``data`` (e.g. the league info) to ``filename``, which may not be where a collection is stored."""
+        self._write(data, self._target_name(filename))
+
+    def _write(self, data, filename):
+        file_path = self.path(filename)
+        self.store.write_snapshot(file_path, data)
+
+    def load_league_info(self, filename=LEAGUE_INFO_FILE):
+        self.league_info = self.load(filename) or {}
+        return self.league_info
+
+    @_locked
+    def export(self, collection, filename):
+        """Write a full copy of ``collection`` to ``filename``, e.g. from the apps' "Save As" fields."""
+        self._write(self._stored_records(collection), self._target_name(filename, collection))
+
+    def _target_name(self, filename, collection=None):
+        # Refuse names another part of the league is stored in: any collection's snapshot, journal or
+        # database (under either backend), except ``collection``'s own snapshot, and the league info when
+        # writing a collection
+        from bbreporter.sqlite_store import DB_FILENAME
+        reserved = {LEAGUE_INFO_FILE, DB_FILENAME} if collection else {DB_FILENAME}
+        for name in COLLECTION_FILES.values():
+            reserved.update(journal.backing_files(name))
+        if collection:
+            reserved.discard(COLLECTION_FILES[collection])
+        if filename in reserved:
+            raise ValueError(f"`{filename}` holds another part of the league. Choose a different file name.")
+        self.path(filename)
+        return filename
+
+    # --- Changes ---
+    # Changes are always journaled to the collection's own file, which is where it is loaded from.
+    # ``export_as`` additionally writes a full copy of the collection under another name.
+    # ``update`` and ``delete`` take a position; pass ``expected`` (the record the position was read
+    # from) when the list may have changed since, e.g. in another session sharing this League.
+    def position(self, collection, record):
+        """Current position of ``record`` (the object itself, not an equal copy), or None once it is gone."""
+        records = self.collections[collection]
+        if collection in self.indexes:
+            idx = self.indexes[collection].record_positions.get(id(record))
+            return idx if idx is not None and records[idx] is record else None
+        return next((idx for idx, other in enumerate(records) if other is record), None)
+
+    def _locate(self, collection, idx, expected):
+        if expected is None:
+            return idx
+        records = self.collections[collection]
+        if 0 <= idx < len(records) and records[idx] is expected:
+            return idx
+        idx = self.position(collection, expected)
+        if idx is None:
+            raise ValueError("This record was changed or deleted in another session. Reload it and try again.")
+        return idx
+
+    @_locked
+    def add(self, collection, record, export_as=None):
+        file_path = self.path(COLLECTION_FILES[collection])
+        if export_as is not None:
+            export_as = self._target_name(export_as, collection)
+        records = self.collections[collection]
+        self._settle_stats(collection, record)
+        records.append(record)
+        for watcher in self.watchers[collection]:
+            watcher.appended(record)
+        self.store.log_append(file_path, self._stored(collection, record), lambda: self._stored_records(collection))
+        if collection == 'matches':
+            self._update_player_stats(None, record)
+        if export_as not in (None, COLLECTION_FILES[collection]):
+            self.export(collection, export_as)
+
+    @_locked
+    def add_many(self, collection, new_records):
+        # Bulk version of add: one snapshot write for the whole batch
+        file_path = self.path(COLLECTION_FILES[collection])
+        records = self.collections[collection]
+        for record in new_records:
+            self._settle_stats(collection, record)
+            records.append(record)
+            for watcher in self.watchers[collection]:
+                watcher.appended(record)
+        self.store.write_snapshot(file_path, self._stored_records(collection))
+        if collection == 'matches':
+            for record in new_records:
+                self._update_player_stats(None, record)
+
+    @_locked
+    def update(self, collection, idx, record, expected=None):
+        file_path = self.path(COLLECTION_FILES[collection])
+        idx = self._locate(collection, idx, expected)
+        records = self.collections[collection]
+        old_record = records[idx]
+        self._settle_stats(collection, record)
+        records[idx] = record
+        for watcher in self.watchers[collection]:
+            watcher.replaced(idx, old_record, record)
+        self.store.log_update(file_path, idx, self._stored(collection, record), lambda: self._stored_records(collection))
+        if collection == 'matches':
+            self._update_player_stats(old_record, record)
+
+    @_locked
+    def delete(self, collection, idx, expected=None):
+        file_path = self.path(COLLECTION_FILES[collection])
+        idx = self._locate(collection, idx, expected)
+        records = self.collections[collection]
+        old_record = records.pop(idx)
+        for watcher in self.watchers[collection]:
+            watcher.removed(idx, old_record)
+        self.store.log_delete(file_path, idx, lambda: self._stored_records(collection))
+        if collection == 'matches':
+            self._update_player_stats(old_record, None)
+
+    def _update_player_stats(self, old_match, new_match):
+        # Only the players named by the two matches are visited. Their records are changed in place and
+        # nothing is journaled for them: the stored players never include event stats, so the match's
+        # own entry is the whole change, and a crash cannot leave the two files out of step.
+        players = self.indexes['player_profiles']
+        for key, counts in events.stat_changes(old_match, new_match).items():
+            totals = events.shift_stats(self.event_stats.get(key), counts)
+            self.event_stats[key] = {stat: count for stat, count in totals.items() if count}
+            team_name, player_name = key
+            for idx, player in players.group_entries(team_name):
+                if player.get('player_name') == player_name:
+                    player['stats'] = events.shift_stats(player.get('stats'), counts)
+                    for watcher in self.watchers['player_profiles']:
+                        watcher.replaced(idx, player, player)
+
+    # --- Stored form of the players ---
+    def _event_counts(self, player):
+        return self.event_stats.get((player.get('team_name', ''), player.get('player_name', '')), {})
+
+    def _settle_stats(self, collection, record):
+        # Stats typed into the player form are totals; a player never has fewer than their recorded events
+        counts = self._event_counts(record) if collection == 'player_profiles' else None
+        if counts:
+            stats = record.get('stats') or {}
+            record['stats'] = {**stats, **{stat: max(int(stats.get(stat) or 0), count) for stat, count in counts.items()}}
+
+    def _stored(self, collection, record):
+        # ``record`` as it is saved: players without the stats their match events add
+        counts = self._event_counts(record) if collection == 'player_profiles' else None
+        return {**record, 'stats': events.shift_stats(record.get('stats'), counts, -1)} if counts else record
+
+    def _stored_records(self, collection):
+        if collection != 'player_profiles':
+            return self.collections[collection]
+        return [self._stored(collection, record) for record in self.collections[collection]]
+
+    def data(self, additional_details=''):
+        """The ``blood_bowl_data.json`` export dict."""
+        return gather_data(self.league_info, self.collections, additional_details)
@@ -0,0 +1,38 @@
+"""A small thread-safe LRU cache for the memoized prompt sections, standings, charts and thumbnails.
+
+Lookups and inserts take the lock only briefly, so two sessions missing the
+same key may both compute the value; the later one simply replaces the first.
+"""
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    def __init__(self, size):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def discard(self, matches):
+        """Drop every entry whose key ``matches(key)`` accepts."""
+        with self._lock:
+            for key in [key for key in self._entries if matches(key)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,39 @@
+"""Filtering and pagination for the "Existing ..." lists.
+
+The lists keep each record's position in its collection alongside the record,
+because edit and delete buttons address records by that position.
+"""
+import math
+
+ALL = "All"
+
+
+def filter_options(records, *fields):
+    """Return ``ALL`` followed by the sorted distinct non-empty values of ``fields``."""
+    values = {record.get(field, '') for record in records for field in fields}
+    values.discard('')
+    return [ALL] + sorted(values)
+
+
+def filter_records(records, filters):
+    """Return ``(index, record)`` pairs matching every active filter.
+
+    ``filters`` maps a field name, or a tuple of field names any of which may
+    match, to the wanted value. Values of ``ALL`` or empty strings are ignored.
+    """
+    active = [((fields,) if isinstance(fields, str) else fields, value)
+              for fields, value in filters.items() if value and value != ALL]
+    if not active:
+        return list(enumerate(records))
+    return [
+        (idx, record) for idx, record in enumerate(records)
+        if all(any(record.get(field) == value for field in fields) for fields, value in active)
+    ]
+
+
+def paginate(entries, page, page_size):
+    """Return ``(page_entries, page, page_count)`` with ``page`` clamped to the valid range."""
+    page_count = max(1, math.ceil(len(entries) / page_size))
+    page = min(max(1, page), page_count)
+    start = (page - 1) * page_size
+    return entries[start:start + page_size], page, page_count
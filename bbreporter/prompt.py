@@ -0,0 +1,227 @@
+"""GPT prompt assembly with per-section memoization.
+
+Each section of the prompt (league info, teams, players, matches, injuries,
+narratives) is rendered from its collection alone, so the rendered text is
+cached per collection. Callers holding a :class:`~bbreporter.league.League`
+pass its version stamps (``league.versions``), which change with every edit;
+other data is keyed on a content hash, which for a big collection costs more
+than rendering it. Regenerating a prompt after editing one match re-renders
+the match section and reuses the rest.
+"""
+import hashlib
+import json
+
+from bbreporter.memo import LRUCache
+
+# Rendered sections kept across prompts; a few per section covers several sessions/leagues
+SECTION_CACHE_SIZE = 64
+
+
+# --- Section Formatters ---
+def format_league_info(league_info):
+    if league_info:
+        return f"**League Name:** {league_info.get('league_name')}\n\n**League Description:**\n{league_info.get('league_description')}"
+    else:
+        return "No league information provided."
+
+
+def format_team_profiles(teams):
+    if not teams:
+        return "No team profiles available."
+    return "".join(
+        f"**Team {idx + 1}:** {team['team_name']} ({team['team_race']})\n"
+        f"- Coach: {team['coach_name']}\n"
+        f"- History: {team['team_history']}\n"
+        f"- Achievements: {team['achievements']}\n\n"
+        for idx, team in enumerate(teams)
+    )
+
+
+def format_player_profiles(players):
+    if not players:
+        return "No player profiles available."
+    return "".join(
+        f"**Player {idx + 1}:** {player['player_name']} ({player['position']}) for {player['team_name']}\n"
+        f"- Bio: {player['bio']}\n"
+        f"- Career Highlights: {player['career_highlights']}\n"
+        f"- Statistics:\n"
+        f"  - Matches Played: {player['stats']['matches_played']}\n"
+        f"  - Touchdowns: {player['stats']['touchdowns']}\n"
+        f"  - Interceptions: {player['stats']['interceptions']}\n"
+        f"  - Injuries Caused: {player['stats']['injuries_caused']}\n"
+        f"  - MVP Awards: {player['stats']['mvp_awards']}\n\n"
+        for idx, player in enumerate(players)
+    )
+
+
+def format_matches(matches):
+    if not matches:
+        return "No match reports available."
+    return "".join(
+        f"**Match {idx + 1}:** {match['team_a_name']} vs {match['team_b_name']} on {match['match_date']}\n"
+        f"- Final Score: {match['final_score']}\n"
+        f"- Key Events: {match['key_events']}\n\n"
+        for idx, match in enumerate(matches)
+    )
+
+
+def format_injuries(injuries):
+    if not injuries:
+        return "No injury reports available."
+    return "".join(
+        f"**Injury {idx + 1}:** {injury['player_name']} from {injury['team_name']}\n"
+        f"- Injury Type: {injury['injury_type']}\n"
+        f"- Description: {injury['injury_description']}\n"
+        f"- Time Out: {injury['time_out']}, Expected Return: {injury['expected_return']}\n\n"
+        for idx, injury in enumerate(injuries)
+    )
+
+
+def format_narratives(narratives):
+    if not narratives:
+        return "No narratives provided."
+    return "".join(
+        f"**Storyline {idx + 1}:** {narrative['storyline_title']}\n"
+        f"- Description: {narrative['description']}\n"
+        f"- Teams/Players Involved: {narrative['teams_or_players_involved']}\n"
+        f"- Recent Developments: {narrative['recent_developments']}\n\n"
+        for idx, narrative in enumerate(narratives)
+    )
+
+
+def format_standings(matches):
+    # Imported here so building a prompt without standings never loads pandas
+    from bbreporter.standings import format_standings as format_standings_table
+    return format_standings_table(matches)
+
+
+# Sections filled straight from the collection of the same name
+DATA_SECTIONS = ('league_info', 'team_profiles', 'player_profiles', 'matches', 'injuries', 'narratives')
+
+SECTION_FORMATTERS = {
+    'league_info': format_league_info,
+    'team_profiles': format_team_profiles,
+    'player_profiles': format_player_profiles,
+    'matches': format_matches,
+    'injuries': format_injuries,
+    'narratives': format_narratives,
+    'standings': format_standings,
+}
+
+
+# --- Section Cache ---
+_sections = LRUCache(SECTION_CACHE_SIZE)
+
+
+def content_hash(data):
+    encoded = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def render_section(name, data, version=None):
+    """Return the rendered ``name`` section, reusing the cached text while ``data`` is unchanged.
+
+    ``version`` is the League's stamp for ``data`` (e.g. ``league.versions['matches']``); without one the
+    data is hashed.
+    """
+    key = (name, content_hash(data) if version is None else version)
+    text = _sections.get(key)
+    if text is None:
+        text = SECTION_FORMATTERS[name](data)
+        _sections.put(key, text)
+    return text
+
+
+# --- Prompt ---
+def build_prompt(data, reporter_name, reporter_description, tone_style, format_length, standings=None, versions=None):
+    """Build the full report prompt from a ``gather_all_data()``-shaped dict.
+
+    ``standings`` is the text of ``render_section('standings', matches)``; when
+    given it is added after the match reports. ``versions`` are the League's
+    version stamps of the collections in ``data``, if it came straight from one.
+    """
+    versions = versions or {}
+    sections = {name: render_section(name, data.get(name) or ({} if name == 'league_info' else []), versions.get(name))
+                for name in DATA_SECTIONS}
+    if standings:
+        sections['matches'] += "\n\n**League Standings:**\n\n" + standings
+    league_name = (data.get('league_info') or {}).get('league_name', 'Unknown League')
+    return "".join([
+        f"""
+You are a seasoned sports journalist in the fantastical and brutal world of Blood Bowl. Your task is to write a report for the **{league_name}**. The report should be engaging and entertaining for both players in the league and fans of Blood Bowl in general. Assume the audience does not need an understanding of Blood Bowl mechanics to enjoy the content.
+
+**Please use the following information to craft your report:**
+
+1. **League Information:**
+
+""", sections['league_info'], """
+
+2. **Team Profiles:**
+
+""", sections['team_profiles'], """
+
+3. **Player Profiles:**
+
+""", sections['player_profiles'], """
+
+4. **Match Reports:**
+
+""", sections['matches'], """
+
+5. **Injury Reports:**
+
+""", sections['injuries'], """
+
+6. **Narratives and Lore:**
+
+""", sections['narratives'], """
+
+7. **Additional Narrative and Lore:**
+
+""", data.get('additional_details', ''), f"""
+
+8. **Reporter Character:**
+- **Character Name:** {reporter_name}
+- **Character Description:** {reporter_description}
+
+9. **Tone and Style:** {tone_style}
+
+10. **Format and Length:** {format_length}
+
+---
+
+**Now, please write the report accordingly.**
+""",
+    ])
+
+
+def build_data_file_prompt(league_info, reporter_name, reporter_description, tone_style, format_length, standings=None):
+    """Build the short prompt that points the model at the ``blood_bowl_data.json`` export.
+
+    ``standings`` is the text of ``render_section('standings', matches)``; when
+    given it is added before the closing line.
+    """
+    standings_block = f"**League Standings:**\n\n{standings}\n" if standings else ""
+    return f"""
+You are a seasoned sports journalist in the fantastical and brutal world of Blood Bowl. Your task is to write a report for the **{(league_info or {}).get('league_name', 'Unknown League')}**. The report should be engaging and entertaining for both players in the league and fans of Blood Bowl in general. Assume the audience does not need an understanding of Blood Bowl mechanics to enjoy the content.
+
+**Instructions:**
+
+- You are provided with a data file named `blood_bowl_data.json` containing all the relevant information about the league, teams, players, matches, injuries, narratives, and additional details.
+- Use the data in this file to craft a comprehensive and engaging report.
+- Focus on storytelling, highlighting key events, player performances, and interesting narratives.
+- Incorporate the tone and style specified.
+
+**Reporter Character:**
+
+- **Character Name:** {reporter_name}
+- **Character Description:** {reporter_description}
+
+**Tone and Style:** {tone_style}
+
+**Format and Length:** {format_length}
+
+{standings_block}---
+
+**Now, please write the report accordingly.**
+""".strip()
@@ -0,0 +1,258 @@
+"""Blood Bowl races, the player positions available to each, and the player stats."""
+from bbreporter import indexes
+
+BLOOD_BOWL_RACES = [
+    # Fill in with actual Blood Bowl races
+    "Amazon",
+    "Black Orc",
+    "Chaos Chosen",
+    "Chaos Dwarf",
+    "Chaos Renegade",
+    "Dark Elf",
+    "Dwarf",
+    "Elven Union",
+    "Gnome",
+    "Goblin",
+    "Halfling",
+    "High Elf",
+    "Human",
+    "Imperial Nobility",
+    "Khorne",
+    "Lizardmen",
+    "Necromantic Horror",
+    "Norse",
+    "Nurgle",
+    "Ogre",
+    "Old World Alliance",
+    "Orc",
+    "Shambling Undead",
+    "Skaven",
+    "Snotling",
+    "Tomb Kings",
+    "Underworld Denizens",
+    "Vampire",
+    "Wood Elf"
+    # Add other races as needed
+]
+
+RACE_POSITIONS = {
+    # Fill in with actual positions for each race
+    "Amazon": [
+        "Eagle Warrior Linewoman",
+        "Python Warrior Thrower",
+        "Piranha Warrior Blitzer",
+        "Jaguar Warrior Blocker"
+    ],
+    "Black Orc": [
+        "Goblin Bruiser Lineman",
+        "Black Orc",
+        "Trained Troll"
+    ],
+    "Chaos Chosen": [
+        "Beastman Runner Lineman",
+        "Chosen Blocker",
+        "Chaos Troll",
+        "Chaos Ogre",
+        "Minotaur"
+    ],
+    "Chaos Dwarf": [
+        "Hobgoblin Lineman",
+        "Chaos Dwarf Blocker",
+        "Bull Centaur Blitzer",
+        "Enslaved Minotaur"
+    ],
+    "Chaos Renegade": [
+        "Renegade Human Lineman",
+        "Renegade Human Thrower",
+        "Renegade Goblin",
+        "Renegade Orc",
+        "Renegade Skaven",
+        "Renegade Dark Elf",
+        "Renegade Troll",
+        "Renegade Ogre",
+        "Renegade Minotaur",
+        "Renegade Rat Ogre"
+    ],
+    "Dark Elf": [
+        "Dark Elf Lineman",
+        "Runner",
+        "Blitzer",
+        "Assassin",
+        "Witch Elf"
+    ],
+    "Dwarf": [
+        "Dwarf Blocker Lineman",
+        "Dwarf Runner",
+        "Dwarf Blitzer",
+        "Troll Slayer",
+        "Deathroller"
+    ],
+    "Elven Union": [
+        "Lineman",
+        "Thrower",
+        "Catcher",
+        "Blitzer"
+    ],
+    "Gnome": [
+        "Gnome Lineman",
+        "Gnome Beastmaster",
+        "Gnome Illusionist",
+        "Woodland Fox",
+        "Altern Forest Treeman"
+    ],
+    "Goblin": [
+        "Goblin Lineman",
+        "Bomma",
+        "Looney",
+        "Fanatic",
+        "Pogoer",
+        "'Ooligan",
+        "Doom Diver"
+    ],
+    "Halfling": [
+        "Halfling Hopeful Lineman",
+        "Halfling Hefty",
+        "Halfling Catcher",
+        "Altern Forest Treeman"
+    ],
+    "High Elf": [
+        "Lineman",
+        "Thrower",
+        "Catcher",
+        "Blitzer"
+    ],
+    "Human": [
+        "Human Lineman",
+        "Thrower",
+        "Catcher",
+        "Blitzer",
+        "Halfling Hopeful",
+        "Ogre"
+    ],
+    "Imperial Nobility": [
+        "Imperial Retainer Lineman",
+        "Imperial Thrower",
+        "Noble Blitzer",
+        "Bodyguard",
+        "Ogre"
+    ],
+    "Khorne": [
+        "Bloodborn Marauder Lineman",
+        "Khorngor",
+        "Bloodseeker",
+        "Bloodspawn"
+    ],
+    "Lizardmen": [
+        "Skink Runner Lineman",
+        "Chameleon Skink",
+        "Saurus Blocker",
+        "Kroxigor"
+    ],
+    "Necromantic Horror": [
+        "Zombie Lineman",
+        "Ghoul Runner",
+        "Wraith",
+        "Werewolf",
+        "Flesh Golem"
+    ],
+    "Norse": [
+        "Norse Raider Lineman",
+        "Beer Boar",
+        "Norse Berserker",
+        "Valkyrie",
+        "Ulfwerener"
+        "Yhetee"
+    ],
+    "Nurgle": [
+        "Rotter Lineman",
+        "Pestigor",
+        "Bloater",
+        "Rotspawn"
+    ],
+    "Ogre": [
+        "Gnoblar Lineman",
+        "Ogre Runt Punter",
+        "Ogre Blocker"
+    ],
+    "Old World Alliance": [
+        "Human Lineman",
+        "Human Thrower",
+        "Human Catcher",
+        "Human Blitzer",
+        "Dwarf Blocker",
+        "Dwarf Runner",
+        "Dwarf Blitzer",
+        "Dwarf Troll Slayer",
+        "Halfling Hopeful",
+        "Ogre"
+        "Altern Forest Treeman"
+    ],
+    "Orc": [
+        "Orc Lineman",
+        "Thrower",
+        "Blitzer",
+        "Big 'Un Blocker",
+        "Goblin",
+        "Untrained Troll"
+    ],
+    "Shambling Undead": [
+        "Skeleton Lineman",
+        "Zombie Lineman",
+        "Ghoul Runner",
+        "Wight Blitzer",
+        "Mummy",
+    ],
+    "Skaven": [
+        "Skaven Clanrat Lineman",
+        "Thrower",
+        "Gutter Runner",
+        "Blitzer",
+        "Rat Ogre"
+    ],
+    "Snotling": [
+        "Snotling Lineman",
+        "Fungus Flinga",
+        "Fun-Hoppa",
+        "Stilty Runna",
+        "Pump Wagon",
+        "Trained Troll"
+    ],
+    "Tomb Kings": [
+        "Skeleton Lineman",
+        "Anointed Thrower",
+        "Anointed Blitzer",
+        "Tomb Guardian"
+    ],
+    "Underworld Denizens": [
+        "Underworld Goblin Lineman",
+        "Underworld Snottling",
+        "Skaven Clanrat",
+        "Skaven Thrower",
+        "Gutter Runner",
+        "Skaven Blitzer",
+        "Underworld Troll",
+        "Mutant Rat Ogre"
+    ],
+    "Vampire": [
+        "Thrall Lineman",
+        "Vampire Runner",
+        "Vampire Thrower",
+        "Vampire Blitzer",
+        "Vargheist"
+    ],
+    "Wood Elf": [
+        "Wood Elf Lineman",
+        "Thrower",
+        "Catcher",
+        "Wardancer",
+        "Loren Forest Treeman"
+    ]
+    # Add positions for other races
+}
+
+# Selectbox positions of each race and of each race's positions
+RACE_INDEX = indexes.position_index(BLOOD_BOWL_RACES)
+POSITION_INDEX = {race: indexes.position_index(positions) for race, positions in RACE_POSITIONS.items()}
+
+# Keys of a player's `stats` dict, in the order the forms show them
+STAT_FIELDS = ('matches_played', 'touchdowns', 'interceptions', 'injuries_caused', 'mvp_awards')
@@ -0,0 +1,62 @@
+"""Parse free-text match scores into numeric touchdown columns.
+
+Scores are entered as text such as ``"2-1 to Team A"``. Each match also
+stores the parsed ``team_a_td``, ``team_b_td`` and ``winner`` (a team name,
+``"Draw"``, or ``""`` when the text holds no score), so standings and charts
+can work on numbers instead of strings.
+"""
+import re
+
+DRAW = "Draw"
+
+_SCORE_RE = re.compile(r"(\d+)\s*[-–:]\s*(\d+)")
+
+
+def parse_final_score(final_score, team_a_name, team_b_name):
+    """Return ``(team_a_td, team_b_td, winner)``; the touchdowns are None if no score is found.
+
+    The first number belongs to Team A unless the text credits the result to
+    Team B ("2-1 to Orcland Raiders"), in which case Team B gets the higher score.
+    """
+    found = _SCORE_RE.search(final_score or '')
+    if not found:
+        return None, None, ''
+    first, second = int(found.group(1)), int(found.group(2))
+    credited = (final_score[found.end():] + ' ' + final_score[:found.start()]).lower()
+    mentions_a = bool(team_a_name) and team_a_name.lower() in credited or 'team a' in credited
+    mentions_b = bool(team_b_name) and team_b_name.lower() in credited or 'team b' in credited
+    if mentions_a and mentions_b and team_a_name and team_b_name:
+        # One name containing the other ("Orcs" and "Black Orcs"): the longer one is the real mention
+        if team_a_name.lower() in team_b_name.lower():
+            mentions_a = False
+        elif team_b_name.lower() in team_a_name.lower():
+            mentions_b = False
+    if mentions_b and not mentions_a:
+        team_a_td, team_b_td = min(first, second), max(first, second)
+    elif mentions_a and not mentions_b:
+        team_a_td, team_b_td = max(first, second), min(first, second)
+    else:
+        team_a_td, team_b_td = first, second
+    if team_a_td > team_b_td:
+        winner = team_a_name
+    elif team_b_td > team_a_td:
+        winner = team_b_name
+    else:
+        winner = DRAW
+    return team_a_td, team_b_td, winner
+
+
+def score_fields(match):
+    """The parsed score fields for ``match``, ready to merge into the record."""
+    team_a_td, team_b_td, winner = parse_final_score(match.get('final_score', ''), match.get('team_a_name', ''), match.get('team_b_name', ''))
+    return {'team_a_td': team_a_td, 'team_b_td': team_b_td, 'winner': winner}
+
+
+def migrate_matches(matches):
+    """Add parsed score fields to matches saved before they existed; returns how many changed."""
+    changed = 0
+    for match in matches:
+        if 'team_a_td' not in match:
+            match.update(score_fields(match))
+            changed += 1
+    return changed
@@ -0,0 +1,130 @@
+"""In-memory full-text search over the league's records.
+
+:class:`SearchIndex` is an inverted index: every word of the fields in
+:data:`SEARCH_FIELDS` maps to the records containing it, weighted by field
+(names count more than biographies). One League watcher per collection
+updates only the words of the changed record; records are identified by
+``id(record)``, so deleting one does not renumber the others.
+
+Queries match whole words, except the last one, which also matches as a
+prefix so results appear while typing. Hits must contain every query word
+and are ranked by TF-IDF.
+"""
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+
+# Collection -> {field: weight}
+SEARCH_FIELDS = {
+    'player_profiles': {'player_name': 3, 'team_name': 2, 'position': 2, 'bio': 1, 'career_highlights': 1},
+    'team_profiles': {'team_name': 3, 'team_race': 2, 'coach_name': 2, 'team_history': 1, 'achievements': 1},
+    'matches': {'team_a_name': 2, 'team_b_name': 2, 'key_events': 1},
+    'narratives': {'storyline_title': 3, 'teams_or_players_involved': 2, 'description': 1, 'recent_developments': 1},
+}
+
+# Words a prefix may expand to, so a one-letter query stays cheap
+MAX_PREFIX_TERMS = 50
+# Score factor of a term the last query word is only a prefix of
+PREFIX_FACTOR = 0.5
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return _WORD_RE.findall(str(text or '').lower())
+
+
+class _CollectionWatcher:
+    # Relays one collection's change notifications to the shared index
+    def __init__(self, index, collection):
+        self.index = index
+        self.collection = collection
+
+    def appended(self, record):
+        self.index.add(self.collection, record)
+
+    def replaced(self, idx, old_record, new_record):
+        self.index.remove(old_record)
+        self.index.add(self.collection, new_record)
+
+    def removed(self, idx, old_record):
+        self.index.remove(old_record)
+
+
+class SearchIndex:
+    def __init__(self, collections):
+        # term -> {record id: weight}; record id -> (collection, record, {term: weight})
+        self.postings = {}
+        self.documents = {}
+        # Sorted distinct terms, for prefix lookups
+        self.terms = []
+        self.watchers = {}
+        for collection in SEARCH_FIELDS:
+            self.watchers[collection] = _CollectionWatcher(self, collection)
+            for record in collections.get(collection, []):
+                self.add(collection, record)
+
+    def add(self, collection, record):
+        weights = {}
+        for field, weight in SEARCH_FIELDS[collection].items():
+            for term in tokenize(record.get(field)):
+                weights[term] = weights.get(term, 0) + weight
+        self.documents[id(record)] = (collection, record, weights)
+        for term, weight in weights.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                insort(self.terms, term)
+            postings[id(record)] = weight
+
+    def remove(self, record):
+        entry = self.documents.pop(id(record), None)
+        if entry is None:
+            return
+        for term in entry[2]:
+            postings = self.postings[term]
+            del postings[id(record)]
+            if not postings:
+                del self.postings[term]
+                del self.terms[bisect_left(self.terms, term)]
+
+    def _expand(self, prefix):
+        start = bisect_left(self.terms, prefix)
+        expanded = []
+        for term in self.terms[start:start + MAX_PREFIX_TERMS]:
+            if not term.startswith(prefix):
+                break
+            expanded.append(term)
+        return expanded
+
+    def search(self, query, limit=20, collections=None):
+        """``(score, collection, record)`` for the best ``limit`` hits, best first."""
+        words = tokenize(query)
+        if not words:
+            return []
+        # Each query word is a group of (term, factor); a record must match every group
+        groups = [[(word, 1)] if word in self.postings else [] for word in words[:-1]]
+        # Words the last one only starts count for less than the word itself
+        groups.append([(term, 1 if term == words[-1] else PREFIX_FACTOR) for term in self._expand(words[-1])])
+        if not all(groups):
+            return []
+        total = len(self.documents)
+        scores = None
+        # Start from the rarest group so the candidate set shrinks as fast as possible
+        for terms in sorted(groups, key=lambda terms: sum(len(self.postings[term]) for term, _ in terms)):
+            group_scores = {}
+            for term, factor in terms:
+                idf = factor * math.log(1 + total / len(self.postings[term]))
+                for key, weight in self.postings[term].items():
+                    if scores is None or key in scores:
+                        group_scores[key] = group_scores.get(key, 0) + weight * idf
+            if scores is not None:
+                group_scores = {key: scores[key] + score for key, score in group_scores.items()}
+            scores = group_scores
+            if not scores:
+                return []
+        if collections:
+            scores = {key: score for key, score in scores.items() if self.documents[key][0] in collections}
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(score, self.documents[key][0], self.documents[key][1]) for key, score in best]
@@ -0,0 +1,87 @@
+"""Sprite atlas for player sprites.
+
+``data/sprites/<Race>/<Position>.png`` files are scanned once and packed into a
+single in-memory sheet with an index keyed by ``(race, position)``. Sprites are
+then served as PNG slices of that sheet, and unknown race/position pairs get
+a placeholder, so rendering a roster never touches the filesystem.
+"""
+import io
+import os
+import threading
+
+from PIL import Image, ImageDraw
+
+# Width of the packed sheet; sprites are laid out left to right in rows ("shelves")
+SHEET_WIDTH = 1024
+
+PLACEHOLDER_SIZE = 28
+
+
+def _png_bytes(image):
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def _placeholder():
+    image = Image.new('RGBA', (PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    draw.ellipse((4, 2, 23, 13), fill=(150, 150, 150, 255))
+    draw.rectangle((6, 14, 21, 26), fill=(150, 150, 150, 255))
+    return _png_bytes(image)
+
+
+class SpriteAtlas:
+    def __init__(self, sheet, index):
+        self.sheet = sheet
+        self.index = index
+        self.placeholder = _placeholder()
+        self._slices = {}
+        self._lock = threading.Lock()
+
+    def sprite_bytes(self, race, position):
+        """PNG bytes of the sprite for ``(race, position)``, or None if there is none."""
+        box = self.index.get((race, position))
+        if box is None:
+            return None
+        with self._lock:
+            data = self._slices.get(box)
+            if data is None:
+                data = _png_bytes(self.sheet.crop(box))
+                self._slices[box] = data
+        return data
+
+
+def build_atlas(sprites_dir):
+    """Scan ``sprites_dir`` once and pack every sprite into one sheet."""
+    sprites = []
+    if os.path.isdir(sprites_dir):
+        for race in sorted(os.listdir(sprites_dir)):
+            race_dir = os.path.join(sprites_dir, race)
+            if not os.path.isdir(race_dir):
+                continue
+            for filename in sorted(os.listdir(race_dir)):
+                position, extension = os.path.splitext(filename)
+                if extension.lower() != '.png':
+                    continue
+                try:
+                    with Image.open(os.path.join(race_dir, filename)) as image:
+                        sprites.append(((race, position), image.convert('RGBA')))
+                except OSError:
+                    continue
+
+    # Shelf packing: tallest sprites first so rows waste little height
+    sprites.sort(key=lambda item: item[1].height, reverse=True)
+    index = {}
+    x = y = shelf_height = 0
+    for key, image in sprites:
+        if x and x + image.width > SHEET_WIDTH:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        index[key] = (x, y, x + image.width, y + image.height)
+        x += image.width
+        shelf_height = max(shelf_height, image.height)
+    sheet_width = max((box[2] for box in index.values()), default=1)
+    sheet = Image.new('RGBA', (sheet_width, max(y + shelf_height, 1)), (0, 0, 0, 0))
+    for key, image in sprites:
+        sheet.paste(image, index[key][:2])
+    return SpriteAtlas(sheet, index)
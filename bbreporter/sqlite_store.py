@@ -0,0 +1,160 @@
+"""Optional SQLite backend for the league collections.
+
+Mirrors the interface of :mod:`bbreporter.journal` (``load``,
+``write_snapshot``, ``log_append``, ``log_update``, ``log_delete``,
+``backing_files``) so the app can switch backends with the
+``BBREPORTER_STORAGE=sqlite`` environment variable. Every collection gets its
+own table in ``data/league.sqlite3``, one JSON record per row in collection
+order; lookups and filters run on the League's in-memory indexes, so the
+tables carry no indexes of their own to keep up. Files that are not one of
+the known collections (league info, custom "Save As" names) are passed
+through to the journal backend.
+
+Run ``python -m bbreporter.sqlite_store [data_dir]`` to import existing JSON
+files into the database.
+"""
+import json
+import os
+import sqlite3
+import sys
+from contextlib import closing
+
+from bbreporter import journal
+
+DB_FILENAME = 'league.sqlite3'
+
+COLLECTION_TABLES = ('team_profiles', 'player_profiles', 'matches', 'injuries', 'narratives')
+
+
+def db_path_for(data_dir):
+    return os.path.join(data_dir, DB_FILENAME)
+
+
+def _table_for(snapshot_path):
+    name = os.path.splitext(os.path.basename(snapshot_path))[0]
+    return name if name in COLLECTION_TABLES else None
+
+
+# Databases whose schema has already been created by this process
+_initialized = set()
+
+# (db_path, table) -> row ids in collection order, so a position maps to its row without a scan
+_row_ids = {}
+
+
+def backing_files(snapshot_path):
+    """Files whose contents make up the collection stored at ``snapshot_path``."""
+    if _table_for(snapshot_path) is None:
+        return journal.backing_files(snapshot_path)
+    return [db_path_for(os.path.dirname(snapshot_path))]
+
+
+def _connect(db_path):
+    conn = sqlite3.connect(db_path)
+    if db_path in _initialized:
+        return conn
+    for table in COLLECTION_TABLES:
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY, data TEXT NOT NULL)")
+    # Databases from older versions also indexed some fields; nothing reads those indexes any more
+    old_indexes = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'").fetchall()
+    for (name,) in old_indexes:
+        conn.execute(f"DROP INDEX {name}")
+    conn.commit()
+    _initialized.add(db_path)
+    return conn
+
+
+def _ids(conn, db_path, table):
+    key = (db_path, table)
+    if key not in _row_ids:
+        # First write to this table in this process without a load; read the ids once
+        _row_ids[key] = [row_id for (row_id,) in conn.execute(f"SELECT id FROM {table} ORDER BY id")]
+    return _row_ids[key]
+
+
+def load(snapshot_path, read_only=False):
+    table = _table_for(snapshot_path)
+    if table is None:
+        return journal.load(snapshot_path, read_only)
+    db_path = db_path_for(os.path.dirname(snapshot_path))
+    # A read-only load opens the database read-only and leaves its schema alone
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True) if read_only else _connect(db_path)
+    with closing(conn):
+        rows = conn.execute(f"SELECT id, data FROM {table} ORDER BY id").fetchall()
+    _row_ids[(db_path, table)] = [row_id for row_id, _ in rows]
+    return [json.loads(data) for _, data in rows]
+
+
+def write_snapshot(snapshot_path, data):
+    table = _table_for(snapshot_path)
+    if table is None:
+        journal.write_snapshot(snapshot_path, data)
+        return
+    db_path = db_path_for(os.path.dirname(snapshot_path))
+    with closing(_connect(db_path)) as conn, conn:
+        conn.execute(f"DELETE FROM {table}")
+        conn.executemany(f"INSERT INTO {table} (data) VALUES (?)", [(json.dumps(record),) for record in data])
+        _row_ids[(db_path, table)] = [row_id for (row_id,) in conn.execute(f"SELECT id FROM {table} ORDER BY id")]
+
+
+def log_append(snapshot_path, record, data):
+    table = _table_for(snapshot_path)
+    if table is None:
+        journal.log_append(snapshot_path, record, data)
+        return
+    db_path = db_path_for(os.path.dirname(snapshot_path))
+    with closing(_connect(db_path)) as conn, conn:
+        ids = _ids(conn, db_path, table)
+        ids.append(conn.execute(f"INSERT INTO {table} (data) VALUES (?)", (json.dumps(record),)).lastrowid)
+
+
+def log_update(snapshot_path, index, record, data):
+    table = _table_for(snapshot_path)
+    if table is None:
+        journal.log_update(snapshot_path, index, record, data)
+        return
+    db_path = db_path_for(os.path.dirname(snapshot_path))
+    with closing(_connect(db_path)) as conn, conn:
+        ids = _ids(conn, db_path, table)
+        if 0 <= index < len(ids):
+            conn.execute(f"UPDATE {table} SET data = ? WHERE id = ?", (json.dumps(record), ids[index]))
+
+
+def log_delete(snapshot_path, index, data):
+    table = _table_for(snapshot_path)
+    if table is None:
+        journal.log_delete(snapshot_path, index, data)
+        return
+    db_path = db_path_for(os.path.dirname(snapshot_path))
+    with closing(_connect(db_path)) as conn, conn:
+        ids = _ids(conn, db_path, table)
+        if 0 <= index < len(ids):
+            conn.execute(f"DELETE FROM {table} WHERE id = ?", (ids[index],))
+            del ids[index]
+
+
+# --- Migration from JSON files ---
+def migrate_from_json(data_dir):
+    """Import every collection's JSON snapshot and journal into the database.
+
+    Existing rows for a collection are replaced. Returns the number of records
+    imported per collection.
+    """
+    counts = {}
+    for table in COLLECTION_TABLES:
+        records = journal.load(os.path.join(data_dir, f"{table}.json")) or []
+        write_snapshot(os.path.join(data_dir, f"{table}.json"), records)
+        counts[table] = len(records)
+    return counts
+
+
+def ensure_migrated(data_dir):
+    """Create the database from the JSON files the first time the backend is used."""
+    if not os.path.exists(db_path_for(data_dir)):
+        migrate_from_json(data_dir)
+
+
+if __name__ == '__main__':
+    target_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.getcwd(), 'data')
+    for table, count in migrate_from_json(target_dir).items():
+        print(f"{table}: {count} records")
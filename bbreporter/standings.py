@@ -0,0 +1,75 @@
+"""League standings computed from the parsed match scores.
+
+Every match is unpivoted into one row per team (touchdowns for and against),
+and wins, draws, losses and points come from grouped column arithmetic rather
+than a Python loop over matches. Tables are cached on the League's version
+stamp of the matches, or on a hash of them for callers without a League.
+"""
+import numpy as np
+import pandas as pd
+
+from bbreporter.memo import LRUCache
+from bbreporter.prompt import content_hash
+
+POINTS_FOR_WIN = 3
+POINTS_FOR_DRAW = 1
+POINTS_FOR_LOSS = 0
+
+STANDINGS_COLUMNS = ['Team', 'Played', 'W', 'D', 'L', 'TD For', 'TD Against', 'TD Diff', 'Points']
+
+STANDINGS_CACHE_SIZE = 16
+
+_tables = LRUCache(STANDINGS_CACHE_SIZE)
+
+
+def _compute(matches, team_names):
+    frame = pd.DataFrame(matches, columns=['team_a_name', 'team_b_name', 'team_a_td', 'team_b_td'])
+    frame = frame.dropna(subset=['team_a_td', 'team_b_td'])
+    team_a_td = frame['team_a_td'].to_numpy(dtype=np.int64)
+    team_b_td = frame['team_b_td'].to_numpy(dtype=np.int64)
+    sides = pd.DataFrame({
+        'Team': np.concatenate([frame['team_a_name'].to_numpy(dtype=object), frame['team_b_name'].to_numpy(dtype=object)]),
+        'TD For': np.concatenate([team_a_td, team_b_td]),
+        'TD Against': np.concatenate([team_b_td, team_a_td]),
+    })
+    sides['W'] = (sides['TD For'] > sides['TD Against']).astype(np.int64)
+    sides['D'] = (sides['TD For'] == sides['TD Against']).astype(np.int64)
+    sides['L'] = (sides['TD For'] < sides['TD Against']).astype(np.int64)
+    sides['Played'] = 1
+    table = sides.groupby('Team').sum()
+    if team_names:
+        # Teams that have not played yet still get a row
+        table = table.reindex(table.index.union(pd.Index(team_names, name='Team')), fill_value=0)
+    table['TD Diff'] = table['TD For'] - table['TD Against']
+    table['Points'] = table['W'] * POINTS_FOR_WIN + table['D'] * POINTS_FOR_DRAW + table['L'] * POINTS_FOR_LOSS
+    table = table.reset_index()
+    table = table.sort_values(['Points', 'TD Diff', 'TD For', 'Team'], ascending=[False, False, False, True], kind='stable')
+    return table[STANDINGS_COLUMNS].reset_index(drop=True)
+
+
+def compute_standings(matches, team_names=(), version=None):
+    """Return the standings DataFrame for ``matches``, best team first.
+
+    Matches without a parsed score are ignored. ``team_names`` adds rows for
+    teams that have no scored matches yet. ``version`` is the League's stamp
+    for ``matches`` (``league.versions['matches']``); without one they are hashed.
+    """
+    key = (content_hash(matches) if version is None else version, tuple(team_names))
+    table = _tables.get(key)
+    if table is None:
+        table = _compute(matches, list(team_names))
+        _tables.put(key, table)
+    return table.copy()
+
+
+def format_standings(matches):
+    """Standings as prompt text, one line per team."""
+    # render_section() already caches the text, so the table is not looked up by hash here
+    table = _compute(matches, [])
+    if table.empty:
+        return "No scored matches yet."
+    return "".join(
+        f"{rank}. {team}: {points} pts ({wins}W-{draws}D-{losses}L, TD {td_for}-{td_against}, diff {td_diff:+d})\n"
+        for rank, (team, played, wins, draws, losses, td_for, td_against, td_diff, points)
+        in enumerate(table.itertuples(index=False, name=None), start=1)
+    )
@@ -0,0 +1,103 @@
+"""Columnar copy of the player stats, for sorting and totals over big rosters.
+
+:class:`StatsStore` holds one NumPy int row per player, in collection order,
+with the columns of :data:`~bbreporter.rules.STAT_FIELDS`, plus each
+player's team as an int code, about 24 bytes a player next to the 184 of a
+stats dict. It is a League watcher of ``player_profiles``, so leaders and
+per-team totals are vectorized lookups instead of loops over the stats dicts.
+"""
+import numpy as np
+
+from bbreporter.rules import STAT_FIELDS
+
+_COLUMNS = {stat: column for column, stat in enumerate(STAT_FIELDS)}
+_INITIAL_CAPACITY = 64
+
+
+def _stat_row(record):
+    stats = record.get('stats') or {}
+    row = []
+    for stat in STAT_FIELDS:
+        try:
+            row.append(int(stats.get(stat) or 0))
+        except (TypeError, ValueError):
+            row.append(0)
+    return row
+
+
+class StatsStore:
+    def __init__(self, records):
+        self.records = records
+        self.rebuild()
+
+    def rebuild(self):
+        count = len(self.records)
+        self.team_codes = {}
+        self.team_names = []
+        self._values = np.zeros((max(count, _INITIAL_CAPACITY), len(STAT_FIELDS)), dtype=np.int32)
+        self._teams = np.zeros(len(self._values), dtype=np.int32)
+        if count:
+            self._values[:count] = [_stat_row(record) for record in self.records]
+            self._teams[:count] = [self._team_code(record) for record in self.records]
+        self.size = count
+
+    def _team_code(self, record):
+        team_name = record.get('team_name', '')
+        code = self.team_codes.get(team_name)
+        if code is None:
+            code = self.team_codes[team_name] = len(self.team_names)
+            self.team_names.append(team_name)
+        return code
+
+    # --- Change notifications ---
+    def appended(self, record):
+        if self.size == len(self._values):
+            # Double the capacity so appends stay amortized O(1)
+            self._values = np.concatenate([self._values, np.zeros_like(self._values)])
+            self._teams = np.concatenate([self._teams, np.zeros_like(self._teams)])
+        self._values[self.size] = _stat_row(record)
+        self._teams[self.size] = self._team_code(record)
+        self.size += 1
+
+    def replaced(self, idx, old_record, new_record):
+        self._values[idx] = _stat_row(new_record)
+        self._teams[idx] = self._team_code(new_record)
+
+    def removed(self, idx, old_record):
+        self._values[idx:self.size - 1] = self._values[idx + 1:self.size]
+        self._teams[idx:self.size - 1] = self._teams[idx + 1:self.size]
+        self.size -= 1
+
+    # --- Lookups ---
+    @property
+    def values(self):
+        """``(players, len(STAT_FIELDS))`` array, row ``i`` being ``records[i]``."""
+        return self._values[:self.size]
+
+    def column(self, stat):
+        return self._values[:self.size, _COLUMNS[stat]]
+
+    def top(self, stat, count=10):
+        """Positions of the ``count`` players with the highest ``stat``, best first; ties keep collection order."""
+        column = self.column(stat)
+        if count < len(column):
+            # Partition first so only the candidates get sorted
+            threshold = np.partition(column, len(column) - count)[len(column) - count]
+            candidates = np.flatnonzero(column >= threshold)
+        else:
+            candidates = np.arange(len(column))
+        ranked = candidates[np.argsort(-column[candidates], kind='stable')]
+        return ranked[:count].tolist()
+
+    def team_totals(self, stat=None):
+        """``{team_name: total}`` of one stat, or ``{team_name: {stat: total}}`` for all of them."""
+        teams = self._teams[:self.size]
+        columns = [stat] if stat else STAT_FIELDS
+        sums = {name: np.bincount(teams, weights=self.column(name), minlength=len(self.team_names)) for name in columns}
+        present = np.bincount(teams, minlength=len(self.team_names))
+        totals = {}
+        for code, team_name in enumerate(self.team_names):
+            if present[code]:
+                row = {name: int(sums[name][code]) for name in columns}
+                totals[team_name] = row[stat] if stat else row
+        return totals
@@ -0,0 +1,170 @@
+"""Deterministic synthetic leagues for benchmarks and load testing.
+
+``generate_league(players)`` builds a league of about ``players`` players
+spread over teams of 11-16, with a season of matches, injuries and
+narratives. Teams use the races in :mod:`bbreporter.rules` and players the
+positions of their team's race; the same ``players`` and ``seed`` always give
+the same league. Records have exactly the fields the app's forms write.
+
+Run ``python -m bbreporter.synthetic DATA_DIR --players 1000`` to write one to
+a data directory the app, the command line or the batch mode can open.
+"""
+import argparse
+import os
+import random
+from datetime import date, timedelta
+
+from bbreporter import journal, scores
+from bbreporter.league import COLLECTION_FILES, LEAGUE_INFO_FILE
+from bbreporter.rules import BLOOD_BOWL_RACES, RACE_POSITIONS
+
+TEAM_SIZE = (11, 16)
+
+_TEAM_WORDS = ("Reavers", "Marauders", "Crushers", "Howlers", "Gutters", "Stompers", "Raiders", "Warhawks",
+               "Bonebreakers", "Screamers", "Nightmares", "Thunderers", "Grinders", "Hammers", "Vipers", "Maulers")
+_PLACES = ("Altdorf", "Middenheim", "Karak", "Naggaroth", "Lustria", "Praag", "Nuln", "Marienburg",
+           "Skavenblight", "Araby", "Kislev", "Talabheim", "Ulthuan", "Mordheim", "Bretonnia", "Sylvania")
+_FIRST_NAMES = ("Grak", "Morg", "Helga", "Ulric", "Snik", "Thrud", "Varag", "Elwen", "Bork", "Skitt",
+                "Griff", "Zara", "Dolf", "Krag", "Lothar", "Nyssa", "Rolf", "Tarq", "Ysolde", "Urgash")
+_LAST_NAMES = ("Ironhide", "Skullsplitter", "Quickfoot", "Bloodfist", "Oberwald", "Gutstabber", "Stonejaw",
+               "Ratspike", "Longshanks", "Grimhelm", "Blackmane", "Redclaw", "Swiftwind", "Deathroller")
+_INJURIES = ("Broken Ribs", "Concussion", "Smashed Knee", "Dislocated Shoulder", "Serious Concussion", "Broken Arm")
+_EVENTS = ("a last-second touchdown", "a brutal blitz", "a fan invasion", "a stolen ball", "a referee bribe",
+           "a wizard's fireball", "three casualties in one drive", "a perfect long pass")
+
+_SENTENCE = "{name} are remembered for {event} and for the season {place} will not forget. "
+
+
+def _pick(rng, items):
+    return items[rng.randrange(len(items))]
+
+
+def _team_names(count):
+    # "<Place> <Word>", numbered once every combination is taken, so names stay unique
+    combinations = len(_PLACES) * len(_TEAM_WORDS)
+    names = []
+    for idx in range(count):
+        name = f"{_PLACES[idx % len(_PLACES)]} {_TEAM_WORDS[(idx // len(_PLACES)) % len(_TEAM_WORDS)]}"
+        if idx >= combinations:
+            name += f" {idx // combinations + 1}"
+        names.append(name)
+    return names
+
+
+def generate_league(players, seed=0):
+    """A ``gather_all_data()``-shaped dict with about ``players`` players."""
+    rng = random.Random(seed)
+    races = [race for race in BLOOD_BOWL_RACES if race in RACE_POSITIONS]
+
+    # --- Teams and players ---
+    low, high = TEAM_SIZE
+    if players < 2 * low:
+        # Tiny leagues still get two teams, so there are matches to play
+        low = high = max(players // 2, 1)
+    sizes = []
+    remaining = players
+    while remaining > 0:
+        size = min(rng.randint(low, high), remaining)
+        sizes.append(size)
+        remaining -= size
+
+    team_profiles = []
+    player_profiles = []
+    for team_name, size in zip(_team_names(len(sizes)), sizes):
+        race = _pick(rng, races)
+        team_profiles.append({
+            'team_name': team_name,
+            'team_race': race,
+            'coach_name': f"{_pick(rng, _FIRST_NAMES)} {_pick(rng, _LAST_NAMES)}",
+            'team_history': _SENTENCE.format(name=team_name, event=_pick(rng, _EVENTS), place=_pick(rng, _PLACES)) * 3,
+            'achievements': f"{rng.randint(0, 5)} league titles",
+            'team_logo': '',
+        })
+        for number in range(1, size + 1):
+            player_profiles.append({
+                'player_name': f"{_pick(rng, _FIRST_NAMES)} {_pick(rng, _LAST_NAMES)} #{number}",
+                'team_name': team_name,
+                'team_race': race,
+                'position': _pick(rng, RACE_POSITIONS[race]),
+                'bio': f"A {race} veteran known for {_pick(rng, _EVENTS)}.",
+                'career_highlights': f"Famous for {_pick(rng, _EVENTS)} against the {_pick(rng, _TEAM_WORDS)}.",
+                'player_photo': '',
+                'stats': {
+                    'matches_played': rng.randint(0, 30),
+                    'touchdowns': rng.randint(0, 12),
+                    'interceptions': rng.randint(0, 3),
+                    'injuries_caused': rng.randint(0, 10),
+                    'mvp_awards': rng.randint(0, 4),
+                },
+            })
+
+    # --- Season: every team plays about four matches ---
+    matches = []
+    season_start = date(2024, 1, 6)
+    for idx in range(len(team_profiles) * 2 if len(team_profiles) > 1 else 0):
+        team_a, team_b = rng.sample(team_profiles, 2)
+        a_td, b_td = rng.randint(0, 4), rng.randint(0, 4)
+        match = {
+            'match_date': (season_start + timedelta(days=7 * (idx // max(len(team_profiles) // 2, 1)))).strftime('%B %d, %Y'),
+            'team_a_name': team_a['team_name'],
+            'team_a_race': team_a['team_race'],
+            'team_b_name': team_b['team_name'],
+            'team_b_race': team_b['team_race'],
+            'final_score': f"{a_td}-{b_td}",
+            'key_events': f"The crowd saw {_pick(rng, _EVENTS)} and {_pick(rng, _EVENTS)}.",
+        }
+        match.update(scores.score_fields(match))
+        matches.append(match)
+
+    injuries = []
+    for player in rng.sample(player_profiles, len(player_profiles) // 20):
+        injuries.append({
+            'player_name': player['player_name'],
+            'team_name': player['team_name'],
+            'injury_type': _pick(rng, _INJURIES),
+            'injury_description': f"Suffered during {_pick(rng, _EVENTS)}.",
+            'time_out': f"{rng.randint(1, 6)} matches",
+            'expected_return': f"Week {rng.randint(2, 20)}",
+        })
+
+    narratives = []
+    for idx in range(max(len(team_profiles) // 4, 1) if team_profiles else 0):
+        team_a, team_b = rng.choice(team_profiles), rng.choice(team_profiles)
+        narratives.append({
+            'storyline_title': f"Feud #{idx + 1}: {team_a['team_name']} vs {team_b['team_name']}",
+            'description': _SENTENCE.format(name=team_a['team_name'], event=_pick(rng, _EVENTS), place=_pick(rng, _PLACES)),
+            'teams_or_players_involved': f"{team_a['team_name']}, {team_b['team_name']}",
+            'recent_developments': f"Last week brought {_pick(rng, _EVENTS)}." if rng.random() < 0.5 else '',
+        })
+
+    return {
+        'league_info': {
+            'league_name': f"Synthetic League ({players} players)",
+            'league_description': "A generated league for benchmarks.",
+        },
+        'team_profiles': team_profiles,
+        'player_profiles': player_profiles,
+        'matches': matches,
+        'injuries': injuries,
+        'narratives': narratives,
+        'additional_details': '',
+    }
+
+
+def write_league(data_dir, data, store=journal):
+    """Write a generated league into ``data_dir`` in the app's file layout."""
+    os.makedirs(data_dir, exist_ok=True)
+    store.write_snapshot(os.path.join(data_dir, LEAGUE_INFO_FILE), data['league_info'])
+    for collection, filename in COLLECTION_FILES.items():
+        store.write_snapshot(os.path.join(data_dir, filename), data[collection])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog='python -m bbreporter.synthetic', description="Write a synthetic league.")
+    parser.add_argument('data_dir', help="Directory to write the league into.")
+    parser.add_argument('--players', type=int, default=1000, help="Number of players (default: 1000).")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed (default: 0).")
+    args = parser.parse_args()
+    league = generate_league(args.players, args.seed)
+    write_league(args.data_dir, league)
+    print(", ".join(f"{len(league[collection])} {collection}" for collection in COLLECTION_FILES))
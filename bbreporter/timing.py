@@ -0,0 +1,87 @@
+"""Opt-in wall-clock timing of the sections of one script run.
+
+A :class:`Timer` is created at the top of each Streamlit rerun. Code is timed
+with ``with timer.section("Match Reports"):`` or the ``@timer.wrap(label)``
+decorator; sections may nest, and repeated sections (one sprite lookup per
+player) add up under the same label. A disabled timer does nothing, so the
+instrumentation can stay in place at no cost.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import wraps
+
+# Nested section labels are joined into paths like "Player Profiles / sprite lookups"
+PATH_SEPARATOR = " / "
+
+_log_lock = threading.Lock()
+
+
+class Timer:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        # path -> [seconds, calls], in first-seen order
+        self.sections = {}
+        self._stack = []
+        # (path, start) of the sections currently entered, innermost last
+        self._open = []
+
+    @contextmanager
+    def section(self, label):
+        if not self.enabled:
+            yield
+            return
+        self._stack.append(label)
+        path = PATH_SEPARATOR.join(self._stack)
+        # Registered on entry so a section is listed before the sections nested in it
+        entry = self.sections.setdefault(path, [0.0, 0])
+        started = time.perf_counter()
+        self._open.append((path, started))
+        try:
+            yield
+        finally:
+            entry[0] += time.perf_counter() - started
+            entry[1] += 1
+            self._open.pop()
+            self._stack.pop()
+
+    def wrap(self, label):
+        """Decorator form of :meth:`section`."""
+        def decorator(function):
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.section(label):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def rows(self):
+        """``(path, depth, seconds, calls)`` for every section, in the order they were first entered.
+
+        Sections still open, e.g. when the run is about to be cut short by a
+        rerun, count as one call with the time they have taken so far.
+        """
+        now = time.perf_counter()
+        running = {path: now - started for path, started in self._open}
+        return [(path, path.count(PATH_SEPARATOR), seconds + running.get(path, 0.0), calls + (path in running))
+                for path, (seconds, calls) in self.sections.items()]
+
+    def write_log(self, log_path, **context):
+        """Append this run as one JSON line: timestamp, total seconds, ``context`` and every section."""
+        entry = {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'total_seconds': round(self.elapsed(), 6),
+            **context,
+            'sections': {path: {'seconds': round(seconds, 6), 'calls': calls}
+                         for path, _, seconds, calls in self.rows()},
+        }
+        os.makedirs(os.path.dirname(log_path) or '.', exist_ok=True)
+        with _log_lock, open(log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
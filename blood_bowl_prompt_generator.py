@@ -1,11 +1,12 @@
 import streamlit as st
-import pandas as pd
 import json
 import os
-import re
-import time
 from datetime import datetime
-import plotly.express as px
+
+from bbreporter import events, scores
+from bbreporter.budget import estimate_tokens, fit_prompt
+from bbreporter.league import COLLECTION_FILES, League, is_valid_filename
+from bbreporter.prompt import build_prompt, render_section
 
 # --- Set Up the Page ---
 st.set_page_config(page_title="Blood Bowl GPT Prompt Generator", layout="wide")
@@ -28,68 +29,76 @@ if not os.path.exists(team_logos_dir):
 if not os.path.exists(player_photos_dir):
     os.makedirs(player_photos_dir)
 
-# --- Function to Validate Filenames ---
-def is_valid_filename(filename):
-    # Allow only alphanumeric characters, underscores, hyphens, spaces, and periods
-    return re.match(r'^[\w\-. ]+$', filename) is not None
-
 # --- Functions to Save and Load Data ---
+# The league's collections, name indexes and storage live in bbreporter/league.py. Collections are stored
+# as a snapshot plus an append-only journal (see bbreporter/journal.py), or in a SQLite database
+# with BBREPORTER_STORAGE=sqlite. These wrappers report invalid "Save As" filenames, and records another
+# session changed first, in the UI.
 def save_data_to_file(data, filename):
-    if not is_valid_filename(filename):
-        st.error("Invalid filename. Use only letters, numbers, underscores, hyphens, spaces, and periods.")
-        return
-
-    file_path = os.path.join(BASE_DATA_DIR, filename)
-    if os.path.exists(file_path):
-        # Append timestamp to filename
-        timestamp = int(time.time())
-        base, ext = os.path.splitext(filename)
-        filename = f"{base}_{timestamp}{ext}"
-        file_path = os.path.join(BASE_DATA_DIR, filename)
-        st.warning(f"File exists. Saving as {filename} instead.")
-
-    with open(file_path, 'w') as f:
-        json.dump(data, f)
-
-def load_data_from_file(filename):
-    file_path = os.path.join(BASE_DATA_DIR, filename)
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-            return data
-    except Exception as e:
-        # st.error(f"Error loading JSON file: {e}")
-        return None
+        league.save(data, filename)
+    except ValueError as e:
+        st.error(str(e))
+        return False
+    return True
 
-def save_team_profiles(data, filename='team_profiles.json'):
-    save_data_to_file(data, filename)
-
-def load_team_profiles(filename='team_profiles.json'):
-    data = load_data_from_file(filename)
-    return data if data else []
+def add_record(collection, record, filename):
+    try:
+        league.add(collection, record, export_as=filename)
+    except ValueError as e:
+        st.error(str(e))
 
-def save_player_profiles(data, filename='player_profiles.json'):
-    save_data_to_file(data, filename)
+def update_record(collection, idx, record, expected=None):
+    try:
+        league.update(collection, idx, record, expected=expected)
+    except ValueError as e:
+        st.error(str(e))
+        return False
+    return True
 
-def load_player_profiles(filename='player_profiles.json'):
-    data = load_data_from_file(filename)
-    return data if data else []
+def delete_record(collection, idx, expected=None):
+    try:
+        league.delete(collection, idx, expected=expected)
+    except ValueError as e:
+        st.error(str(e))
+        return False
+    return True
+
+def edit_form_open(collection, name):
+    # Edit forms follow the record their button was clicked for, which another session may have moved or replaced
+    if not st.session_state.get(f"show_edit_{name}_form", False):
+        return False
+    idx = league.position(collection, st.session_state.get(f"edit_{name}_record"))
+    if idx is None:
+        st.session_state[f"show_edit_{name}_form"] = False
+        st.warning("The record being edited was changed or deleted in another session.")
+        return False
+    st.session_state[f"edit_{name}_index"] = idx
+    return True
+
+# Plural names of the prompt sections, for the token budget report
+SECTION_LABELS = {
+    'team_profiles': "team profiles",
+    'player_profiles': "player profiles",
+    'matches': "match reports",
+    'injuries': "injury reports",
+    'narratives': "narratives",
+}
 
 # --- Initialize Session State ---
+# One League per server process, shared by every session, so a change made in one tab is seen by all of them
+@st.cache_resource
+def shared_league(data_dir):
+    return League(data_dir)
+
+league = shared_league(BASE_DATA_DIR)
+
+# The collections keep their session-state names; they are the League's own lists, changed through it
+for collection in COLLECTION_FILES:
+    if collection not in st.session_state:
+        st.session_state[collection] = league[collection]
 if 'league_info' not in st.session_state:
-    st.session_state.league_info = {}
-if 'matches' not in st.session_state:
-    st.session_state.matches = []
-if 'injuries' not in st.session_state:
-    st.session_state.injuries = []
-if 'narratives' not in st.session_state:
-    st.session_state.narratives = []
-
-# New session states for team and player profiles
-if 'team_profiles' not in st.session_state:
-    st.session_state.team_profiles = load_team_profiles()
-if 'player_profiles' not in st.session_state:
-    st.session_state.player_profiles = load_player_profiles()
+    st.session_state.league_info = league.league_info
 
 # --- Sidebar for Global Settings ---
 st.sidebar.title("Global Settings")
@@ -107,10 +116,12 @@ tone_style = st.sidebar.selectbox("Tone and Style", ["Humorous", "Serious", "Dra
 format_length = st.sidebar.text_input("Format and Length", value="Approximately 500 words", key="format_length", help="Specify the format and desired length of the report.")
 
 # --- Tabs for Navigation ---
+# Switching tabs reruns the script, so the tables and charts of closed tabs are skipped
+# and pandas/plotly are only imported once a tab that shows them is opened
 tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs([
     "League Info", "Team Profiles", "Player Profiles", "Match Reports",
     "Injury Reports", "Narratives", "Generate Prompt", "Help"
-])
+], key="active_tab", on_change="rerun")
 
 # --- League Information ---
 with tab1:
@@ -134,8 +145,8 @@ with tab1:
                 else:
                     st.session_state.league_info['league_name'] = league_name
                     st.session_state.league_info['league_description'] = league_description
-                    save_data_to_file(st.session_state.league_info, save_filename)
-                    st.success(f"League information saved as `{save_filename}`.")
+                    if save_data_to_file(st.session_state.league_info, save_filename):
+                        st.success(f"League information saved as `{save_filename}`.")
 
     # Load League Info Form
     with st.expander("Load League Information"):
@@ -147,7 +158,7 @@ with tab1:
                 if uploaded_file is not None:
                     loaded_data = json.load(uploaded_file)
                     if loaded_data is not None:
-                        st.session_state.league_info = loaded_data
+                        st.session_state.league_info = league.league_info = loaded_data
                         st.success("League information loaded from file.")
                 else:
                     st.error("Please upload a JSON file.")
@@ -195,8 +206,7 @@ with tab2:
                         'achievements': achievements.strip(),
                         'team_logo': team_logo_url
                     }
-                    st.session_state.team_profiles.append(team_profile)
-                    save_team_profiles(st.session_state.team_profiles)
+                    add_record('team_profiles', team_profile, 'team_profiles.json')
                     st.success(f"Team profile for '{team_name}' added.")
                     st.rerun()
 
@@ -214,21 +224,21 @@ with tab2:
             # Edit and Delete Buttons
             col1, col2 = st.columns(2)
             with col1:
-                if st.button(f"Edit Team {idx + 1}", key=f"edit_team_{idx}"):
+                if st.button(f"Edit Team {idx + 1}", key=f"edit_team_{id(team)}"):
                     st.session_state.edit_team_index = idx
+                    st.session_state.edit_team_record = team
                     st.session_state.show_edit_team_form = True
                     st.rerun()
             with col2:
-                if st.button(f"Delete Team {idx + 1}", key=f"delete_team_{idx}"):
-                    confirm_delete = st.checkbox(f"Confirm delete Team {idx + 1}", key=f"confirm_delete_team_{idx}")
+                if st.button(f"Delete Team {idx + 1}", key=f"delete_team_{id(team)}"):
+                    confirm_delete = st.checkbox(f"Confirm delete Team {idx + 1}", key=f"confirm_delete_team_{id(team)}")
                     if confirm_delete:
-                        st.session_state.team_profiles.pop(idx)
-                        save_team_profiles(st.session_state.team_profiles)
-                        st.success(f"Team '{team['team_name']}' deleted.")
-                        st.rerun()
+                        if delete_record('team_profiles', idx, expected=team):
+                            st.success(f"Team '{team['team_name']}' deleted.")
+                            st.rerun()
 
     # Edit Team Form
-    if st.session_state.get('show_edit_team_form', False):
+    if edit_form_open('team_profiles', 'team'):
         idx = st.session_state.edit_team_index
         team = st.session_state.team_profiles[idx]
         st.subheader(f"Edit Team '{team['team_name']}'")
@@ -261,11 +271,10 @@ with tab2:
                     'achievements': achievements.strip(),
                     'team_logo': team_logo_url
                 }
-                st.session_state.team_profiles[idx] = updated_team
-                save_team_profiles(st.session_state.team_profiles)
-                st.success(f"Team '{team_name}' updated.")
-                st.session_state.show_edit_team_form = False
-                st.rerun()
+                if update_record('team_profiles', idx, updated_team, expected=team):
+                    st.success(f"Team '{team_name}' updated.")
+                    st.session_state.show_edit_team_form = False
+                    st.rerun()
 
 # --- Player Profiles ---
 with tab3:
@@ -332,8 +341,7 @@ with tab3:
                             'mvp_awards': mvp_awards
                         }
                     }
-                    st.session_state.player_profiles.append(player_profile)
-                    save_player_profiles(st.session_state.player_profiles)
+                    add_record('player_profiles', player_profile, 'player_profiles.json')
                     st.success(f"Player profile for '{player_name}' added.")
                     st.rerun()
 
@@ -357,21 +365,21 @@ with tab3:
             # Edit and Delete Buttons
             col1, col2 = st.columns(2)
             with col1:
-                if st.button(f"Edit Player {idx + 1}", key=f"edit_player_profile_{idx}"):
+                if st.button(f"Edit Player {idx + 1}", key=f"edit_player_profile_{id(player)}"):
                     st.session_state.edit_player_profile_index = idx
+                    st.session_state.edit_player_profile_record = player
                     st.session_state.show_edit_player_profile_form = True
                     st.rerun()
             with col2:
-                if st.button(f"Delete Player {idx + 1}", key=f"delete_player_profile_{idx}"):
-                    confirm_delete = st.checkbox(f"Confirm delete Player {idx + 1}", key=f"confirm_delete_player_profile_{idx}")
+                if st.button(f"Delete Player {idx + 1}", key=f"delete_player_profile_{id(player)}"):
+                    confirm_delete = st.checkbox(f"Confirm delete Player {idx + 1}", key=f"confirm_delete_player_profile_{id(player)}")
                     if confirm_delete:
-                        st.session_state.player_profiles.pop(idx)
-                        save_player_profiles(st.session_state.player_profiles)
-                        st.success(f"Player '{player['player_name']}' deleted.")
-                        st.rerun()
+                        if delete_record('player_profiles', idx, expected=player):
+                            st.success(f"Player '{player['player_name']}' deleted.")
+                            st.rerun()
 
     # Edit Player Profile Form
-    if st.session_state.get('show_edit_player_profile_form', False):
+    if edit_form_open('player_profiles', 'player_profile'):
         idx = st.session_state.edit_player_profile_index
         player = st.session_state.player_profiles[idx]
         st.subheader(f"Edit Player '{player['player_name']}'")
@@ -420,11 +428,10 @@ with tab3:
                         'mvp_awards': mvp_awards
                     }
                 }
-                st.session_state.player_profiles[idx] = updated_player
-                save_player_profiles(st.session_state.player_profiles)
-                st.success(f"Player '{player_name}' updated.")
-                st.session_state.show_edit_player_profile_form = False
-                st.rerun()
+                if update_record('player_profiles', idx, updated_player, expected=player):
+                    st.success(f"Player '{player_name}' updated.")
+                    st.session_state.show_edit_player_profile_form = False
+                    st.rerun()
 
 # --- Match Reports ---
 with tab4:
@@ -453,7 +460,7 @@ with tab4:
                 # team_b_race = st.text_input("Team B Race", help="Enter the race of Team B.")
             final_score = st.text_input("Final Score", help="E.g., '2-1 to Team A'")
             key_events = st.text_area("Key Events", help="List significant events such as touchdowns, injuries.")
-            save_filename = st.text_input("Save As", value="matches.json", help="Filename for saving the match report.")
+            save_filename = st.text_input("Save As", value="matches.json", help="Reports are always kept in matches.json; another name also writes a full copy there.")
             submit_match = st.form_submit_button("Add Match Report")
 
             if submit_match:
@@ -481,21 +488,24 @@ with tab4:
                         'final_score': final_score.strip(),
                         'key_events': key_events.strip()
                     }
-                    st.session_state.matches.append(match)
-                    save_data_to_file(st.session_state.matches, save_filename)
+                    match.update(scores.score_fields(match))
+                    add_record('matches', match, save_filename)
                     st.success(f"Match report added and saved as `{save_filename}`.")
                     st.rerun()
 
     # Display existing match reports
     if st.session_state.matches:
         st.subheader("Existing Match Reports")
-        matches_df = pd.DataFrame(st.session_state.matches)
-        st.dataframe(matches_df)
+        if tab4.open:
+            from bbreporter import charts
+
+            matches_df = league.frame('matches')
+            st.dataframe(matches_df)
 
-        # Visualization of match outcomes
-        if 'final_score' in matches_df.columns:
-            fig = px.histogram(matches_df, x='final_score', title='Match Outcomes')
-            st.plotly_chart(fig)
+            # Visualization of match outcomes, one bar per scoreline (bbreporter/charts.py)
+            fig = charts.figure('matches', st.session_state.matches, league.versions['matches'])
+            if fig:
+                st.plotly_chart(fig)
 
         # Edit and Delete Options
         for idx, match in enumerate(st.session_state.matches):
@@ -506,21 +516,21 @@ with tab4:
             # Edit and Delete Buttons
             col1, col2 = st.columns(2)
             with col1:
-                if st.button(f"Edit Match {idx + 1}", key=f"edit_match_{idx}"):
+                if st.button(f"Edit Match {idx + 1}", key=f"edit_match_{id(match)}"):
                     st.session_state.edit_match_index = idx
+                    st.session_state.edit_match_record = match
                     st.session_state.show_edit_match_form = True
                     st.rerun()
             with col2:
-                if st.button(f"Delete Match {idx + 1}", key=f"delete_match_{idx}"):
-                    confirm_delete = st.checkbox(f"Confirm delete Match {idx + 1}", key=f"confirm_delete_match_{idx}")
+                if st.button(f"Delete Match {idx + 1}", key=f"delete_match_{id(match)}"):
+                    confirm_delete = st.checkbox(f"Confirm delete Match {idx + 1}", key=f"confirm_delete_match_{id(match)}")
                     if confirm_delete:
-                        st.session_state.matches.pop(idx)
-                        save_data_to_file(st.session_state.matches, save_filename)
-                        st.success(f"Match {idx + 1} deleted.")
-                        st.rerun()
+                        if delete_record('matches', idx, expected=match):
+                            st.success(f"Match {idx + 1} deleted.")
+                            st.rerun()
 
         # Edit Match Form
-        if st.session_state.get('show_edit_match_form', False):
+        if edit_form_open('matches', 'match'):
             idx = st.session_state.edit_match_index
             match = st.session_state.matches[idx]
             st.subheader(f"Edit Match {idx + 1}")
@@ -550,11 +560,18 @@ with tab4:
                         'final_score': final_score.strip(),
                         'key_events': key_events.strip()
                     }
-                    st.session_state.matches[idx] = updated_match
-                    save_data_to_file(st.session_state.matches, save_filename)
-                    st.success(f"Match {idx + 1} updated.")
-                    st.session_state.show_edit_match_form = False
-                    st.rerun()
+                    # This form has no player events; keep the ones recorded in the main app for players of teams
+                    # still in the match, and give a match moved to other teams their rosters, as the main app does
+                    same_teams = (match['team_a_name'], match['team_b_name']) == (team_a_name, team_b_name)
+                    if 'events' in match:
+                        updated_match['events'] = [event for event in match['events'] if event['team_name'] in (team_a_name, team_b_name)]
+                    if 'participants' in match:
+                        updated_match['participants'] = match['participants'] if same_teams else events.participants(league.indexes['player_profiles'], team_a_name, team_b_name)
+                    updated_match.update(scores.score_fields(updated_match))
+                    if update_record('matches', idx, updated_match, expected=match):
+                        st.success(f"Match {idx + 1} updated.")
+                        st.session_state.show_edit_match_form = False
+                        st.rerun()
 
 # --- Injury Reports ---
 with tab5:
@@ -575,7 +592,7 @@ with tab5:
             injury_description = st.text_area("Injury Description", help="Provide details about the injury.")
             time_out = st.text_input("Time Out", help="E.g., '2 weeks', 'Rest of the season'")
             expected_return = st.text_input("Expected Return", help="E.g., 'Next match', 'Playoffs'")
-            save_filename = st.text_input("Save As", value="injuries.json", help="Filename for saving injury reports.")
+            save_filename = st.text_input("Save As", value="injuries.json", help="Reports are always kept in injuries.json; another name also writes a full copy there.")
             submit_injury = st.form_submit_button("Add Injury Report")
 
             if submit_injury:
@@ -596,21 +613,23 @@ with tab5:
                         'time_out': time_out.strip(),
                         'expected_return': expected_return.strip()
                     }
-                    st.session_state.injuries.append(injury)
-                    save_data_to_file(st.session_state.injuries, save_filename)
+                    add_record('injuries', injury, save_filename)
                     st.success(f"Injury report added and saved as `{save_filename}`.")
                     st.rerun()
 
     # Display existing injury reports
     if st.session_state.injuries:
         st.subheader("Existing Injury Reports")
-        injuries_df = pd.DataFrame(st.session_state.injuries)
-        st.dataframe(injuries_df)
+        if tab5.open:
+            from bbreporter import charts
 
-        # Visualization of injury types
-        if 'injury_type' in injuries_df.columns:
-            fig = px.bar(injuries_df, x='player_name', y='injury_type', color='team_name', title='Injuries by Player')
-            st.plotly_chart(fig)
+            injuries_df = league.frame('injuries')
+            st.dataframe(injuries_df)
+
+            # Visualization of injury types per team
+            fig = charts.figure('injuries', st.session_state.injuries, league.versions['injuries'])
+            if fig:
+                st.plotly_chart(fig)
 
         # Edit and Delete Options
         for idx, injury in enumerate(st.session_state.injuries):
@@ -622,21 +641,21 @@ with tab5:
             # Edit and Delete Buttons
             col1, col2 = st.columns(2)
             with col1:
-                if st.button(f"Edit Injury {idx + 1}", key=f"edit_injury_{idx}"):
+                if st.button(f"Edit Injury {idx + 1}", key=f"edit_injury_{id(injury)}"):
                     st.session_state.edit_injury_index = idx
+                    st.session_state.edit_injury_record = injury
                     st.session_state.show_edit_injury_form = True
                     st.rerun()
             with col2:
-                if st.button(f"Delete Injury {idx + 1}", key=f"delete_injury_{idx}"):
-                    confirm_delete = st.checkbox(f"Confirm delete Injury {idx + 1}", key=f"confirm_delete_injury_{idx}")
+                if st.button(f"Delete Injury {idx + 1}", key=f"delete_injury_{id(injury)}"):
+                    confirm_delete = st.checkbox(f"Confirm delete Injury {idx + 1}", key=f"confirm_delete_injury_{id(injury)}")
                     if confirm_delete:
-                        st.session_state.injuries.pop(idx)
-                        save_data_to_file(st.session_state.injuries, save_filename)
-                        st.success(f"Injury {idx + 1} deleted.")
-                        st.rerun()
+                        if delete_record('injuries', idx, expected=injury):
+                            st.success(f"Injury {idx + 1} deleted.")
+                            st.rerun()
 
         # Edit Injury Form
-        if st.session_state.get('show_edit_injury_form', False):
+        if edit_form_open('injuries', 'injury'):
             idx = st.session_state.edit_injury_index
             injury = st.session_state.injuries[idx]
             st.subheader(f"Edit Injury {idx + 1}")
@@ -659,11 +678,10 @@ with tab5:
                         'time_out': time_out.strip(),
                         'expected_return': expected_return.strip()
                     }
-                    st.session_state.injuries[idx] = updated_injury
-                    save_data_to_file(st.session_state.injuries, save_filename)
-                    st.success(f"Injury {idx + 1} updated.")
-                    st.session_state.show_edit_injury_form = False
-                    st.rerun()
+                    if update_record('injuries', idx, updated_injury, expected=injury):
+                        st.success(f"Injury {idx + 1} updated.")
+                        st.session_state.show_edit_injury_form = False
+                        st.rerun()
 
 # --- Narratives and Lore ---
 with tab6:
@@ -677,7 +695,7 @@ with tab6:
             description = st.text_area("Description", help="Provide a description of the narrative.")
             teams_or_players_involved = st.text_input("Teams/Players Involved", help="List the teams or players involved.")
             recent_developments = st.text_area("Recent Developments", help="Describe any recent developments in the storyline.")
-            save_filename = st.text_input("Save As", value="narratives.json", help="Filename for saving narratives.")
+            save_filename = st.text_input("Save As", value="narratives.json", help="Narratives are always kept in narratives.json; another name also writes a full copy there.")
             submit_narrative = st.form_submit_button("Add Narrative")
 
             if submit_narrative:
@@ -694,22 +712,23 @@ with tab6:
                         'teams_or_players_involved': teams_or_players_involved.strip(),
                         'recent_developments': recent_developments.strip()
                     }
-                    st.session_state.narratives.append(narrative)
-                    save_data_to_file(st.session_state.narratives, save_filename)
+                    add_record('narratives', narrative, save_filename)
                     st.success(f"Narrative added and saved as `{save_filename}`.")
                     st.rerun()
 
     # Display existing narratives
     if st.session_state.narratives:
         st.subheader("Existing Narratives")
-        narratives_df = pd.DataFrame(st.session_state.narratives)
-        st.dataframe(narratives_df)
+        if tab6.open:
+            from bbreporter import charts
+
+            narratives_df = league.frame('narratives')
+            st.dataframe(narratives_df)
 
-        # Visualization of narratives by teams/players
-        if 'teams_or_players_involved' in narratives_df.columns:
-            narratives_df['count'] = 1  # Add a count column for plotting
-            fig = px.bar(narratives_df, x='teams_or_players_involved', y='count', title='Narratives by Teams/Players')
-            st.plotly_chart(fig)
+            # Visualization of narratives by teams/players
+            fig = charts.figure('narratives', st.session_state.narratives, league.versions['narratives'])
+            if fig:
+                st.plotly_chart(fig)
 
         # Edit and Delete Options
         for idx, narrative in enumerate(st.session_state.narratives):
@@ -721,21 +740,21 @@ with tab6:
             # Edit and Delete Buttons
             col1, col2 = st.columns(2)
             with col1:
-                if st.button(f"Edit Narrative {idx + 1}", key=f"edit_narrative_{idx}"):
+                if st.button(f"Edit Narrative {idx + 1}", key=f"edit_narrative_{id(narrative)}"):
                     st.session_state.edit_narrative_index = idx
+                    st.session_state.edit_narrative_record = narrative
                     st.session_state.show_edit_narrative_form = True
                     st.rerun()
             with col2:
-                if st.button(f"Delete Narrative {idx + 1}", key=f"delete_narrative_{idx}"):
-                    confirm_delete = st.checkbox(f"Confirm delete Narrative {idx + 1}", key=f"confirm_delete_narrative_{idx}")
+                if st.button(f"Delete Narrative {idx + 1}", key=f"delete_narrative_{id(narrative)}"):
+                    confirm_delete = st.checkbox(f"Confirm delete Narrative {idx + 1}", key=f"confirm_delete_narrative_{id(narrative)}")
                     if confirm_delete:
-                        st.session_state.narratives.pop(idx)
-                        save_data_to_file(st.session_state.narratives, save_filename)
-                        st.success(f"Narrative {idx + 1} deleted.")
-                        st.rerun()
+                        if delete_record('narratives', idx, expected=narrative):
+                            st.success(f"Narrative {idx + 1} deleted.")
+                            st.rerun()
 
         # Edit Narrative Form
-        if st.session_state.get('show_edit_narrative_form', False):
+        if edit_form_open('narratives', 'narrative'):
             idx = st.session_state.edit_narrative_index
             narrative = st.session_state.narratives[idx]
             st.subheader(f"Edit Narrative {idx + 1}")
@@ -753,11 +772,10 @@ with tab6:
                         'teams_or_players_involved': teams_or_players_involved.strip(),
                         'recent_developments': recent_developments.strip()
                     }
-                    st.session_state.narratives[idx] = updated_narrative
-                    save_data_to_file(st.session_state.narratives, save_filename)
-                    st.success(f"Narrative {idx + 1} updated.")
-                    st.session_state.show_edit_narrative_form = False
-                    st.rerun()
+                    if update_record('narratives', idx, updated_narrative, expected=narrative):
+                        st.success(f"Narrative {idx + 1} updated.")
+                        st.session_state.show_edit_narrative_form = False
+                        st.rerun()
 
 # --- Generate GPT Prompt ---
 with tab7:
@@ -768,137 +786,36 @@ with tab7:
         # Additional Details
         additional_details = st.text_area("Additional Details", height=150, key="additional_details", help="Include any specific quotes, interviews, or events to highlight.")
 
+        # Token Budget
+        fit_to_budget = st.checkbox("Fit to token budget", key="fit_to_budget", help="Trim lower-priority teams, players, matches, injuries and narratives until the prompt fits.")
+        token_budget = st.number_input("Token Budget", min_value=500, value=8000, step=500, key="token_budget", help="Approximate number of tokens the prompt may use.")
+        include_standings = st.checkbox("Include league standings", key="include_standings", help="Add the current standings table after the match reports.")
+
         generate_prompt = st.form_submit_button("Generate GPT Prompt")
 
         if generate_prompt:
             # Validate inputs
             required_fields = [reporter_name, reporter_description, tone_style, format_length]
             if all(required_fields):
-                # Formatting Functions
-                def format_league_info():
-                    league_info = st.session_state.league_info
-                    if league_info:
-                        return f"**League Name:** {league_info.get('league_name')}\n\n**League Description:**\n{league_info.get('league_description')}"
-                    else:
-                        return "No league information provided."
-
-                def format_team_profiles():
-                    teams = st.session_state.team_profiles
-                    if teams:
-                        team_str = ""
-                        for idx, team in enumerate(teams):
-                            team_str += f"**Team {idx + 1}:** {team['team_name']} ({team['team_race']})\n"
-                            team_str += f"- Coach: {team['coach_name']}\n"
-                            team_str += f"- History: {team['team_history']}\n"
-                            team_str += f"- Achievements: {team['achievements']}\n\n"
-                        return team_str
-                    else:
-                        return "No team profiles available."
-
-                def format_player_profiles():
-                    players = st.session_state.player_profiles
-                    if players:
-                        player_str = ""
-                        for idx, player in enumerate(players):
-                            player_str += f"**Player {idx + 1}:** {player['player_name']} ({player['position']}) for {player['team_name']}\n"
-                            player_str += f"- Bio: {player['bio']}\n"
-                            player_str += f"- Career Highlights: {player['career_highlights']}\n"
-                            player_str += f"- Statistics:\n"
-                            player_str += f"  - Matches Played: {player['stats']['matches_played']}\n"
-                            player_str += f"  - Touchdowns: {player['stats']['touchdowns']}\n"
-                            player_str += f"  - Interceptions: {player['stats']['interceptions']}\n"
-                            player_str += f"  - Injuries Caused: {player['stats']['injuries_caused']}\n"
-                            player_str += f"  - MVP Awards: {player['stats']['mvp_awards']}\n\n"
-                        return player_str
-                    else:
-                        return "No player profiles available."
-
-                def format_matches():
-                    matches = st.session_state.matches
-                    if matches:
-                        match_str = ""
-                        for idx, match in enumerate(matches):
-                            match_str += f"**Match {idx + 1}:** {match['team_a_name']} vs {match['team_b_name']} on {match['match_date']}\n"
-                            match_str += f"- Final Score: {match['final_score']}\n"
-                            match_str += f"- Key Events: {match['key_events']}\n\n"
-                        return match_str
-                    else:
-                        return "No match reports available."
-
-                def format_injuries():
-                    injuries = st.session_state.injuries
-                    if injuries:
-                        injury_str = ""
-                        for idx, injury in enumerate(injuries):
-                            injury_str += f"**Injury {idx + 1}:** {injury['player_name']} from {injury['team_name']}\n"
-                            injury_str += f"- Injury Type: {injury['injury_type']}\n"
-                            injury_str += f"- Description: {injury['injury_description']}\n"
-                            injury_str += f"- Time Out: {injury['time_out']}, Expected Return: {injury['expected_return']}\n\n"
-                        return injury_str
-                    else:
-                        return "No injury reports available."
-
-                def format_narratives():
-                    narratives = st.session_state.narratives
-                    if narratives:
-                        narrative_str = ""
-                        for idx, narrative in enumerate(narratives):
-                            narrative_str += f"**Storyline {idx + 1}:** {narrative['storyline_title']}\n"
-                            narrative_str += f"- Description: {narrative['description']}\n"
-                            narrative_str += f"- Teams/Players Involved: {narrative['teams_or_players_involved']}\n"
-                            narrative_str += f"- Recent Developments: {narrative['recent_developments']}\n\n"
-                        return narrative_str
-                    else:
-                        return "No narratives provided."
-
-                # Compile the GPT prompt
-                prompt = f"""
-You are a seasoned sports journalist in the fantastical and brutal world of Blood Bowl. Your task is to write a report for the **{st.session_state.league_info.get('league_name', 'Unknown League')}**. The report should be engaging and entertaining for both players in the league and fans of Blood Bowl in general. Assume the audience does not need an understanding of Blood Bowl mechanics to enjoy the content.
-
-**Please use the following information to craft your report:**
-
-1. **League Information:**
-
-{format_league_info()}
-
-2. **Team Profiles:**
-
-{format_team_profiles()}
-
-3. **Player Profiles:**
-
-{format_player_profiles()}
-
-4. **Match Reports:**
-
-{format_matches()}
-
-5. **Injury Reports:**
-
-{format_injuries()}
-
-6. **Narratives and Lore:**
-
-{format_narratives()}
-
-7. **Additional Narrative and Lore:**
-
-{additional_details}
-
-8. **Reporter Character:**
-- **Character Name:** {reporter_name}
-- **Character Description:** {reporter_description}
-
-9. **Tone and Style:** {tone_style}
-
-10. **Format and Length:** {format_length}
-
----
-
-**Now, please write the report accordingly.**
-"""
+                # Sections are rendered and memoized by bbreporter/prompt.py
+                data = league.data(additional_details)
+                standings = render_section('standings', st.session_state.matches, league.versions['matches']) if include_standings else None
+                if fit_to_budget:
+                    prompt, budget_report = fit_prompt(data, reporter_name, reporter_description, tone_style, format_length, token_budget, standings,
+                                                       league.versions)
+                else:
+                    prompt = build_prompt(data, reporter_name, reporter_description, tone_style, format_length, standings, league.versions)
+                    budget_report = None
                 st.subheader("Generated GPT Prompt")
                 st.text_area("GPT Prompt", value=prompt.strip(), height=500)
+                st.caption(f"Estimated size: about {estimate_tokens(prompt)} tokens.")
+                if budget_report:
+                    if not budget_report['fits']:
+                        st.warning(f"Could not fit the prompt into {token_budget} tokens even after trimming all league data.")
+                    for section, count in budget_report['dropped'].items():
+                        st.write(f"- Dropped {count} lower-priority {SECTION_LABELS[section]} to fit the budget.")
+                    for section, count in budget_report['truncated'].items():
+                        st.write(f"- Shortened long text in {count} {SECTION_LABELS[section]}.")
                 st.markdown("**Copy the prompt above and paste it into your GPT interface to generate the report.**")
             else:
                 st.error("Please fill in all required fields in the sidebar.")
@@ -1,17 +1,45 @@
 import streamlit as st
-import pandas as pd
 import json
 from io import StringIO, BytesIO
 import os
-import re
-import time
 from datetime import datetime
-import plotly.express as px
+
+from bbreporter import events, images, paging, scores, sprites, timing
+from bbreporter.export import export_bytes
+from bbreporter.league import COLLECTION_FILES, League, is_valid_filename
+from bbreporter.prompt import build_data_file_prompt, render_section
+from bbreporter.rules import BLOOD_BOWL_RACES, POSITION_INDEX, RACE_INDEX, RACE_POSITIONS, STAT_FIELDS
 
 # --- Set Up the Page ---
 st.set_page_config(page_title="Blood Bowl GPT Prompt Generator", layout="wide")
 st.title("Blood Bowl GPT Prompt Generator")
 
+# --- Timing Instrumentation ---
+# Off unless "Show timings" is on in the sidebar (or BBREPORTER_TIMING=1); see bbreporter/timing.py
+TIMING_DEFAULT = os.environ.get('BBREPORTER_TIMING') == '1'
+timer = timing.Timer(enabled=st.session_state.get('debug_timings', TIMING_DEFAULT))
+# Sections of the previous run, when it ended in a rerun (after a save, say) before it could report them
+rerun_timings = st.session_state.pop('rerun_timings', None)
+
+def timings_table(rows, total):
+    rows = "".join(
+        f"| {'&nbsp;' * 4 * depth}{path.rsplit(timing.PATH_SEPARATOR, 1)[-1]} | {seconds * 1000:.1f} | {calls} |\n"
+        for path, depth, seconds, calls in rows
+    )
+    return f"| Section | ms | Calls |\n|---|---:|---:|\n{rows}| **Whole rerun** | **{total * 1000:.1f}** | |"
+
+def log_timings():
+    if st.session_state.get('debug_timings_log'):
+        timer.write_log(os.path.join(BASE_DATA_DIR, 'timings.jsonl'), script='streamlit_app.py',
+                        tab=st.session_state.get('active_tab'))
+
+def rerun():
+    # st.rerun() stops the script before the timings panel and log at the end, so report this run first
+    if timer.enabled:
+        log_timings()
+        st.session_state.rerun_timings = (timer.rows(), timer.elapsed())
+    st.rerun()
+
 # --- Define Base Data Directory ---
 BASE_DATA_DIR = os.path.join(os.getcwd(), 'data')
 
@@ -33,330 +61,155 @@ if not os.path.exists(player_photos_dir):
 if not os.path.exists(sprites_dir):
     os.makedirs(sprites_dir)
 
-# --- Blood Bowl Races and Positions ---
-BLOOD_BOWL_RACES = [
-    # Fill in with actual Blood Bowl races
-    "Amazon",
-    "Black Orc",
-    "Chaos Chosen",
-    "Chaos Dwarf",
-    "Chaos Renegade",
-    "Dark Elf",
-    "Dwarf",
-    "Elven Union",
-    "Gnome",
-    "Goblin",
-    "Halfling",
-    "High Elf",
-    "Human",
-    "Imperial Nobility",
-    "Khorne",
-    "Lizardmen",
-    "Necromantic Horror",
-    "Norse",
-    "Nurgle",
-    "Ogre",
-    "Old World Alliance",
-    "Orc",
-    "Shambling Undead",
-    "Skaven",
-    "Snotling",
-    "Tomb Kings",
-    "Underworld Denizens",
-    "Vampire",
-    "Wood Elf"
-    # Add other races as needed
-]
-
-RACE_POSITIONS = {
-    # Fill in with actual positions for each race
-    "Amazon": [
-        "Eagle Warrior Linewoman",
-        "Python Warrior Thrower",
-        "Piranha Warrior Blitzer",
-        "Jaguar Warrior Blocker"
-    ],
-    "Black Orc": [
-        "Goblin Bruiser Lineman",
-        "Black Orc",
-        "Trained Troll"
-    ],
-    "Chaos Chosen": [
-        "Beastman Runner Lineman",
-        "Chosen Blocker",
-        "Chaos Troll",
-        "Chaos Ogre",
-        "Minotaur"
-    ],
-    "Chaos Dwarf": [
-        "Hobgoblin Lineman",
-        "Chaos Dwarf Blocker",
-        "Bull Centaur Blitzer",
-        "Enslaved Minotaur"
-    ],
-    "Chaos Renegade": [
-        "Renegade Human Lineman",
-        "Renegade Human Thrower",
-        "Renegade Goblin",
-        "Renegade Orc",
-        "Renegade Skaven",
-        "Renegade Dark Elf",
-        "Renegade Troll",
-        "Renegade Ogre",
-        "Renegade Minotaur",
-        "Renegade Rat Ogre"
-    ],
-    "Dark Elf": [
-        "Dark Elf Lineman",
-        "Runner",
-        "Blitzer",
-        "Assassin",
-        "Witch Elf"
-    ],
-    "Dwarf": [
-        "Dwarf Blocker Lineman",
-        "Dwarf Runner",
-        "Dwarf Blitzer",
-        "Troll Slayer",
-        "Deathroller"
-    ],
-    "Elven Union": [
-        "Lineman",
-        "Thrower",
-        "Catcher",
-        "Blitzer"
-    ],
-    "Gnome": [
-        "Gnome Lineman",
-        "Gnome Beastmaster",
-        "Gnome Illusionist",
-        "Woodland Fox",
-        "Altern Forest Treeman"
-    ],
-    "Goblin": [
-        "Goblin Lineman",
-        "Bomma",
-        "Looney",
-        "Fanatic",
-        "Pogoer",
-        "'Ooligan",
-        "Doom Diver"
-    ],
-    "Halfling": [
-        "Halfling Hopeful Lineman",
-        "Halfling Hefty",
-        "Halfling Catcher",
-        "Altern Forest Treeman"
-    ],
-    "High Elf": [
-        "Lineman",
-        "Thrower",
-        "Catcher",
-        "Blitzer"
-    ],
-    "Human": [
-        "Human Lineman",
-        "Thrower",
-        "Catcher",
-        "Blitzer",
-        "Halfling Hopeful",
-        "Ogre"
-    ],
-    "Imperial Nobility": [
-        "Imperial Retainer Lineman",
-        "Imperial Thrower",
-        "Noble Blitzer",
-        "Bodyguard",
-        "Ogre"
-    ],
-    "Khorne": [
-        "Bloodborn Marauder Lineman",
-        "Khorngor",
-        "Bloodseeker",
-        "Bloodspawn"
-    ],
-    "Lizardmen": [
-        "Skink Runner Lineman",
-        "Chameleon Skink",
-        "Saurus Blocker",
-        "Kroxigor"
-    ],
-    "Necromantic Horror": [
-        "Zombie Lineman",
-        "Ghoul Runner",
-        "Wraith",
-        "Werewolf",
-        "Flesh Golem"
-    ],
-    "Norse": [
-        "Norse Raider Lineman",
-        "Beer Boar",
-        "Norse Berserker",
-        "Valkyrie",
-        "Ulfwerener"
-        "Yhetee"
-    ],
-    "Nurgle": [
-        "Rotter Lineman",
-        "Pestigor",
-        "Bloater",
-        "Rotspawn"
-    ],
-    "Ogre": [
-        "Gnoblar Lineman",
-        "Ogre Runt Punter",
-        "Ogre Blocker"
-    ],
-    "Old World Alliance": [
-        "Human Lineman",
-        "Human Thrower",
-        "Human Catcher",
-        "Human Blitzer",
-        "Dwarf Blocker",
-        "Dwarf Runner",
-        "Dwarf Blitzer",
-        "Dwarf Troll Slayer",
-        "Halfling Hopeful",
-        "Ogre"
-        "Altern Forest Treeman"
-    ],
-    "Orc": [
-        "Orc Lineman",
-        "Thrower",
-        "Blitzer",
-        "Big 'Un Blocker",
-        "Goblin",
-        "Untrained Troll"
-    ],
-    "Shambling Undead": [
-        "Skeleton Lineman",
-        "Zombie Lineman",
-        "Ghoul Runner",
-        "Wight Blitzer",
-        "Mummy",
-    ],
-    "Skaven": [
-        "Skaven Clanrat Lineman",
-        "Thrower",
-        "Gutter Runner",
-        "Blitzer",
-        "Rat Ogre"
-    ],
-    "Snotling": [
-        "Snotling Lineman",
-        "Fungus Flinga",
-        "Fun-Hoppa",
-        "Stilty Runna",
-        "Pump Wagon",
-        "Trained Troll"
-    ],
-    "Tomb Kings": [
-        "Skeleton Lineman",
-        "Anointed Thrower",
-        "Anointed Blitzer",
-        "Tomb Guardian"
-    ],
-    "Underworld Denizens": [
-        "Underworld Goblin Lineman",
-        "Underworld Snottling",
-        "Skaven Clanrat",
-        "Skaven Thrower",
-        "Gutter Runner",
-        "Skaven Blitzer",
-        "Underworld Troll",
-        "Mutant Rat Ogre"
-    ],
-    "Vampire": [
-        "Thrall Lineman",
-        "Vampire Runner",
-        "Vampire Thrower",
-        "Vampire Blitzer",
-        "Vargheist"
-    ],
-    "Wood Elf": [
-        "Wood Elf Lineman",
-        "Thrower",
-        "Catcher",
-        "Wardancer",
-        "Loren Forest Treeman"
-    ]
-    # Add positions for other races
-}
+# --- Sprite Atlas ---
+@st.cache_resource
+def load_sprite_atlas(sprites_path):
+    # Scanned and packed once per server process, then shared by every session (restart to pick up new sprites)
+    return sprites.build_atlas(sprites_path)
+
+with timer.section("sprite atlas"):
+    sprite_atlas = load_sprite_atlas(sprites_dir)
 
 # --- Function to gather all the relevant data ---
+@timer.wrap("gather data")
 def gather_all_data():
-    data = {
-        'league_info': st.session_state.league_info,
-        'team_profiles': st.session_state.team_profiles,
-        'player_profiles': st.session_state.player_profiles,
-        'matches': st.session_state.matches,
-        'injuries': st.session_state.injuries,
-        'narratives': st.session_state.narratives,
-        'additional_details': st.session_state.get('additional_details', '')
-    }
-    return data
-
-# --- Function to Validate Filenames ---
-def is_valid_filename(filename):
-    # Allow only alphanumeric characters, underscores, hyphens, spaces, and periods
-    return re.match(r'^[\w\-. ]+$', filename) is not None
+    return league.data(st.session_state.get('additional_details', ''))
 
 # --- Functions to Save and Load Data ---
+# The league's collections, name indexes and storage live in bbreporter/league.py. Collections are stored
+# as a snapshot plus an append-only journal (see bbreporter/journal.py), or in a SQLite database
+# with BBREPORTER_STORAGE=sqlite. These wrappers report invalid "Save As" filenames, and records another
+# session changed first, in the UI.
 def save_data_to_file(data, filename):
-    if not is_valid_filename(filename):
-        st.error("Invalid filename. Use only letters, numbers, underscores, hyphens, spaces, and periods.")
-        return
-
-    file_path = os.path.join(BASE_DATA_DIR, filename)
-    if os.path.exists(file_path):
-        # Append timestamp to filename
-        timestamp = int(time.time())
-        base, ext = os.path.splitext(filename)
-        filename = f"{base}_{timestamp}{ext}"
-        file_path = os.path.join(BASE_DATA_DIR, filename)
-        st.warning(f"File exists. Saving as {filename} instead.")
-
-    with open(file_path, 'w') as f:
-        json.dump(data, f)
-
-def load_data_from_file(filename):
-    file_path = os.path.join(BASE_DATA_DIR, filename)
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-            return data
-    except Exception as e:
-        return None
-
-def save_team_profiles(data, filename='team_profiles.json'):
-    save_data_to_file(data, filename)
-
-def load_team_profiles(filename='team_profiles.json'):
-    data = load_data_from_file(filename)
-    return data if data else []
-
-def save_player_profiles(data, filename='player_profiles.json'):
-    save_data_to_file(data, filename)
+        with timer.section("persistence"):
+            league.save(data, filename)
+    except ValueError as e:
+        st.error(str(e))
+        return False
+    return True
+
+def add_record(collection, record, filename):
+    try:
+        with timer.section("persistence"):
+            league.add(collection, record, export_as=filename)
+    except ValueError as e:
+        st.error(str(e))
 
-def load_player_profiles(filename='player_profiles.json'):
-    data = load_data_from_file(filename)
-    return data if data else []
+def update_record(collection, idx, record, expected=None):
+    try:
+        with timer.section("persistence"):
+            league.update(collection, idx, record, expected=expected)
+    except ValueError as e:
+        st.error(str(e))
+        return False
+    return True
+
+def delete_record(collection, idx, expected=None):
+    try:
+        with timer.section("persistence"):
+            league.delete(collection, idx, expected=expected)
+    except ValueError as e:
+        st.error(str(e))
+        return False
+    return True
+
+def edit_form_open(collection, name):
+    # Edit forms follow the record their button was clicked for, which another session may have moved or replaced
+    if not st.session_state.get(f"show_edit_{name}_form", False):
+        return False
+    idx = league.position(collection, st.session_state.get(f"edit_{name}_record"))
+    if idx is None:
+        st.session_state[f"show_edit_{name}_form"] = False
+        st.warning("The record being edited was changed or deleted in another session.")
+        return False
+    st.session_state[f"edit_{name}_index"] = idx
+    return True
+
+def add_records(collection, records):
+    try:
+        with timer.section("persistence"):
+            league.add_many(collection, records)
+    except ValueError as e:
+        st.error(str(e))
+
+# --- Match Events ---
+# Structured events update the named players' stats when a match is saved (see bbreporter/events.py)
+PLAYER_EVENTS_HELP = ("One event per line, e.g. 'TD: Grak Ironhide'. Types: TD (touchdown), INT (interception), "
+                      "CAS (casualty caused), MVP. Players must be on Team A or Team B.")
+
+# --- Type-ahead Pickers ---
+# The form selectboxes only get the best few names from the League's fuzzy matchers (bbreporter/fuzzy.py);
+# the "Find" boxes sit outside the forms so typing narrows the options right away
+PICKER_SIZE = 20
+
+def name_options(collection, label, key, keep=None):
+    query = st.text_input(f"Find {label}", key=key, placeholder="Type part of a name; typos are fine")
+    options = league.matcher(collection).matches(query, PICKER_SIZE, keep=keep)
+    if query.strip() and not options:
+        st.caption(f"No {label.lower()} matches '{query}'.")
+        options = league.matcher(collection).matches('', PICKER_SIZE, keep=keep)
+    return options
+
+def option_index(options, value):
+    return options.index(value) if value in options else 0
+
+# --- Paginated Lists ---
+PAGE_SIZES = [10, 25, 50, 100]
+
+def show_page(entries, key):
+    # Only the entries on the selected page get widgets built for them
+    page_size = st.session_state.get(f"{key}_page_size", PAGE_SIZES[0])
+    page_entries, page, page_count = paging.paginate(entries, st.session_state.get(f"{key}_page", 1), page_size)
+    st.session_state[f"{key}_page"] = page  # Keep the stored page valid when the list shrinks
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        st.number_input("Page", min_value=1, max_value=page_count, step=1, key=f"{key}_page")
+    with col2:
+        st.selectbox("Per Page", options=PAGE_SIZES, key=f"{key}_page_size")
+    with col3:
+        st.caption(f"Page {page} of {page_count} ({len(entries)} matching)")
+    return page_entries
+
+# --- Bulk Import ---
+def show_bulk_import(collection, filename, validate, key):
+    # validate(importer, frame) is passed the bbreporter.bulk_import module, imported here so pandas loads on first use
+    uploaded_file = st.file_uploader("Upload CSV or JSON", type=["csv", "json"], key=f"{key}_upload")
+    if uploaded_file is not None and st.button("Import", key=f"{key}_button"):
+        from bbreporter import bulk_import
+        try:
+            frame = bulk_import.read_upload(uploaded_file, collection)
+        except ValueError as e:
+            st.error(f"Could not read the file: {e}")
+            return
+        records, errors = validate(bulk_import, frame)
+        if records:
+            add_records(collection, records)
+            st.success(f"Imported {len(records)} rows into `{filename}`.")
+        if not errors.empty:
+            st.warning(f"{errors['Row'].nunique()} rows were skipped:")
+            st.dataframe(errors, hide_index=True)
+
+def team_races():
+    return {team['team_name']: team['team_race'] for team in st.session_state.team_profiles}
 
 # --- Initialize Session State ---
+# One League per server process, shared by every session, so a change made in one tab is seen by all of them
+@st.cache_resource
+def shared_league(data_dir):
+    return League(data_dir)
+
+with timer.section("load league"):
+    league = shared_league(BASE_DATA_DIR)
+
+# The collections keep their session-state names; they are the League's own lists, changed through it
+for collection in COLLECTION_FILES:
+    if collection not in st.session_state:
+        st.session_state[collection] = league[collection]
 if 'league_info' not in st.session_state:
-    st.session_state.league_info = {}
-if 'matches' not in st.session_state:
-    st.session_state.matches = []
-if 'injuries' not in st.session_state:
-    st.session_state.injuries = []
-if 'narratives' not in st.session_state:
-    st.session_state.narratives = []
-
-# New session states for team and player profiles
-if 'team_profiles' not in st.session_state:
-    st.session_state.team_profiles = load_team_profiles()
-if 'player_profiles' not in st.session_state:
-    st.session_state.player_profiles = load_player_profiles()
+    st.session_state.league_info = league.league_info
+team_index = league.indexes['team_profiles']
+player_index = league.indexes['player_profiles']
 
 # --- Sidebar for Global Settings ---
 st.sidebar.title("Global Settings")
@@ -373,14 +226,39 @@ tone_style = st.sidebar.selectbox("Tone and Style", ["Humorous", "Serious", "Dra
 # Format and Length
 format_length = st.sidebar.text_input("Format and Length", value="Approximately 500 words", key="format_length", help="Specify the format and desired length of the report.")
 
+# Debug
+st.sidebar.subheader("Debug")
+st.sidebar.toggle("Show timings", value=TIMING_DEFAULT, key="debug_timings", help="Time each tab and data operation of every rerun.")
+st.sidebar.checkbox("Append timings to log", key="debug_timings_log", disabled=not timer.enabled, help="Add one JSON line per rerun to timings.jsonl in the data directory.")
+
+# --- Search ---
+# Backed by the League's inverted index (bbreporter/search.py), which follows every add/edit/delete
+SEARCH_LABELS = {
+    'player_profiles': lambda player: f"**Player:** {player['player_name']} ({player['position']}, {player['team_name']})",
+    'team_profiles': lambda team: f"**Team:** {team['team_name']} ({team['team_race']})",
+    'matches': lambda match: f"**Match:** {match['team_a_name']} vs {match['team_b_name']} on {match['match_date']}",
+    'narratives': lambda narrative: f"**Narrative:** {narrative['storyline_title']}",
+}
+search_query = st.text_input("Search", key="search_query", placeholder="Players, teams, matches and narratives",
+                             help="Every word must match; the last one may be the start of a word.")
+if search_query.strip():
+    with timer.section("search"):
+        hits = league.search.search(search_query, limit=20)
+    if hits:
+        st.markdown("\n".join(f"- {SEARCH_LABELS[collection](record)}" for _, collection, record in hits))
+    else:
+        st.caption("No matches.")
+
 # --- Tabs for Navigation ---
+# Switching tabs reruns the script, so the tables and charts of closed tabs are skipped
+# and pandas/plotly are only imported once a tab that shows them is opened
 tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs([
     "League Info", "Team Profiles", "Player Profiles", "Match Reports",
     "Injury Reports", "Narratives", "Generate Prompt", "Help"
-])
+], key="active_tab", on_change="rerun")
 
 # --- League Information ---
-with tab1:
+with tab1, timer.section("League Info"):
     st.header("League Information")
     st.info(f"Data files are saved in: `{BASE_DATA_DIR}`")
 
@@ -401,8 +279,8 @@ with tab1:
                 else:
                     st.session_state.league_info['league_name'] = league_name
                     st.session_state.league_info['league_description'] = league_description
-                    save_data_to_file(st.session_state.league_info, save_filename)
-                    st.success(f"League information saved as `{save_filename}`.")
+                    if save_data_to_file(st.session_state.league_info, save_filename):
+                        st.success(f"League information saved as `{save_filename}`.")
 
     # Load League Info Form
     with st.expander("Load League Information"):
@@ -414,13 +292,13 @@ with tab1:
                 if uploaded_file is not None:
                     loaded_data = json.load(uploaded_file)
                     if loaded_data is not None:
-                        st.session_state.league_info = loaded_data
+                        st.session_state.league_info = league.league_info = loaded_data
                         st.success("League information loaded from file.")
                 else:
                     st.error("Please upload a JSON file.")
 
 # --- Team Profiles ---
-with tab2:
+with tab2, timer.section("Team Profiles"):
     st.header("Team Profiles")
     st.info(f"Data files are saved in: `{BASE_DATA_DIR}`")
 
@@ -445,11 +323,7 @@ with tab2:
                 else:
                     # Save the uploaded logo image
                     if team_logo is not None:
-                        logo_extension = team_logo.type.split('/')[-1]
-                        logo_filename = f"{team_name.strip().replace(' ', '_')}_logo.{logo_extension}"
-                        logo_path = os.path.join(team_logos_dir, logo_filename)
-                        with open(logo_path, 'wb') as f:
-                            f.write(team_logo.getbuffer())
+                        logo_path = images.save_upload(team_logo, team_logos_dir, f"{team_name.strip().replace(' ', '_')}_logo")
                         team_logo_url = logo_path
                     else:
                         team_logo_url = ''
@@ -462,18 +336,27 @@ with tab2:
                         'achievements': achievements.strip(),
                         'team_logo': team_logo_url
                     }
-                    st.session_state.team_profiles.append(team_profile)
-                    save_team_profiles(st.session_state.team_profiles)
+                    add_record('team_profiles', team_profile, 'team_profiles.json')
                     st.success(f"Team profile for '{team_name}' added.")
-                    st.rerun()
+                    rerun()
+
+    with st.expander("Bulk Import Team Profiles"):
+        st.caption("Columns: team_name, team_race, coach_name, team_history, achievements. Rows with errors are skipped.")
+        show_bulk_import('team_profiles', 'team_profiles.json', lambda importer, frame: importer.validate_teams(
+            frame, BLOOD_BOWL_RACES, team_index.names()), "team_import")
 
     # Display existing team profiles
     if st.session_state.team_profiles:
         st.subheader("Existing Team Profiles")
-        for idx, team in enumerate(st.session_state.team_profiles):
+        race_filter = st.selectbox("Filter by Race", options=paging.filter_options(st.session_state.team_profiles, 'team_race'), key="team_filter_race")
+        matching_teams = paging.filter_records(st.session_state.team_profiles, {'team_race': race_filter})
+        for idx, team in show_page(matching_teams, "team_list"):
             st.markdown(f"### {team['team_name']} ({team['team_race']})")
             if team['team_logo']:
-                st.image(team['team_logo'], width=150)
+                with timer.section("thumbnails"):
+                    logo_thumbnail = images.thumbnail_bytes(team['team_logo'])
+                if logo_thumbnail:
+                    st.image(logo_thumbnail, width=150)
             st.write(f"**Coach:** {team['coach_name']}")
             st.write(f"**History:** {team['team_history']}")
             st.write(f"**Achievements:** {team['achievements']}")
@@ -481,27 +364,27 @@ with tab2:
             # Edit and Delete Buttons
             col1, col2 = st.columns(2)
             with col1:
-                if st.button(f"Edit Team {idx + 1}", key=f"edit_team_{idx}"):
+                if st.button(f"Edit Team {idx + 1}", key=f"edit_team_{id(team)}"):
                     st.session_state.edit_team_index = idx
+                    st.session_state.edit_team_record = team
                     st.session_state.show_edit_team_form = True
-                    st.rerun()
+                    rerun()
             with col2:
-                if st.button(f"Delete Team {idx + 1}", key=f"delete_team_{idx}"):
-                    confirm_delete = st.checkbox(f"Confirm delete Team {idx + 1}", key=f"confirm_delete_team_{idx}")
+                if st.button(f"Delete Team {idx + 1}", key=f"delete_team_{id(team)}"):
+                    confirm_delete = st.checkbox(f"Confirm delete Team {idx + 1}", key=f"confirm_delete_team_{id(team)}")
                     if confirm_delete:
-                        st.session_state.team_profiles.pop(idx)
-                        save_team_profiles(st.session_state.team_profiles)
-                        st.success(f"Team '{team['team_name']}' deleted.")
-                        st.rerun()
+                        if delete_record('team_profiles', idx, expected=team):
+                            st.success(f"Team '{team['team_name']}' deleted.")
+                            rerun()
 
     # Edit Team Form
-    if st.session_state.get('show_edit_team_form', False):
+    if edit_form_open('team_profiles', 'team'):
         idx = st.session_state.edit_team_index
         team = st.session_state.team_profiles[idx]
         st.subheader(f"Edit Team '{team['team_name']}'")
         with st.form("edit_team_form"):
             team_name = st.text_input("Team Name", value=team['team_name'])
-            team_race = st.selectbox("Team Race", options=BLOOD_BOWL_RACES, index=BLOOD_BOWL_RACES.index(team['team_race']))
+            team_race = st.selectbox("Team Race", options=BLOOD_BOWL_RACES, index=RACE_INDEX.get(team['team_race'], 0))
             coach_name = st.text_input("Coach Name", value=team['coach_name'])
             team_history = st.text_area("Team History", value=team['team_history'])
             achievements = st.text_area("Achievements", value=team['achievements'])
@@ -511,11 +394,7 @@ with tab2:
             if submit_edit_team:
                 # Save the uploaded logo image if provided
                 if team_logo is not None:
-                    logo_extension = team_logo.type.split('/')[-1]
-                    logo_filename = f"{team_name.strip().replace(' ', '_')}_logo.{logo_extension}"
-                    logo_path = os.path.join(team_logos_dir, logo_filename)
-                    with open(logo_path, 'wb') as f:
-                        f.write(team_logo.getbuffer())
+                    logo_path = images.save_upload(team_logo, team_logos_dir, f"{team_name.strip().replace(' ', '_')}_logo")
                     team_logo_url = logo_path
                 else:
                     team_logo_url = team['team_logo']  # Keep existing logo
@@ -528,26 +407,25 @@ with tab2:
                     'achievements': achievements.strip(),
                     'team_logo': team_logo_url
                 }
-                st.session_state.team_profiles[idx] = updated_team
-                save_team_profiles(st.session_state.team_profiles)
-                st.success(f"Team '{team_name}' updated.")
-                st.session_state.show_edit_team_form = False
-                st.rerun()
+                if update_record('team_profiles', idx, updated_team, expected=team):
+                    st.success(f"Team '{team_name}' updated.")
+                    st.session_state.show_edit_team_form = False
+                    rerun()
 
 # --- Player Profiles ---
-with tab3:
+with tab3, timer.section("Player Profiles"):
     st.header("Player Profiles")
     st.info(f"Data files are saved in: `{BASE_DATA_DIR}`")
 
     # Add New Player Profile
     with st.expander("Add New Player Profile", expanded=True):
+        team_names = name_options('team_profiles', "Team", "player_team_query")
         with st.form("player_profile_form"):
             player_name = st.text_input("Player Name", help="Enter the player's name.")
-            team_names = [team['team_name'] for team in st.session_state.team_profiles]
             if team_names:
                 team_name = st.selectbox("Team Name", options=team_names, help="Select the player's team.")
                 # Retrieve the race of the selected team
-                team_race = next((team['team_race'] for team in st.session_state.team_profiles if team['team_name'] == team_name), None)
+                team_race = team_index.field_of(team_name, 'team_race', None)
                 if team_race and team_race in RACE_POSITIONS:
                     positions = RACE_POSITIONS[team_race]
                     position = st.selectbox("Position", options=positions, help="Select the player's position.")
@@ -586,11 +464,7 @@ with tab3:
                 else:
                     # Save the uploaded player photo
                     if player_photo is not None:
-                        photo_extension = player_photo.type.split('/')[-1]
-                        photo_filename = f"{player_name.strip().replace(' ', '_')}_photo.{photo_extension}"
-                        photo_path = os.path.join(player_photos_dir, photo_filename)
-                        with open(photo_path, 'wb') as f:
-                            f.write(player_photo.getbuffer())
+                        photo_path = images.save_upload(player_photo, player_photos_dir, f"{player_name.strip().replace(' ', '_')}_photo")
                         player_photo_url = photo_path
                     else:
                         player_photo_url = ''
@@ -611,27 +485,71 @@ with tab3:
                             'mvp_awards': mvp_awards
                         }
                     }
-                    st.session_state.player_profiles.append(player_profile)
-                    save_player_profiles(st.session_state.player_profiles)
+                    add_record('player_profiles', player_profile, 'player_profiles.json')
                     st.success(f"Player profile for '{player_name}' added.")
-                    st.rerun()
+                    rerun()
+
+    with st.expander("Bulk Import Player Profiles"):
+        st.caption("Columns: player_name, team_name, position, bio, career_highlights, matches_played, touchdowns, "
+                   "interceptions, injuries_caused, mvp_awards. Teams must already exist; rows with errors are skipped.")
+        show_bulk_import('player_profiles', 'player_profiles.json', lambda importer, frame: importer.validate_players(
+            frame, team_races(), RACE_POSITIONS,
+            [(player['team_name'], player['player_name']) for player in st.session_state.player_profiles]), "player_import")
 
     # Display existing player profiles
     if st.session_state.player_profiles:
+        # Vectorized over the League's columnar stats (bbreporter/stats_store.py), which load NumPy, so
+        # they are only built once the expander is opened
+        with st.expander("League Leaders", key="leaders_expander", on_change="rerun") as leaders:
+            if leaders.open:
+                leader_stat = st.selectbox("Statistic", options=STAT_FIELDS, index=1,
+                                           format_func=lambda stat: stat.replace('_', ' ').title(), key="leader_stat")
+                col1, col2 = st.columns(2)
+                with col1, timer.section("leaders"):
+                    column = league.stats.column(leader_stat)
+                    rows = [f"| {rank} | {st.session_state.player_profiles[idx]['player_name']} | "
+                            f"{st.session_state.player_profiles[idx]['team_name']} | {column[idx]} |"
+                            for rank, idx in enumerate(league.stats.top(leader_stat, 10), start=1)]
+                    st.markdown("\n".join(["| # | Player | Team | Total |", "|---|---|---|---|"] + rows))
+                with col2, timer.section("team totals"):
+                    totals = sorted(league.stats.team_totals(leader_stat).items(), key=lambda item: -item[1])
+                    rows = [f"| {team_name} | {total} |" for team_name, total in totals[:10]]
+                    st.markdown("\n".join(["| Team | Total |", "|---|---|"] + rows))
+
         st.subheader("Existing Player Profiles")
-        for idx, player in enumerate(st.session_state.player_profiles):
+        players = st.session_state.player_profiles
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            team_filter = st.selectbox("Filter by Team", options=paging.filter_options(players, 'team_name'), key="player_filter_team")
+        with col2:
+            race_filter = st.selectbox("Filter by Race", options=paging.filter_options(players, 'team_race'), key="player_filter_race")
+        with col3:
+            position_filter = st.selectbox("Filter by Position", options=paging.filter_options(players, 'position'), key="player_filter_position")
+        if team_filter != paging.ALL:
+            # Start from the team's roster in the index instead of scanning every player
+            matching_players = [
+                (idx, player) for idx, player in player_index.group_entries(team_filter)
+                if race_filter in (paging.ALL, player.get('team_race')) and position_filter in (paging.ALL, player.get('position'))
+            ]
+        else:
+            matching_players = paging.filter_records(players, {'team_race': race_filter, 'position': position_filter})
+        for idx, player in show_page(matching_players, "player_list"):
             st.markdown(f"### {player['player_name']} ({player['position']})")
             col1, col2 = st.columns([1, 3])
             with col1:
                 # Display player photo if available
                 if player['player_photo']:
-                    st.image(player['player_photo'], width=150, caption="Player Photo")
+                    with timer.section("thumbnails"):
+                        photo_thumbnail = images.thumbnail_bytes(player['player_photo'])
+                    if photo_thumbnail:
+                        st.image(photo_thumbnail, width=150, caption="Player Photo")
                 # Display sprite representation
-                sprite_path = os.path.join(sprites_dir, player['team_race'], f"{player['position']}.png")
-                if os.path.exists(sprite_path):
-                    st.image(sprite_path, width=28)
+                with timer.section("sprite lookups"):
+                    sprite = sprite_atlas.sprite_bytes(player.get('team_race', ''), player['position'])
+                if sprite:
+                    st.image(sprite, width=28)
                 else:
-                    st.warning("Sprite not found for this player.")
+                    st.image(sprite_atlas.placeholder, width=28, caption="No sprite")
             with col2:
                 st.write(f"**Team:** {player['team_name']}")
                 st.write(f"**Bio:** {player['bio']}")
@@ -646,37 +564,34 @@ with tab3:
             # Edit and Delete Buttons
             col1, col2 = st.columns(2)
             with col1:
-                if st.button(f"Edit Player {idx + 1}", key=f"edit_player_profile_{idx}"):
+                if st.button(f"Edit Player {idx + 1}", key=f"edit_player_profile_{id(player)}"):
                     st.session_state.edit_player_profile_index = idx
+                    st.session_state.edit_player_profile_record = player
                     st.session_state.show_edit_player_profile_form = True
-                    st.rerun()
+                    rerun()
             with col2:
-                if st.button(f"Delete Player {idx + 1}", key=f"delete_player_profile_{idx}"):
-                    confirm_delete = st.checkbox(f"Confirm delete Player {idx + 1}", key=f"confirm_delete_player_profile_{idx}")
+                if st.button(f"Delete Player {idx + 1}", key=f"delete_player_profile_{id(player)}"):
+                    confirm_delete = st.checkbox(f"Confirm delete Player {idx + 1}", key=f"confirm_delete_player_profile_{id(player)}")
                     if confirm_delete:
-                        st.session_state.player_profiles.pop(idx)
-                        save_player_profiles(st.session_state.player_profiles)
-                        st.success(f"Player '{player['player_name']}' deleted.")
-                        st.rerun()
+                        if delete_record('player_profiles', idx, expected=player):
+                            st.success(f"Player '{player['player_name']}' deleted.")
+                            rerun()
 
     # Edit Player Profile Form
-    if st.session_state.get('show_edit_player_profile_form', False):
+    if edit_form_open('player_profiles', 'player_profile'):
         idx = st.session_state.edit_player_profile_index
         player = st.session_state.player_profiles[idx]
         st.subheader(f"Edit Player '{player['player_name']}'")
+        team_names = name_options('team_profiles', "Team", "edit_player_team_query", keep=player['team_name'])
         with st.form("edit_player_profile_form"):
             player_name = st.text_input("Player Name", value=player['player_name'])
-            team_names = [team['team_name'] for team in st.session_state.team_profiles]
             if team_names:
-                team_name = st.selectbox("Team Name", options=team_names, index=team_names.index(player['team_name']))
+                team_name = st.selectbox("Team Name", options=team_names, index=option_index(team_names, player['team_name']))
                 # Retrieve the race of the selected team
-                team_race = next((team['team_race'] for team in st.session_state.team_profiles if team['team_name'] == team_name), None)
+                team_race = team_index.field_of(team_name, 'team_race', None)
                 if team_race and team_race in RACE_POSITIONS:
                     positions = RACE_POSITIONS[team_race]
-                    if player['position'] in positions:
-                        position_index = positions.index(player['position'])
-                    else:
-                        position_index = 0
+                    position_index = POSITION_INDEX[team_race].get(player['position'], 0)
                     position = st.selectbox("Position", options=positions, index=position_index, help="Select the player's position.")
                 else:
                     st.error("Positions not available for this team's race.")
@@ -702,11 +617,7 @@ with tab3:
             if submit_edit_player:
                 # Save the uploaded player photo if provided
                 if player_photo is not None:
-                    photo_extension = player_photo.type.split('/')[-1]
-                    photo_filename = f"{player_name.strip().replace(' ', '_')}_photo.{photo_extension}"
-                    photo_path = os.path.join(player_photos_dir, photo_filename)
-                    with open(photo_path, 'wb') as f:
-                        f.write(player_photo.getbuffer())
+                    photo_path = images.save_upload(player_photo, player_photos_dir, f"{player_name.strip().replace(' ', '_')}_photo")
                     player_photo_url = photo_path
                 else:
                     player_photo_url = player['player_photo']  # Keep existing photo
@@ -727,40 +638,44 @@ with tab3:
                         'mvp_awards': mvp_awards
                     }
                 }
-                st.session_state.player_profiles[idx] = updated_player
-                save_player_profiles(st.session_state.player_profiles)
-                st.success(f"Player '{player_name}' updated.")
-                st.session_state.show_edit_player_profile_form = False
-                st.rerun()
+                if update_record('player_profiles', idx, updated_player, expected=player):
+                    st.success(f"Player '{player_name}' updated.")
+                    st.session_state.show_edit_player_profile_form = False
+                    rerun()
 
 # --- Match Reports ---
-with tab4:
+with tab4, timer.section("Match Reports"):
     st.header("Match Reports")
     st.info(f"Data files are saved in: `{BASE_DATA_DIR}`")
 
     # Add New Match Report
     with st.expander("Add New Match Report", expanded=True):
+        col1, col2 = st.columns(2)
+        with col1:
+            team_a_names = name_options('team_profiles', "Team A", "match_team_a_query")
+        with col2:
+            team_b_names = name_options('team_profiles', "Team B", "match_team_b_query")
         with st.form("match_report_form"):
             match_date = st.date_input("Match Date", value=datetime.today(), help="Select the match date.")
-            team_names = [team['team_name'] for team in st.session_state.team_profiles]
             col1, col2 = st.columns(2)
             with col1:
-                if team_names:
-                    team_a_name = st.selectbox("Team A Name", options=team_names, help="Select Team A.")
+                if team_a_names:
+                    team_a_name = st.selectbox("Team A Name", options=team_a_names, help="Select Team A.")
                 else:
                     st.warning("No teams available. Please add a team first.")
                     team_a_name = ''
                 # team_a_race = st.text_input("Team A Race", help="Enter the race of Team A.")
             with col2:
-                if team_names:
-                    team_b_name = st.selectbox("Team B Name", options=team_names, help="Select Team B.")
+                if team_b_names:
+                    team_b_name = st.selectbox("Team B Name", options=team_b_names, help="Select Team B.")
                 else:
                     st.warning("No teams available. Please add a team first.")
                     team_b_name = ''
                 # team_b_race = st.text_input("Team B Race", help="Enter the race of Team B.")
             final_score = st.text_input("Final Score", help="E.g., '2-1 to Team A'")
             key_events = st.text_area("Key Events", help="List significant events such as touchdowns, injuries.")
-            save_filename = st.text_input("Save As", value="matches.json", help="Filename for saving the match report.")
+            player_events = st.text_area("Player Events", help=PLAYER_EVENTS_HELP)
+            save_filename = st.text_input("Save As", value="matches.json", help="Reports are always kept in matches.json; another name also writes a full copy there.")
             submit_match = st.form_submit_button("Add Match Report")
 
             if submit_match:
@@ -771,13 +686,16 @@ with tab4:
                     errors.append("Team B Name is required.")
                 if not final_score.strip():
                     errors.append("Final Score is required.")
+                parsed_events, event_errors = events.parse_events(player_events)
+                match_events, resolve_errors = events.resolve_events(parsed_events, player_index, team_a_name, team_b_name)
+                errors += event_errors + resolve_errors
                 if errors:
                     for error in errors:
                         st.error(error)
                 else:
                     # Get team races from profiles
-                    team_a_race = next((team['team_race'] for team in st.session_state.team_profiles if team['team_name'] == team_a_name), '')
-                    team_b_race = next((team['team_race'] for team in st.session_state.team_profiles if team['team_name'] == team_b_name), '')
+                    team_a_race = team_index.field_of(team_a_name, 'team_race')
+                    team_b_race = team_index.field_of(team_b_name, 'team_race')
 
                     match = {
                         'match_date': match_date.strftime('%B %d, %Y'),
@@ -786,67 +704,99 @@ with tab4:
                         'team_b_name': team_b_name.strip(),
                         'team_b_race': team_b_race.strip(),
                         'final_score': final_score.strip(),
-                        'key_events': key_events.strip()
+                        'key_events': key_events.strip(),
+                        # Counted into the player stats by League.add
+                        'events': match_events,
+                        'participants': events.participants(player_index, team_a_name, team_b_name)
                     }
-                    st.session_state.matches.append(match)
-                    save_data_to_file(st.session_state.matches, save_filename)
+                    match.update(scores.score_fields(match))
+                    add_record('matches', match, save_filename)
                     st.success(f"Match report added and saved as `{save_filename}`.")
-                    st.rerun()
+                    rerun()
+
+    with st.expander("Bulk Import Match Reports"):
+        st.caption("Columns: match_date, team_a_name, team_b_name, final_score, key_events. Teams must already exist; "
+                   "rows with errors are skipped.")
+        show_bulk_import('matches', 'matches.json', lambda importer, frame: importer.validate_matches(frame, team_races()), "match_import")
 
     # Display existing match reports
     if st.session_state.matches:
         st.subheader("Existing Match Reports")
-        matches_df = pd.DataFrame(st.session_state.matches)
-        st.dataframe(matches_df)
-
-        # Visualization of match outcomes
-        if 'final_score' in matches_df.columns:
-            fig = px.histogram(matches_df, x='final_score', title='Match Outcomes')
-            st.plotly_chart(fig)
+        if tab4.open:
+            with timer.section("imports"):
+                from bbreporter import charts
+                from bbreporter.standings import compute_standings
+
+            with timer.section("DataFrame"):
+                matches_df = league.frame('matches')
+            st.dataframe(matches_df)
+
+            # Visualization of match outcomes, one bar per scoreline (bbreporter/charts.py)
+            with timer.section("chart"):
+                fig = charts.figure('matches', st.session_state.matches, league.versions['matches'])
+                if fig:
+                    st.plotly_chart(fig)
+
+            # League standings from the parsed scores
+            st.subheader("League Standings")
+            with timer.section("standings"):
+                standings_table = compute_standings(st.session_state.matches, team_index.names(), league.versions['matches'])
+            st.dataframe(standings_table, hide_index=True)
 
         # Edit and Delete Options
-        for idx, match in enumerate(st.session_state.matches):
+        team_filter = st.selectbox("Filter by Team", options=paging.filter_options(st.session_state.matches, 'team_a_name', 'team_b_name'), key="match_filter_team")
+        matching_matches = paging.filter_records(st.session_state.matches, {('team_a_name', 'team_b_name'): team_filter})
+        for idx, match in show_page(matching_matches, "match_list"):
             st.markdown(f"**Match {idx + 1}:** {match['team_a_name']} vs {match['team_b_name']} on {match['match_date']}")
             st.write(f"Final Score: {match['final_score']}")
             st.write(f"Key Events: {match['key_events']}")
+            if match.get('events'):
+                st.write("Player Events: " + ", ".join(f"{event['type']} {event['player_name']}" for event in match['events']))
 
             # Edit and Delete Buttons
             col1, col2 = st.columns(2)
             with col1:
-                if st.button(f"Edit Match {idx + 1}", key=f"edit_match_{idx}"):
+                if st.button(f"Edit Match {idx + 1}", key=f"edit_match_{id(match)}"):
                     st.session_state.edit_match_index = idx
+                    st.session_state.edit_match_record = match
                     st.session_state.show_edit_match_form = True
-                    st.rerun()
+                    rerun()
             with col2:
-                if st.button(f"Delete Match {idx + 1}", key=f"delete_match_{idx}"):
-                    confirm_delete = st.checkbox(f"Confirm delete Match {idx + 1}", key=f"confirm_delete_match_{idx}")
+                if st.button(f"Delete Match {idx + 1}", key=f"delete_match_{id(match)}"):
+                    confirm_delete = st.checkbox(f"Confirm delete Match {idx + 1}", key=f"confirm_delete_match_{id(match)}")
                     if confirm_delete:
-                        st.session_state.matches.pop(idx)
-                        save_data_to_file(st.session_state.matches, save_filename)
-                        st.success(f"Match {idx + 1} deleted.")
-                        st.rerun()
+                        if delete_record('matches', idx, expected=match):
+                            st.success(f"Match {idx + 1} deleted.")
+                            rerun()
 
         # Edit Match Form
-        if st.session_state.get('show_edit_match_form', False):
+        if edit_form_open('matches', 'match'):
             idx = st.session_state.edit_match_index
             match = st.session_state.matches[idx]
             st.subheader(f"Edit Match {idx + 1}")
+            col1, col2 = st.columns(2)
+            with col1:
+                team_a_names = name_options('team_profiles', "Team A", "edit_match_team_a_query", keep=match['team_a_name'])
+            with col2:
+                team_b_names = name_options('team_profiles', "Team B", "edit_match_team_b_query", keep=match['team_b_name'])
             with st.form("edit_match_form"):
                 match_date = st.date_input("Match Date", value=datetime.strptime(match['match_date'], '%B %d, %Y'))
-                team_names = [team['team_name'] for team in st.session_state.team_profiles]
                 col1, col2 = st.columns(2)
                 with col1:
-                    team_a_name = st.selectbox("Team A Name", options=team_names, index=team_names.index(match['team_a_name']))
+                    team_a_name = st.selectbox("Team A Name", options=team_a_names, index=option_index(team_a_names, match['team_a_name']))
                 with col2:
-                    team_b_name = st.selectbox("Team B Name", options=team_names, index=team_names.index(match['team_b_name']))
+                    team_b_name = st.selectbox("Team B Name", options=team_b_names, index=option_index(team_b_names, match['team_b_name']))
                 final_score = st.text_input("Final Score", value=match['final_score'])
                 key_events = st.text_area("Key Events", value=match['key_events'])
+                player_events = st.text_area("Player Events", value=events.format_events(match.get('events')), help=PLAYER_EVENTS_HELP)
                 submit_edit_match = st.form_submit_button("Update Match Report")
 
                 if submit_edit_match:
+                    parsed_events, event_errors = events.parse_events(player_events)
+                    match_events, resolve_errors = events.resolve_events(parsed_events, player_index, team_a_name, team_b_name)
                     # Get team races from profiles
-                    team_a_race = next((team['team_race'] for team in st.session_state.team_profiles if team['team_name'] == team_a_name), '')
-                    team_b_race = next((team['team_race'] for team in st.session_state.team_profiles if team['team_name'] == team_b_name), '')
+                    team_a_race = team_index.field_of(team_a_name, 'team_race')
+                    team_b_race = team_index.field_of(team_b_name, 'team_race')
 
                     updated_match = {
                         'match_date': match_date.strftime('%B %d, %Y'),
@@ -855,34 +805,43 @@ with tab4:
                         'team_b_name': team_b_name.strip(),
                         'team_b_race': team_b_race.strip(),
                         'final_score': final_score.strip(),
-                        'key_events': key_events.strip()
+                        'key_events': key_events.strip(),
+                        'events': match_events
                     }
-                    st.session_state.matches[idx] = updated_match
-                    save_data_to_file(st.session_state.matches, save_filename)
-                    st.success(f"Match {idx + 1} updated.")
-                    st.session_state.show_edit_match_form = False
-                    st.rerun()
+                    if 'participants' in match:
+                        # Same teams keep the rosters the match was recorded with; older reports stay without
+                        same_teams = (match['team_a_name'], match['team_b_name']) == (team_a_name, team_b_name)
+                        updated_match['participants'] = match['participants'] if same_teams else events.participants(player_index, team_a_name, team_b_name)
+                    updated_match.update(scores.score_fields(updated_match))
+                    if event_errors or resolve_errors:
+                        for error in event_errors + resolve_errors:
+                            st.error(error)
+                    else:
+                        if update_record('matches', idx, updated_match, expected=match):
+                            st.success(f"Match {idx + 1} updated.")
+                            st.session_state.show_edit_match_form = False
+                            rerun()
 
 # --- Injury Reports ---
-with tab5:
+with tab5, timer.section("Injury Reports"):
     st.header("Injury Reports")
     st.info(f"Data files are saved in: `{BASE_DATA_DIR}`")
 
     # Add New Injury Report
     with st.expander("Add New Injury Report", expanded=True):
+        player_names = name_options('player_profiles', "Player", "injury_player_query")
         with st.form("injury_report_form"):
-            player_names = [player['player_name'] for player in st.session_state.player_profiles]
             if player_names:
                 injured_player_name = st.selectbox("Player Name", options=player_names, help="Select the name of the injured player.")
             else:
                 st.warning("No players available. Please add a player first.")
                 injured_player_name = ''
-            team_name = next((player['team_name'] for player in st.session_state.player_profiles if player['player_name'] == injured_player_name), '')
+            team_name = player_index.field_of(injured_player_name, 'team_name')
             injury_type = st.text_input("Injury Type", help="Describe the type of injury.")
             injury_description = st.text_area("Injury Description", help="Provide details about the injury.")
             time_out = st.text_input("Time Out", help="E.g., '2 weeks', 'Rest of the season'")
             expected_return = st.text_input("Expected Return", help="E.g., 'Next match', 'Playoffs'")
-            save_filename = st.text_input("Save As", value="injuries.json", help="Filename for saving injury reports.")
+            save_filename = st.text_input("Save As", value="injuries.json", help="Reports are always kept in injuries.json; another name also writes a full copy there.")
             submit_injury = st.form_submit_button("Add Injury Report")
 
             if submit_injury:
@@ -903,24 +862,31 @@ with tab5:
                         'time_out': time_out.strip(),
                         'expected_return': expected_return.strip()
                     }
-                    st.session_state.injuries.append(injury)
-                    save_data_to_file(st.session_state.injuries, save_filename)
+                    add_record('injuries', injury, save_filename)
                     st.success(f"Injury report added and saved as `{save_filename}`.")
-                    st.rerun()
+                    rerun()
 
     # Display existing injury reports
     if st.session_state.injuries:
         st.subheader("Existing Injury Reports")
-        injuries_df = pd.DataFrame(st.session_state.injuries)
-        st.dataframe(injuries_df)
+        if tab5.open:
+            with timer.section("imports"):
+                from bbreporter import charts
+
+            with timer.section("DataFrame"):
+                injuries_df = league.frame('injuries')
+            st.dataframe(injuries_df)
 
-        # Visualization of injury types
-        if 'injury_type' in injuries_df.columns:
-            fig = px.bar(injuries_df, x='player_name', y='injury_type', color='team_name', title='Injuries by Player')
-            st.plotly_chart(fig)
+            # Visualization of injury types per team
+            with timer.section("chart"):
+                fig = charts.figure('injuries', st.session_state.injuries, league.versions['injuries'])
+                if fig:
+                    st.plotly_chart(fig)
 
         # Edit and Delete Options
-        for idx, injury in enumerate(st.session_state.injuries):
+        team_filter = st.selectbox("Filter by Team", options=paging.filter_options(st.session_state.injuries, 'team_name'), key="injury_filter_team")
+        matching_injuries = paging.filter_records(st.session_state.injuries, {'team_name': team_filter})
+        for idx, injury in show_page(matching_injuries, "injury_list"):
             st.markdown(f"**Injury {idx + 1}:** {injury['player_name']} from {injury['team_name']}")
             st.write(f"Injury Type: {injury['injury_type']}")
             st.write(f"Description: {injury['injury_description']}")
@@ -929,28 +895,28 @@ with tab5:
             # Edit and Delete Buttons
             col1, col2 = st.columns(2)
             with col1:
-                if st.button(f"Edit Injury {idx + 1}", key=f"edit_injury_{idx}"):
+                if st.button(f"Edit Injury {idx + 1}", key=f"edit_injury_{id(injury)}"):
                     st.session_state.edit_injury_index = idx
+                    st.session_state.edit_injury_record = injury
                     st.session_state.show_edit_injury_form = True
-                    st.rerun()
+                    rerun()
             with col2:
-                if st.button(f"Delete Injury {idx + 1}", key=f"delete_injury_{idx}"):
-                    confirm_delete = st.checkbox(f"Confirm delete Injury {idx + 1}", key=f"confirm_delete_injury_{idx}")
+                if st.button(f"Delete Injury {idx + 1}", key=f"delete_injury_{id(injury)}"):
+                    confirm_delete = st.checkbox(f"Confirm delete Injury {idx + 1}", key=f"confirm_delete_injury_{id(injury)}")
                     if confirm_delete:
-                        st.session_state.injuries.pop(idx)
-                        save_data_to_file(st.session_state.injuries, save_filename)
-                        st.success(f"Injury {idx + 1} deleted.")
-                        st.rerun()
+                        if delete_record('injuries', idx, expected=injury):
+                            st.success(f"Injury {idx + 1} deleted.")
+                            rerun()
 
         # Edit Injury Form
-        if st.session_state.get('show_edit_injury_form', False):
+        if edit_form_open('injuries', 'injury'):
             idx = st.session_state.edit_injury_index
             injury = st.session_state.injuries[idx]
             st.subheader(f"Edit Injury {idx + 1}")
+            player_names = name_options('player_profiles', "Player", "edit_injury_player_query", keep=injury['player_name'])
             with st.form("edit_injury_form"):
-                player_names = [player['player_name'] for player in st.session_state.player_profiles]
-                injured_player_name = st.selectbox("Player Name", options=player_names, index=player_names.index(injury['player_name']))
-                team_name = next((player['team_name'] for player in st.session_state.player_profiles if player['player_name'] == injured_player_name), '')
+                injured_player_name = st.selectbox("Player Name", options=player_names, index=option_index(player_names, injury['player_name']))
+                team_name = player_index.field_of(injured_player_name, 'team_name')
                 injury_type = st.text_input("Injury Type", value=injury['injury_type'])
                 injury_description = st.text_area("Injury Description", value=injury['injury_description'])
                 time_out = st.text_input("Time Out", value=injury['time_out'])
@@ -966,14 +932,13 @@ with tab5:
                         'time_out': time_out.strip(),
                         'expected_return': expected_return.strip()
                     }
-                    st.session_state.injuries[idx] = updated_injury
-                    save_data_to_file(st.session_state.injuries, save_filename)
-                    st.success(f"Injury {idx + 1} updated.")
-                    st.session_state.show_edit_injury_form = False
-                    st.rerun()
+                    if update_record('injuries', idx, updated_injury, expected=injury):
+                        st.success(f"Injury {idx + 1} updated.")
+                        st.session_state.show_edit_injury_form = False
+                        rerun()
 
 # --- Narratives and Lore ---
-with tab6:
+with tab6, timer.section("Narratives"):
     st.header("Narratives and Lore")
     st.info(f"Data files are saved in: `{BASE_DATA_DIR}`")
 
@@ -984,7 +949,7 @@ with tab6:
             description = st.text_area("Description", help="Provide a description of the narrative.")
             teams_or_players_involved = st.text_input("Teams/Players Involved", help="List the teams or players involved.")
             recent_developments = st.text_area("Recent Developments", help="Describe any recent developments in the storyline.")
-            save_filename = st.text_input("Save As", value="narratives.json", help="Filename for saving narratives.")
+            save_filename = st.text_input("Save As", value="narratives.json", help="Narratives are always kept in narratives.json; another name also writes a full copy there.")
             submit_narrative = st.form_submit_button("Add Narrative")
 
             if submit_narrative:
@@ -1001,25 +966,31 @@ with tab6:
                         'teams_or_players_involved': teams_or_players_involved.strip(),
                         'recent_developments': recent_developments.strip()
                     }
-                    st.session_state.narratives.append(narrative)
-                    save_data_to_file(st.session_state.narratives, save_filename)
+                    add_record('narratives', narrative, save_filename)
                     st.success(f"Narrative added and saved as `{save_filename}`.")
-                    st.rerun()
+                    rerun()
 
     # Display existing narratives
     if st.session_state.narratives:
         st.subheader("Existing Narratives")
-        narratives_df = pd.DataFrame(st.session_state.narratives)
-        st.dataframe(narratives_df)
+        if tab6.open:
+            with timer.section("imports"):
+                from bbreporter import charts
 
-        # Visualization of narratives by teams/players
-        if 'teams_or_players_involved' in narratives_df.columns:
-            narratives_df['count'] = 1  # Add a count column for plotting
-            fig = px.bar(narratives_df, x='teams_or_players_involved', y='count', title='Narratives by Teams/Players')
-            st.plotly_chart(fig)
+            with timer.section("DataFrame"):
+                narratives_df = league.frame('narratives')
+            st.dataframe(narratives_df)
+
+            # Visualization of narratives by teams/players
+            with timer.section("chart"):
+                fig = charts.figure('narratives', st.session_state.narratives, league.versions['narratives'])
+                if fig:
+                    st.plotly_chart(fig)
 
         # Edit and Delete Options
-        for idx, narrative in enumerate(st.session_state.narratives):
+        involved_filter = st.selectbox("Filter by Teams/Players Involved", options=paging.filter_options(st.session_state.narratives, 'teams_or_players_involved'), key="narrative_filter_involved")
+        matching_narratives = paging.filter_records(st.session_state.narratives, {'teams_or_players_involved': involved_filter})
+        for idx, narrative in show_page(matching_narratives, "narrative_list"):
             st.markdown(f"**Storyline {idx + 1}:** {narrative['storyline_title']}")
             st.write(f"Description: {narrative['description']}")
             st.write(f"Teams/Players Involved: {narrative['teams_or_players_involved']}")
@@ -1028,21 +999,21 @@ with tab6:
             # Edit and Delete Buttons
             col1, col2 = st.columns(2)
             with col1:
-                if st.button(f"Edit Narrative {idx + 1}", key=f"edit_narrative_{idx}"):
+                if st.button(f"Edit Narrative {idx + 1}", key=f"edit_narrative_{id(narrative)}"):
                     st.session_state.edit_narrative_index = idx
+                    st.session_state.edit_narrative_record = narrative
                     st.session_state.show_edit_narrative_form = True
-                    st.rerun()
+                    rerun()
             with col2:
-                if st.button(f"Delete Narrative {idx + 1}", key=f"delete_narrative_{idx}"):
-                    confirm_delete = st.checkbox(f"Confirm delete Narrative {idx + 1}", key=f"confirm_delete_narrative_{idx}")
+                if st.button(f"Delete Narrative {idx + 1}", key=f"delete_narrative_{id(narrative)}"):
+                    confirm_delete = st.checkbox(f"Confirm delete Narrative {idx + 1}", key=f"confirm_delete_narrative_{id(narrative)}")
                     if confirm_delete:
-                        st.session_state.narratives.pop(idx)
-                        save_data_to_file(st.session_state.narratives, save_filename)
-                        st.success(f"Narrative {idx + 1} deleted.")
-                        st.rerun()
+                        if delete_record('narratives', idx, expected=narrative):
+                            st.success(f"Narrative {idx + 1} deleted.")
+                            rerun()
 
         # Edit Narrative Form
-        if st.session_state.get('show_edit_narrative_form', False):
+        if edit_form_open('narratives', 'narrative'):
             idx = st.session_state.edit_narrative_index
             narrative = st.session_state.narratives[idx]
             st.subheader(f"Edit Narrative {idx + 1}")
@@ -1060,20 +1031,22 @@ with tab6:
                         'teams_or_players_involved': teams_or_players_involved.strip(),
                         'recent_developments': recent_developments.strip()
                     }
-                    st.session_state.narratives[idx] = updated_narrative
-                    save_data_to_file(st.session_state.narratives, save_filename)
-                    st.success(f"Narrative {idx + 1} updated.")
-                    st.session_state.show_edit_narrative_form = False
-                    st.rerun()
+                    if update_record('narratives', idx, updated_narrative, expected=narrative):
+                        st.success(f"Narrative {idx + 1} updated.")
+                        st.session_state.show_edit_narrative_form = False
+                        rerun()
 
 # --- Generate GPT Prompt ---
-with tab7:
+with tab7, timer.section("Generate Prompt"):
     st.header("Generate GPT Prompt")
 
     # Generate Prompt Button
     with st.form("generate_prompt_form"):
         # Additional Details
         additional_details = st.text_area("Additional Details", height=150, key="additional_details", help="Include any specific quotes, interviews, or events to highlight.")
+        include_standings = st.checkbox("Include league standings", key="include_standings", help="Add the current standings table to the prompt.")
+        compact_export = st.checkbox("Compact data file", key="compact_export", help="Write the data JSON without indentation to keep the file small.")
+        compress_export = st.checkbox("Compress data file (gzip)", key="compress_export", help="Download the data JSON as a .json.gz archive.")
 
         generate_prompt = st.form_submit_button("Generate GPT Prompt")
 
@@ -1084,46 +1057,32 @@ with tab7:
             # Formatting Functions
             # ... (existing formatting functions)
 
-            # Compile the GPT prompt (as modified)
-            prompt = f"""
-You are a seasoned sports journalist in the fantastical and brutal world of Blood Bowl. Your task is to write a report for the **{st.session_state.league_info.get('league_name', 'Unknown League')}**. The report should be engaging and entertaining for both players in the league and fans of Blood Bowl in general. Assume the audience does not need an understanding of Blood Bowl mechanics to enjoy the content.
-
-**Instructions:**
-
-- You are provided with a data file named `blood_bowl_data.json` containing all the relevant information about the league, teams, players, matches, injuries, narratives, and additional details.
-- Use the data in this file to craft a comprehensive and engaging report.
-- Focus on storytelling, highlighting key events, player performances, and interesting narratives.
-- Incorporate the tone and style specified.
-
-**Reporter Character:**
+            with timer.section("prompt"):
+                standings = render_section('standings', st.session_state.matches, league.versions['matches']) if include_standings else None
 
-- **Character Name:** {reporter_name}
-- **Character Description:** {reporter_description}
+                # Compile the GPT prompt (see bbreporter/prompt.py)
+                prompt = build_data_file_prompt(st.session_state.league_info, reporter_name, reporter_description,
+                                                tone_style, format_length, standings)
 
-**Tone and Style:** {tone_style}
-
-**Format and Length:** {format_length}
-
----
-
-**Now, please write the report accordingly.**
-"""
             st.subheader("Generated GPT Prompt")
             st.text_area("GPT Prompt", value=prompt.strip(), height=300)
 
             # Gather all data
             data = gather_all_data()
 
-            # Serialize data to JSON
-            data_json = json.dumps(data, indent=4)
+            def data_file():
+                # Serialized only when the button is clicked, streamed section by section (see bbreporter/export.py);
+                # the lock keeps other sessions' changes out of the middle of the file
+                with league.lock:
+                    return export_bytes(data, compact=compact_export, compress=compress_export)
 
             # Provide a download link for the data file
             st.subheader("Download Data File")
             st.download_button(
                 label="Download Data JSON File",
-                data=data_json,
-                file_name="blood_bowl_data.json",
-                mime="application/json"
+                data=data_file,
+                file_name="blood_bowl_data.json.gz" if compress_export else "blood_bowl_data.json",
+                mime="application/gzip" if compress_export else "application/json"
             )
 
 
@@ -1149,7 +1108,7 @@ You are a seasoned sports journalist in the fantastical and brutal world of Bloo
             st.error("Please fill in all required fields in the sidebar.")
 
 # --- Help Tab ---
-with tab8:
+with tab8, timer.section("Help"):
     st.header("Help and Instructions")
     st.write("""
 Welcome to the Blood Bowl GPT Prompt Generator! This app allows you to:
@@ -1181,4 +1140,14 @@ If you need further assistance, feel free to reach out!
 
 """)
 
+# --- Debug Timings ---
+if timer.enabled:
+    total = timer.elapsed()
+    with st.sidebar.expander("Timings", expanded=True):
+        st.markdown(timings_table(timer.rows(), total))
+        if rerun_timings:
+            st.caption("Previous run, which ended in a rerun:")
+            st.markdown(timings_table(*rerun_timings))
+    log_timings()
+
 # --- End of Code ---
@@ -0,0 +1,110 @@
+import json
+import os
+
+import pytest
+
+from bbreporter import journal
+
+
+@pytest.fixture
+def snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(journal, 'COMPACT_EVERY', 5)
+    path = str(tmp_path / 'matches.json')
+    journal.write_snapshot(path, [])
+    return path
+
+
+def files(path):
+    folder = os.path.dirname(path)
+    return {name: open(os.path.join(folder, name), 'rb').read() for name in sorted(os.listdir(folder))}
+
+
+def test_load_replays_the_journal(snapshot):
+    data = [{'n': 1}, {'n': 2}]
+    journal.log_append(snapshot, data[0], data)
+    journal.log_append(snapshot, data[1], data)
+    journal.log_update(snapshot, 0, {'n': 10}, data)
+    journal.log_delete(snapshot, 1, data)
+    assert journal.load(snapshot) == [{'n': 10}]
+
+
+def test_missing_files_load_as_none(tmp_path):
+    assert journal.load(str(tmp_path / 'narratives.json')) is None
+
+
+def test_compaction_folds_the_journal_into_the_snapshot(snapshot):
+    records = []
+    for n in range(journal.COMPACT_EVERY):
+        records.append({'n': n})
+        journal.log_append(snapshot, records[-1], lambda: records)
+    assert not os.path.exists(journal.journal_path(snapshot))
+    with open(snapshot) as f:
+        assert json.load(f) == records
+    journal.log_append(snapshot, {'n': 99}, None)
+    journal._journal_lengths.clear()
+    assert journal.load(snapshot) == records + [{'n': 99}]
+
+
+def test_torn_final_line_is_dropped_and_folded_away(snapshot):
+    journal.log_append(snapshot, {'n': 1}, None)
+    with open(journal.journal_path(snapshot), 'a') as f:
+        f.write('{"op": "app')
+    journal._journal_lengths.clear()
+    assert journal.load(snapshot) == [{'n': 1}]
+    assert not os.path.exists(journal.journal_path(snapshot))
+    journal.log_append(snapshot, {'n': 2}, None)
+    assert journal.load(snapshot) == [{'n': 1}, {'n': 2}]
+
+
+def test_read_only_load_leaves_a_torn_journal_alone(snapshot):
+    journal.log_append(snapshot, {'n': 1}, None)
+    with open(journal.journal_path(snapshot), 'a') as f:
+        f.write('{"op": "app')
+    before = files(snapshot)
+    assert journal.load(snapshot, read_only=True) == [{'n': 1}]
+    assert files(snapshot) == before
+
+
+# --- Crashes during compaction ---
+# Compaction renames the journal aside, replaces the snapshot, then drops the set-aside journal.
+# Each test fails one step, as a crash there would, and loads the collection again.
+def crash_on(monkeypatch, function, should_fail):
+    real = getattr(os, function)
+
+    def failing(*args):
+        if should_fail(*args):
+            raise OSError("simulated crash")
+        return real(*args)
+    monkeypatch.setattr(os, function, failing)
+
+
+def compact_with_crash(snapshot, monkeypatch, function, should_fail):
+    records = [{'n': 1}, {'n': 2}, {'n': 3}]
+    for record in records:
+        journal.log_append(snapshot, record, None)
+    crash_on(monkeypatch, function, should_fail)
+    with pytest.raises(OSError):
+        journal.write_snapshot(snapshot, records)
+    monkeypatch.undo()
+    journal._journal_lengths.clear()
+    return records
+
+
+def test_crash_before_the_journal_is_set_aside(snapshot, monkeypatch):
+    records = compact_with_crash(snapshot, monkeypatch, 'replace', lambda src, dst: dst.endswith('.folded'))
+    assert journal.load(snapshot) == records
+
+
+def test_crash_before_the_snapshot_is_replaced(snapshot, monkeypatch):
+    records = compact_with_crash(snapshot, monkeypatch, 'replace', lambda src, dst: dst == snapshot)
+    assert journal.load(snapshot, read_only=True) == records
+    assert journal.load(snapshot) == records
+    assert sorted(files(snapshot)) == ['matches.json']
+
+
+def test_crash_before_the_old_journal_is_dropped(snapshot, monkeypatch):
+    records = compact_with_crash(snapshot, monkeypatch, 'remove', lambda path: path.endswith('.folded'))
+    assert journal.load(snapshot, read_only=True) == records
+    assert journal.load(snapshot) == records
+    journal.log_delete(snapshot, 0, None)
+    assert journal.load(snapshot) == records[1:]
@@ -0,0 +1,169 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bbreporter import events, journal, scores, sqlite_store
+from bbreporter.fuzzy import NameMatcher
+from bbreporter.indexes import NameIndex
+from bbreporter.league import COLLECTION_FILES, League
+from bbreporter.search import SearchIndex
+from bbreporter.stats_store import StatsStore
+
+
+def team(name, race='Orc'):
+    return {'team_name': name, 'team_race': race, 'coach_name': 'Coach', 'team_history': f"{name} history", 'achievements': ''}
+
+
+def player(name, team_name, touchdowns=0):
+    return {'player_name': name, 'team_name': team_name, 'team_race': 'Orc', 'position': 'Blitzer', 'bio': f"{name} bio",
+            'career_highlights': '', 'stats': {'matches_played': 1, 'touchdowns': touchdowns, 'interceptions': 0,
+                                               'injuries_caused': 0, 'mvp_awards': 0}}
+
+
+def match(league, team_a, team_b, *scorers):
+    record = {'match_date': 'March 01, 2024', 'team_a_name': team_a, 'team_a_race': 'Orc', 'team_b_name': team_b,
+              'team_b_race': 'Orc', 'final_score': '1-0', 'key_events': 'A hard game',
+              'events': [{'type': 'TD', 'player_name': name, 'team_name': team_name} for team_name, name in scorers],
+              'participants': events.participants(league.indexes['player_profiles'], team_a, team_b)}
+    record.update(scores.score_fields(record))
+    return record
+
+
+@pytest.fixture(params=['journal', 'sqlite'])
+def data_dir(request, tmp_path, monkeypatch):
+    monkeypatch.delenv('BBREPORTER_STORAGE', raising=False)
+    with open(tmp_path / 'team_profiles.json', 'w') as f:
+        json.dump([team('Reavers'), team('Dup'), team('Stunties', 'Halfling'), team('Dup', 'Skaven')], f)
+    with open(tmp_path / 'player_profiles.json', 'w') as f:
+        json.dump([player('Grak', 'Reavers', 2), player('Snik', 'Dup'), player('Pip', 'Stunties'), player('Grak', 'Stunties')], f)
+    for collection in ('matches', 'injuries', 'narratives'):
+        with open(tmp_path / COLLECTION_FILES[collection], 'w') as f:
+            json.dump([], f)
+    if request.param == 'sqlite':
+        monkeypatch.setenv('BBREPORTER_STORAGE', 'sqlite')
+    return str(tmp_path)
+
+
+def watched_league(data_dir):
+    league = League(data_dir)
+    # Build every lazy watcher, so each change has to keep them all in step
+    league.stats, league.search
+    for collection in ('team_profiles', 'player_profiles'):
+        league.matcher(collection)
+    for collection in COLLECTION_FILES:
+        league.frame(collection)
+    return league
+
+
+def assert_watchers_match(league):
+    """Every watcher must hold what a fresh build over the current collections would."""
+    for collection, index in league.indexes.items():
+        fresh = NameIndex(league[collection], index.field, index.group_field)
+        assert index.positions == fresh.positions
+        assert index.record_positions == fresh.record_positions
+        assert index.names() == fresh.names()
+        for group in set(index.groups) | set(fresh.groups):
+            assert index.group_entries(group) == fresh.group_entries(group)
+        matcher = NameMatcher(league[collection], index.field)
+        assert league.matcher(collection).counts == matcher.counts
+        assert league.matcher(collection).sorted_names == matcher.sorted_names
+        assert league.matcher(collection).grams == matcher.grams
+    stats = StatsStore(league['player_profiles'])
+    assert np.array_equal(league.stats.values, stats.values)
+    assert league.stats.team_totals() == stats.team_totals()
+    search = SearchIndex(league.collections)
+    assert league.search.postings == search.postings
+    assert league.search.terms == search.terms
+    for collection in COLLECTION_FILES:
+        if not league[collection]:
+            # A frame emptied row by row keeps its columns
+            assert league.frame(collection).empty
+            continue
+        pd.testing.assert_frame_equal(league.frame(collection), pd.DataFrame(league[collection]), check_dtype=False)
+
+
+def assert_reloads_the_same(league):
+    reloaded = League(league.data_dir)
+    assert reloaded.collections == league.collections
+
+
+def stats_of(league, team_name, player_name):
+    return next(p['stats'] for p in league['player_profiles'] if (p['team_name'], p['player_name']) == (team_name, player_name))
+
+
+def test_watchers_and_storage_follow_every_change(data_dir):
+    league = watched_league(data_dir)
+    steps = [
+        lambda: league.add('team_profiles', team('Newcomers')),
+        lambda: league.add('player_profiles', player('Rook', 'Newcomers')),
+        lambda: league.update('team_profiles', 1, team('Renamed')),
+        lambda: league.update('player_profiles', 0, player('Grak', 'Reavers', 3)),
+        lambda: league.delete('team_profiles', 0),
+        lambda: league.delete('player_profiles', 1),
+        lambda: league.add_many('player_profiles', [player('Bo', 'Dup'), player('Grak', 'Dup')]),
+        lambda: league.add('matches', match(league, 'Reavers', 'Stunties', ('Reavers', 'Grak'), ('Stunties', 'Pip'))),
+        lambda: league.update('matches', 0, match(league, 'Reavers', 'Newcomers', ('Newcomers', 'Rook'))),
+        lambda: league.add('narratives', {'storyline_title': 'Feud', 'description': 'Grak and Rook',
+                                          'teams_or_players_involved': 'Reavers', 'recent_developments': ''}),
+        lambda: league.delete('matches', 0),
+    ]
+    for step in steps:
+        step()
+        assert_watchers_match(league)
+        assert_reloads_the_same(league)
+
+
+def test_match_events_drive_player_stats(data_dir):
+    league = League(data_dir)
+    league.add('matches', match(league, 'Reavers', 'Stunties', ('Reavers', 'Grak'), ('Reavers', 'Grak')))
+    assert stats_of(league, 'Reavers', 'Grak')['touchdowns'] == 4
+    assert stats_of(league, 'Reavers', 'Grak')['matches_played'] == 2
+    assert stats_of(league, 'Stunties', 'Grak')['matches_played'] == 2
+    assert stats_of(league, 'Dup', 'Snik')['matches_played'] == 1
+    # Only the hand-entered numbers are stored; the match adds its events again on load
+    assert stats_of(League(data_dir), 'Reavers', 'Grak')['touchdowns'] == 4
+    league.delete('matches', 0)
+    assert stats_of(league, 'Reavers', 'Grak')['touchdowns'] == 2
+    assert stats_of(League(data_dir), 'Reavers', 'Grak')['touchdowns'] == 2
+
+
+def test_stale_positions_follow_the_expected_record(data_dir):
+    league = League(data_dir)
+    pip = league['player_profiles'][2]
+    league.delete('player_profiles', 0)
+    league.update('player_profiles', 2, player('Pip', 'Stunties', 5), expected=pip)
+    assert [p['player_name'] for p in league['player_profiles']] == ['Snik', 'Pip', 'Grak']
+    assert stats_of(league, 'Stunties', 'Pip')['touchdowns'] == 5
+    with pytest.raises(ValueError):
+        league.delete('player_profiles', 1, expected=pip)
+
+
+def test_save_refuses_the_files_a_collection_is_stored_in(data_dir):
+    league = League(data_dir)
+    for filename in ('team_profiles.json', 'matches.journal.jsonl', sqlite_store.DB_FILENAME):
+        with pytest.raises(ValueError):
+            league.save({'league_name': 'Test'}, filename)
+    league.save({'league_name': 'Test'}, 'league_info.json')
+    assert League(data_dir).load_league_info() == {'league_name': 'Test'}
+    with pytest.raises(ValueError):
+        league.export('matches', 'league_info.json')
+
+
+def test_read_only_load_writes_nothing(tmp_path, monkeypatch):
+    monkeypatch.delenv('BBREPORTER_STORAGE', raising=False)
+    snapshot = str(tmp_path / 'matches.json')
+    journal.write_snapshot(snapshot, [{'team_a_name': 'Reavers', 'team_b_name': 'Stunties', 'final_score': '2-1'}])
+    with open(journal.journal_path(snapshot), 'w') as f:
+        f.write('{"op": "app')
+
+    def files():
+        return {name: open(tmp_path / name, 'rb').read() for name in sorted(os.listdir(tmp_path))}
+    before = files()
+    league = League(str(tmp_path), read_only=True)
+    assert league['matches'][0]['team_a_td'] == 2
+    monkeypatch.setenv('BBREPORTER_STORAGE', 'sqlite')
+    League(str(tmp_path), read_only=True)
+    assert files() == before